@@ -0,0 +1,311 @@
+"""
+Benchmark suite for the data layer and calculators, run against synthetic data.
+
+Every scenario runs against FakeAPIDataFetcher, so no API key or network is needed.
+Results are printed (or written with --out) as JSON so runs can be diffed to catch
+throughput and memory regressions.
+
+The "import.main" scenario times a cold import of the CLI entry point in fresh
+interpreters and checks it against --import-budget; the suite exits with status 1 when
+it is over budget.
+
+Usage:
+    python -m benchmarks.bench
+    python -m benchmarks.bench --teams 700 --seasons 3 --latency 0.05 --out bench.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from typing import Any, Callable, NamedTuple
+
+from src.statforge.combine import combine_factors
+from src.statforge.config import import_time_budget
+from src.statforge.data_loader import DataLoader
+from src.statforge.fake import FakeAPIDataFetcher, generate_season
+from src.statforge.main import adjust_factor, calculate_adjusted_lines
+from src.statforge.metrics.engine import MatchupEngine
+from src.statforge.metrics.havoc import CalculateHavocBottom, CalculateHavocTop
+from src.statforge.metrics.ppa import CalculatePPAFactor
+from src.statforge.metrics.srs import CalculateSRSLine
+
+class Fixture(NamedTuple):
+    """
+    Synthetic data shared by the scenarios.
+
+    Attributes:
+        fetcher: fake backend serving every generated season
+        season: season the loaders and calculators work on
+        loader: full-season loader for the first season
+        games: every game of every generated season, as (away, home) pairs
+        week_games: the first week's games
+        engine: matchup engine over the first season's tables
+        factors: the engine's factors for games
+    """
+
+    fetcher: FakeAPIDataFetcher
+    season: int
+    loader: DataLoader
+    games: list[tuple[str, str]]
+    week_games: list[Any]
+    engine: MatchupEngine
+    factors: Any
+
+
+def load_week(fixture: Fixture) -> None:
+    DataLoader(fixture.fetcher, 1, season=fixture.season).load()
+
+
+def load_season(fixture: Fixture) -> None:
+    DataLoader(fixture.fetcher, None, season=fixture.season).load()
+
+
+def srs_odds(fixture: Fixture) -> None:
+    CalculateSRSLine(fixture.games, fixture.loader.srs_by_team).calculate_odds()
+
+
+def ppa_total(fixture: Fixture) -> None:
+    calculator = CalculatePPAFactor(fixture.games, fixture.loader.ppa_by_team)
+    calculator.calculate_total_factor(1)
+
+
+def havoc_top_total(fixture: Fixture) -> None:
+    CalculateHavocTop(fixture.games, fixture.loader.havoc_by_team).calculate_total()
+
+
+def havoc_bottom_total(fixture: Fixture) -> None:
+    havoc_by_team = fixture.loader.havoc_by_team
+    CalculateHavocBottom(fixture.games, havoc_by_team).calculate_total()
+
+
+def engine_compute(fixture: Fixture) -> None:
+    fixture.engine.compute(fixture.games)
+
+
+def adjust(fixture: Fixture) -> None:
+    factors = fixture.factors
+    adjust_factor(
+        factors.srs_lines(),
+        factors.ppa_factors(),
+        factors.havoc_top_factors(),
+        factors.havoc_bottom_factors(),
+    )
+
+
+def combine(fixture: Fixture) -> None:
+    combine_factors(fixture.factors)
+
+
+def weekly_run(fixture: Fixture) -> None:
+    weekly = DataLoader(fixture.fetcher, 1, season=fixture.season)
+    weekly.load()
+    calculate_adjusted_lines(weekly, weekly.games, 1, verbose=False)
+
+
+def week_rows(fixture: Fixture) -> int:
+    return len(fixture.week_games)
+
+
+def season_rows(fixture: Fixture) -> int:
+    return len(fixture.loader.games)
+
+
+def game_rows(fixture: Fixture) -> int:
+    return len(fixture.games)
+
+
+# In-process scenarios in run order: name -> (scenario, rows it processes per run).
+scenarios: dict[str, tuple[Callable[[Fixture], Any], Callable[[Fixture], int]]] = {
+    "data_loader.load.week": (load_week, week_rows),
+    "data_loader.load.season": (load_season, season_rows),
+    "srs.calculate_odds": (srs_odds, game_rows),
+    "ppa.calculate_total_factor": (ppa_total, game_rows),
+    "havoc_top.calculate_total": (havoc_top_total, game_rows),
+    "havoc_bottom.calculate_total": (havoc_bottom_total, game_rows),
+    "engine.compute": (engine_compute, game_rows),
+    "adjust_factor": (adjust, game_rows),
+    "combine_factors": (combine, game_rows),
+    "end_to_end.week": (weekly_run, week_rows),
+}
+
+# Every scenario run() knows, in run order; --only picks a subset.
+scenario_names: tuple[str, ...] = ("import.main", *scenarios)
+
+
+def measure(
+    name: str, func: Callable[[], Any], repeat: int, rows: int
+) -> dict[str, Any]:
+    """
+    Time a scenario and record its peak traced memory.
+
+    :param name: scenario name
+    :param func: zero-argument callable to run
+    :param repeat: number of timed runs
+    :param rows: rows (games) processed per run, for throughput
+    :return: result record
+    """
+    times: list[float] = []
+    # The calculators print per missing game and the loader reports progress on
+    # stderr; that I/O is not what is being measured.
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(
+        io.StringIO()
+    ):
+        func()
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - start)
+
+        tracemalloc.start()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    best = min(times)
+    return {
+        "name": name,
+        "repeat": repeat,
+        "rows": rows,
+        "min_seconds": best,
+        "mean_seconds": sum(times) / len(times),
+        "rows_per_second": rows / best if best else None,
+        "peak_memory_bytes": peak,
+    }
+
+
+# Run in a fresh interpreter: prints the import's wall time and whether cfbd was loaded.
+_import_probe = """
+import sys, time
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start, "cfbd" in sys.modules)
+"""
+
+
+def measure_import(module: str, repeat: int, budget: float) -> dict[str, Any]:
+    """
+    Time a cold import of a module, each run in a new interpreter.
+
+    :param module: dotted module name
+    :param repeat: number of timed runs
+    :param budget: seconds the fastest import should stay under
+    :return: result record
+    """
+    times: list[float] = []
+    imports_cfbd = False
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", _import_probe.format(module=module)],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.split()
+        times.append(float(output[0]))
+        imports_cfbd = imports_cfbd or output[1] == "True"
+
+    best = min(times)
+    return {
+        "name": f"import.{module.rsplit('.', 1)[-1]}",
+        "repeat": repeat,
+        "min_seconds": best,
+        "mean_seconds": sum(times) / len(times),
+        "budget_seconds": budget,
+        "within_budget": best <= budget,
+        "imports_cfbd": imports_cfbd,
+    }
+
+
+def run(args: argparse.Namespace) -> dict[str, Any]:
+    seasons = [
+        generate_season(
+            season=args.first_season + i,
+            teams=args.teams,
+            weeks=args.weeks,
+            games_per_week=args.games_per_week,
+            missing_rate=args.missing_rate,
+            seed=i,
+        )
+        for i in range(args.seasons)
+    ]
+    fetcher = FakeAPIDataFetcher(seasons, latency=args.latency)
+    season = seasons[0].season
+
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(
+        io.StringIO()
+    ):
+        loader = DataLoader(fetcher, None, season=season)
+        loader.load()
+
+    # Every game of every generated season, scored against the first season's tables.
+    games = [(game.away_team, game.home_team) for s in seasons for game in s.games]
+    engine = MatchupEngine(loader.teams)
+    fixture = Fixture(
+        fetcher=fetcher,
+        season=season,
+        loader=loader,
+        games=games,
+        week_games=loader.games_by_week[1],
+        engine=engine,
+        factors=engine.compute(games),
+    )
+
+    selected = set(args.only or scenario_names)
+    results = []
+    if "import.main" in selected:
+        results.append(
+            measure_import("src.statforge.main", args.repeat, args.import_budget)
+        )
+    results.extend(
+        measure(name, lambda: scenario(fixture), args.repeat, rows(fixture))
+        for name, (scenario, rows) in scenarios.items()
+        if name in selected
+    )
+    return {
+        "python": platform.python_version(),
+        "parameters": vars(args),
+        "results": results,
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="StatForge benchmarks")
+    parser.add_argument("--teams", type=int, default=130)
+    parser.add_argument("--weeks", type=int, default=15)
+    parser.add_argument("--games-per-week", type=int, default=None)
+    parser.add_argument("--seasons", type=int, default=1)
+    parser.add_argument("--first-season", type=int, default=2024)
+    parser.add_argument("--missing-rate", type=float, default=0.05)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--import-budget", type=float, default=import_time_budget)
+    parser.add_argument(
+        "--only",
+        nargs="*",
+        choices=scenario_names,
+        metavar="SCENARIO",
+        help=f"scenarios to run, from: {', '.join(scenario_names)}",
+    )
+    parser.add_argument("--out", help="write JSON results to this file")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    report = run(arguments)
+    output = json.dumps(report, indent=2)
+
+    if arguments.out:
+        with open(arguments.out, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+
+    if not all(result.get("within_budget", True) for result in report["results"]):
+        sys.exit("Import time over budget")
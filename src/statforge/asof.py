@@ -0,0 +1,247 @@
+"""
+Point-in-time team metrics: what every table looked like as of the end of any week.
+
+The season-level endpoints only return season-to-date values, so a backfilled week 7
+line would be built from data collected after week 7. AsOfStore instead keeps, per
+team and week, the raw counts behind each metric (scrimmage plays, PPA sums, havoc
+events, games and margins) as cumulative prefix sums over weeks:
+
+    counts[w, team] = sum of the team's counts in weeks 1..w
+
+so any as-of-week metric is a ratio of two array rows, O(1) per team and one vectorized
+expression for a whole registry. SRS is not a ratio of counts, so the warm-started
+solver is run once per week at build time and its ratings kept per week alongside.
+
+Everything comes from one season-level pass: one results call plus the season's plays
+streamed through plays.py.
+"""
+
+import math
+
+from typing import Iterable
+
+import numpy as np
+
+from src.statforge.config import plays_exclude_garbage_time, year
+from src.statforge.data_loader import APIDataFetcher, build_game_results
+from src.statforge.instrumentation import get_recorder
+from src.statforge.metrics.srs_solver import GameResult, SRSSolver
+from src.statforge.plays import PlayRecord, api_plays, is_havoc, scrimmage_plays
+from src.statforge.teams import TeamHavocStats, TeamRegistry
+
+# Cumulative count arrays kept per (week, team).
+count_columns: tuple[str, ...] = (
+    "offense_plays",
+    "offense_havoc",
+    "offense_ppa",
+    "offense_ppa_plays",
+    "defense_plays",
+    "defense_havoc",
+    "defense_ppa",
+    "defense_ppa_plays",
+    "games",
+    "margin",
+)
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    out = np.full(numerator.shape, np.nan)
+    np.divide(numerator, denominator, out=out, where=denominator > 0)
+    return out
+
+
+class AsOfStore:
+    """
+    Per-team, per-week prefix sums of the counts behind every team metric.
+
+    Row 0 of every array is the empty prefix (before week 1) and row w holds totals
+    through week w; weeks past the last recorded one read the final row.
+
+    Attributes:
+        season: season year
+        names: team names, position is the team id
+        ids: dict mapping team names to ids
+        counts: dict mapping each of count_columns to a (weeks + 1, teams) array
+        srs: (weeks + 1, teams) SRS ratings solved with games through each week
+    """
+
+    def __init__(
+        self,
+        season: int,
+        names: list[str],
+        counts: dict[str, np.ndarray],
+        srs: np.ndarray,
+    ) -> None:
+        self.season = season
+        self.names = names
+        self.ids = {name: i for i, name in enumerate(names)}
+        self.counts = counts
+        self.srs = srs
+
+    @property
+    def weeks(self) -> int:
+        return self.srs.shape[0] - 1
+
+    def _row(self, week: int) -> int:
+        return min(max(week, 0), self.weeks)
+
+    @classmethod
+    def build(
+        cls,
+        plays: Iterable[PlayRecord],
+        results: list[GameResult],
+        season: int = year,
+        solver: SRSSolver | None = None,
+        exclude_garbage_time: bool = plays_exclude_garbage_time,
+    ) -> "AsOfStore":
+        """
+        Accumulate a season of plays and results into prefix sums.
+
+        :param plays: the season's plays; each must carry its week
+        :param results: the season's completed games
+        :param season: season year
+        :param solver: SRSSolver to rate each week with, defaults to a new one
+        :param exclude_garbage_time: drop plays in garbage time
+        :return: AsOfStore
+        """
+        ids: dict[str, int] = {}
+        # (week, team id) -> per-week increments, ordered as count_columns
+        increments: dict[tuple[int, int], list[float]] = {}
+
+        def bucket(week: int, team: str) -> list[float]:
+            key = (week, ids.setdefault(team, len(ids)))
+            counts = increments.get(key)
+            if counts is None:
+                counts = increments[key] = [0.0] * len(count_columns)
+            return counts
+
+        with get_recorder().stage("asof.build"):
+            for play in scrimmage_plays(
+                plays, exclude_garbage_time=exclude_garbage_time
+            ):
+                if play.week is None:
+                    raise ValueError("AsOfStore needs the week of every play")
+                offense = bucket(play.week, play.offense)
+                defense = bucket(play.week, play.defense)
+                havoc = is_havoc(play)
+                offense[0] += 1
+                offense[1] += havoc
+                defense[4] += 1
+                defense[5] += havoc
+                if play.ppa is not None:
+                    offense[2] += play.ppa
+                    offense[3] += 1
+                    defense[6] += play.ppa
+                    defense[7] += 1
+
+            for game in results:
+                margin = game.home_points - game.away_points
+                home = bucket(game.week, game.home_team)
+                away = bucket(game.week, game.away_team)
+                home[8] += 1
+                home[9] += margin
+                away[8] += 1
+                away[9] -= margin
+
+            weeks = max((week for week, _ in increments), default=0)
+            table = np.zeros((len(count_columns), weeks + 1, len(ids)))
+            for (week, team), values in increments.items():
+                table[:, week, team] = values
+            np.cumsum(table, axis=1, out=table)
+            counts = dict(zip(count_columns, table))
+
+            names = list(ids)
+            srs = np.full((weeks + 1, len(names)), np.nan)
+            solver = solver or SRSSolver()
+            for week, ratings in solver.solve_by_week(
+                results, list(range(1, weeks + 1))
+            ).items():
+                for team, rating in ratings.items():
+                    srs[week, ids[team]] = rating
+
+        return cls(season, names, counts, srs)
+
+    def registry(self, week: int) -> TeamRegistry:
+        """
+        Team metrics using only data through the end of week, e.g. week - 1 for the
+        lines of week's games.
+
+        :param week: last week of data to include
+        :return: TeamRegistry over freshly computed columns
+        """
+        row = self._row(week)
+        c = {name: counts[row] for name, counts in self.counts.items()}
+        columns = {
+            "srs": self.srs[row].copy(),
+            "ppa_offense": _ratio(c["offense_ppa"], c["offense_ppa_plays"]),
+            "ppa_defense": _ratio(c["defense_ppa"], c["defense_ppa_plays"]),
+            "havoc_offense": _ratio(c["offense_havoc"], c["offense_plays"]),
+            "havoc_defense": _ratio(c["defense_havoc"], c["defense_plays"]),
+        }
+        # Like TeamRegistry.set_ppa: a team with PPA on one side only counts the
+        # other side as 0.
+        ppa_present = (c["offense_ppa_plays"] > 0) | (c["defense_ppa_plays"] > 0)
+        for side in ("ppa_offense", "ppa_defense"):
+            columns[side][ppa_present & np.isnan(columns[side])] = 0.0
+        return TeamRegistry.from_columns(self.names, columns, ppa_present)
+
+    def tables(
+        self, week: int
+    ) -> tuple[
+        dict[str, float], dict[str, dict[str, float]], dict[str, TeamHavocStats]
+    ]:
+        """
+        As-of-week (srs_by_team, ppa_by_team, havoc_by_team), shaped like DataLoader's.
+        """
+        return self.registry(week).to_tables()
+
+    def team(self, team: str, week: int) -> dict[str, float]:
+        """
+        One team's metrics through the end of week, in O(1).
+
+        :param team: team name
+        :param week: last week of data to include
+        :return: dict of metric values (NaN where there is no data yet)
+        """
+        i, row = self.ids[team], self._row(week)
+
+        def ratio(numerator: str, denominator: str) -> float:
+            n = self.counts[denominator][row, i]
+            return float(self.counts[numerator][row, i] / n) if n else float("nan")
+
+        # Same rule as registry(): with PPA on one side only, the other side is 0
+        ppa_present = (
+            self.counts["offense_ppa_plays"][row, i] > 0
+            or self.counts["defense_ppa_plays"][row, i] > 0
+        )
+
+        def ppa(numerator: str, denominator: str) -> float:
+            value = ratio(numerator, denominator)
+            return 0.0 if ppa_present and math.isnan(value) else value
+
+        return {
+            "srs": float(self.srs[row, i]),
+            "ppa_offense": ppa("offense_ppa", "offense_ppa_plays"),
+            "ppa_defense": ppa("defense_ppa", "defense_ppa_plays"),
+            "havoc_offense": ratio("offense_havoc", "offense_plays"),
+            "havoc_defense": ratio("defense_havoc", "defense_plays"),
+            "games": float(self.counts["games"][row, i]),
+            "average_margin": ratio("margin", "games"),
+        }
+
+
+def build_as_of_store(
+    api_fetcher: APIDataFetcher, season: int = year, weeks: Iterable[int] | None = None
+) -> AsOfStore:
+    """
+    Build a season's AsOfStore from one results call and the streamed plays.
+
+    :param api_fetcher: fetcher exposing games_api and plays_api
+    :param season: season year
+    :param weeks: weeks of plays to stream, defaults to every week with a result
+    :return: AsOfStore
+    """
+    results = build_game_results(api_fetcher, season)
+    if weeks is None:
+        weeks = sorted({game.week for game in results})
+    return AsOfStore.build(api_plays(api_fetcher, weeks, season), results, season)
@@ -0,0 +1,322 @@
+"""
+Module for an asyncio-native CFBD fetcher.
+
+AsyncAPIDataFetcher talks to the CFBD REST API over a single pooled, keep-alive
+aiohttp session instead of the generated synchronous cfbd clients. Every request goes
+through a token-bucket rate limiter, 429 and 5xx responses (and dropped connections)
+are retried with jittered exponential backoff, and latency/retry counters are kept per
+endpoint.
+
+It exposes the same ratings_api / games_api / metrics_api / stats_api attributes as
+APIDataFetcher, returning the same cfbd models, so DataLoader can use it unchanged. The
+event loop runs on a background thread, which lets DataLoader's worker threads share
+one session and one rate limit.
+"""
+
+import asyncio
+import random
+import threading
+import time
+
+from enum import Enum
+from typing import Any, Callable
+
+import aiohttp
+import cfbd
+
+from src.statforge.cache import CachedApi, ResponseCache
+from src.statforge.config import (
+    backoff_base,
+    backoff_cap,
+    cfbd_host,
+    max_retries,
+    max_workers,
+    rate_limit_burst,
+    rate_limit_per_second,
+    request_timeout,
+)
+from src.statforge.data_loader import get_api_key
+from src.statforge.instrumentation import get_recorder
+
+# Endpoint method name -> (path, cfbd model of each returned row)
+endpoints: dict[str, tuple[str, type]] = {
+    "get_games": ("/games", cfbd.Game),
+    "get_srs": ("/ratings/srs", cfbd.TeamSRS),
+    "get_predicted_points_added_by_team": (
+        "/ppa/teams",
+        cfbd.TeamSeasonPredictedPointsAdded,
+    ),
+    "get_advanced_season_stats": ("/stats/season/advanced", cfbd.AdvancedSeasonStat),
+    "get_plays": ("/plays", cfbd.Play),
+    "get_lines": ("/lines", cfbd.BettingGame),
+}
+
+retryable_statuses: frozenset[int] = frozenset({429, 500, 502, 503, 504})
+
+
+class CFBDHTTPError(Exception):
+    """
+    Raised when a request fails with a non-retryable status or runs out of retries.
+    """
+
+    def __init__(self, endpoint: str, status: int | None, message: str) -> None:
+        super().__init__(f"{endpoint} failed ({status}): {message}")
+        self.endpoint = endpoint
+        self.status = status
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter: refills at rate tokens per second up to capacity, and
+    each request takes one token.
+    """
+
+    def __init__(self, rate: float, capacity: int) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class EndpointStats:
+    """
+    Latency and retry counters for one endpoint. calls counts every HTTP attempt,
+    retries the attempts that were repeated and failures the requests that gave up.
+    """
+
+    __slots__ = ("calls", "retries", "failures", "total_seconds", "max_seconds")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.retries = 0
+        self.failures = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def record(self, seconds: float) -> None:
+        self.calls += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+
+    def as_dict(self) -> dict[str, float]:
+        return {
+            "calls": self.calls,
+            "retries": self.retries,
+            "failures": self.failures,
+            "mean_seconds": self.total_seconds / self.calls if self.calls else 0.0,
+            "max_seconds": self.max_seconds,
+        }
+
+
+def _query_params(params: dict[str, Any]) -> dict[str, str]:
+    """
+    Convert cfbd-style keyword arguments into the API's camelCase query string.
+    """
+    query: dict[str, str] = {}
+    for name, value in params.items():
+        if value is None:
+            continue
+        head, *rest = name.split("_")
+        key = head + "".join(part.title() for part in rest)
+        if isinstance(value, Enum):
+            value = value.value
+        if isinstance(value, bool):
+            value = str(value).lower()
+        query[key] = str(value)
+    return query
+
+
+class AsyncCFBDClient:
+    """
+    Pooled aiohttp client for the CFBD API with rate limiting and retry/backoff.
+
+    Attributes:
+        host: base URL of the API
+        stats: dict mapping endpoint method names to EndpointStats
+    """
+
+    def __init__(
+        self,
+        api_key: str | None,
+        host: str = cfbd_host,
+        rate: float = rate_limit_per_second,
+        burst: int = rate_limit_burst,
+        max_connections: int = max_workers,
+        max_retries: int = max_retries,
+        backoff_base: float = backoff_base,
+        backoff_cap: float = backoff_cap,
+        timeout: float = request_timeout,
+    ) -> None:
+        self.host = host.rstrip("/")
+        self.api_key = api_key
+        self.max_connections = max_connections
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.timeout = timeout
+        self.stats: dict[str, EndpointStats] = {
+            name: EndpointStats() for name in endpoints
+        }
+
+        self._bucket = TokenBucket(rate, burst)
+        self._session: aiohttp.ClientSession | None = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None:
+            headers = {"Accept": "application/json"}
+            if self.api_key:
+                headers["Authorization"] = f"Bearer {self.api_key}"
+            self._session = aiohttp.ClientSession(
+                headers=headers,
+                connector=aiohttp.TCPConnector(
+                    limit=self.max_connections, keepalive_timeout=30
+                ),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _backoff(self, attempt: int, retry_after: str | None) -> float:
+        if retry_after is not None:
+            try:
+                return min(self.backoff_cap, float(retry_after))
+            except ValueError:
+                pass
+        # Full jitter: spreads retries from concurrent callers across the window.
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2**attempt))
+
+    async def request(self, endpoint: str, **params: Any) -> list[dict]:
+        """
+        GET an endpoint, retrying transient failures.
+
+        :param endpoint: endpoint method name, e.g. "get_srs"
+        :param params: cfbd-style keyword arguments for the endpoint
+        :return: decoded JSON rows
+        """
+        path, _ = endpoints[endpoint]
+        stats = self.stats[endpoint]
+        session = await self._get_session()
+        query = _query_params(params)
+
+        for attempt in range(self.max_retries + 1):
+            await self._bucket.acquire()
+            start = time.perf_counter()
+            retry_after: str | None = None
+            try:
+                async with session.get(self.host + path, params=query) as response:
+                    if response.status == 200:
+                        rows = await response.json()
+                        seconds = time.perf_counter() - start
+                        stats.record(seconds)
+                        get_recorder().record_call(
+                            f"http:{endpoint}", seconds, len(rows)
+                        )
+                        return rows
+
+                    status = response.status
+                    message = await response.text()
+                    retry_after = response.headers.get("Retry-After")
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                status, message = None, repr(e)
+
+            seconds = time.perf_counter() - start
+            stats.record(seconds)
+            get_recorder().record_call(f"http:{endpoint}", seconds, 0, error=True)
+            if status is not None and status not in retryable_statuses:
+                stats.failures += 1
+                raise CFBDHTTPError(endpoint, status, message)
+            if attempt == self.max_retries:
+                break
+
+            stats.retries += 1
+            await asyncio.sleep(self._backoff(attempt, retry_after))
+
+        stats.failures += 1
+        raise CFBDHTTPError(endpoint, status, f"gave up after {attempt + 1} attempts")
+
+    async def call(self, endpoint: str, **params: Any) -> list:
+        """
+        Like request, but returns the same cfbd models as the generated clients.
+        """
+        _, model = endpoints[endpoint]
+        return [model.from_dict(row) for row in await self.request(endpoint, **params)]
+
+
+class _SyncEndpoints:
+    """
+    Blocking facade exposing the cfbd api method names on top of the async client.
+    """
+
+    def __init__(self, fetcher: "AsyncAPIDataFetcher") -> None:
+        self._fetcher = fetcher
+
+    def __getattr__(self, name: str) -> Callable[..., list]:
+        if name not in endpoints:
+            raise AttributeError(name)
+
+        def call(**params: Any) -> list:
+            return self._fetcher.run(self._fetcher.client.call(name, **params))
+
+        return call
+
+
+class AsyncAPIDataFetcher:
+    """
+    Drop-in replacement for APIDataFetcher backed by AsyncCFBDClient.
+
+    The client runs on a private event loop in a daemon thread; the blocking api
+    attributes submit coroutines to it, so any number of DataLoader worker threads share
+    one connection pool and one rate limit. Coroutines can also be awaited directly
+    through self.client from async code.
+    """
+
+    def __init__(
+        self, cache: ResponseCache | None = None, host: str = cfbd_host, **client_args
+    ) -> None:
+        self.cache = cache
+        offline = cache is not None and cache.offline
+        self.api_key = None if offline else get_api_key()
+        self.client = AsyncCFBDClient(self.api_key, host=host, **client_args)
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+
+        api: Any = None if offline else _SyncEndpoints(self)
+        if cache is not None:
+            api = CachedApi(api, cache)
+        self.ratings_api = self.games_api = self.metrics_api = self.stats_api = api
+        self.plays_api = self.betting_api = api
+
+    def run(self, coroutine: Any) -> Any:
+        """
+        Run a coroutine on the fetcher's loop and block until it finishes.
+        """
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    @property
+    def stats(self) -> dict[str, dict[str, float]]:
+        return {name: stats.as_dict() for name, stats in self.client.stats.items()}
+
+    def close(self) -> None:
+        self.run(self.client.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
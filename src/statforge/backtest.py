@@ -0,0 +1,343 @@
+"""
+Multi-season backtest of the adjusted lines against actual results.
+
+For every completed game in the selected seasons and weeks, the SRS line and each
+factor are computed from team metrics as of the week before the game (see asof.py), and
+every combination of SRS plus a subset of the PPA and havoc factors is scored against
+the final margin:
+- MAE and RMSE of the predicted home margin
+- against-the-spread hit rate: how often the side the line favours relative to the
+  market spread covers (pushes and games without a spread are skipped)
+
+Seasons are independent, so each one is a task on a process pool. Workers build their
+own fetcher with fetcher_factory and, with the default factory, share an on-disk
+response cache of their own (backtest_cache_path), sized to hold every season's
+play-by-play, so a season's data is fetched at most once across runs and every season
+is loaded exactly once per run.
+
+Usage:
+    python -m src.statforge.backtest 2014-2023
+    python -m src.statforge.backtest 2019,2021-2023 4
+"""
+
+import itertools
+import sys
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Iterator
+
+import numpy as np
+
+from src.statforge.asof import AsOfStore
+from src.statforge.batch import parse_weeks
+from src.statforge.cache import ResponseCache
+from src.statforge.config import (
+    backtest_cache_max_bytes,
+    backtest_cache_path,
+    backtest_cache_ttl,
+    backtest_first_week,
+    backtest_processes,
+    cache_enabled,
+    cache_offline,
+    missing_policy,
+)
+from src.statforge.data_loader import (
+    APIDataFetcher,
+    DataLoader,
+    build_game_results,
+    make_api_fetcher,
+)
+from src.statforge.instrumentation import get_recorder
+from src.statforge.metrics.engine import MatchupEngine
+from src.statforge.metrics.srs_solver import GameResult
+from src.statforge.plays import api_plays
+from src.statforge.teams import TeamRegistry
+
+# Factors that can be added on top of the SRS line.
+factor_names: tuple[str, ...] = ("ppa", "havoc_top", "havoc_bottom")
+
+# factor -> (MatchupFactors value column, validity mask)
+_factor_columns: dict[str, tuple[str, str]] = {
+    "ppa": ("ppa_factor", "ppa_valid"),
+    "havoc_top": ("havoc_top", "havoc_top_valid"),
+    "havoc_bottom": ("havoc_bottom", "havoc_bottom_valid"),
+}
+
+
+def combinations() -> list[tuple[str, ...]]:
+    """
+    Every metric combination scored: SRS alone, then SRS plus each subset of factors.
+    """
+    return [
+        subset
+        for size in range(len(factor_names) + 1)
+        for subset in itertools.combinations(factor_names, size)
+    ]
+
+
+def combination_name(combination: tuple[str, ...]) -> str:
+    return "+".join(("srs", *combination))
+
+
+class ErrorStats:
+    """
+    Running error totals for one metric combination.
+
+    Attributes:
+        games: games scored
+        abs_error / squared_error: sums over those games
+        ats_games / ats_hits: games with a spread (excluding pushes) and how many the
+            line picked correctly
+    """
+
+    __slots__ = ("games", "abs_error", "squared_error", "ats_games", "ats_hits")
+
+    def __init__(self) -> None:
+        self.games = 0
+        self.abs_error = 0.0
+        self.squared_error = 0.0
+        self.ats_games = 0
+        self.ats_hits = 0
+
+    def add(
+        self, predicted: np.ndarray, actual: np.ndarray, spread: np.ndarray
+    ) -> None:
+        error = predicted - actual
+        self.games += len(error)
+        self.abs_error += float(np.abs(error).sum())
+        self.squared_error += float((error**2).sum())
+
+        # Home covers when actual + spread > 0; the line picks home when it expects
+        # the same. Pushes and games without a spread don't count.
+        cover = actual + spread
+        graded = ~np.isnan(spread) & (cover != 0) & (predicted + spread != 0)
+        self.ats_games += int(graded.sum())
+        self.ats_hits += int(
+            ((predicted + spread > 0) == (cover > 0))[graded].sum()
+        )
+
+    def merge(self, other: "ErrorStats") -> None:
+        self.games += other.games
+        self.abs_error += other.abs_error
+        self.squared_error += other.squared_error
+        self.ats_games += other.ats_games
+        self.ats_hits += other.ats_hits
+
+    def as_dict(self) -> dict[str, float | None]:
+        return {
+            "games": self.games,
+            "mae": self.abs_error / self.games if self.games else None,
+            "rmse": (self.squared_error / self.games) ** 0.5 if self.games else None,
+            "ats_games": self.ats_games,
+            "ats_hit_rate": self.ats_hits / self.ats_games if self.ats_games else None,
+        }
+
+
+def _spreads(api_fetcher: APIDataFetcher, season: int) -> dict[tuple[str, str], float]:
+    """
+    Market spread per (away, home) matchup, the first provider listed for each game.
+    """
+    try:
+        rows = api_fetcher.betting_api.get_lines(year=season)
+    except Exception as e:
+        print(f"Error fetching betting lines for {season}: {e}")
+        return {}
+
+    spreads: dict[tuple[str, str], float] = {}
+    for row in rows:
+        for line in row.lines or []:
+            if line.spread is not None:
+                spreads[(row.away_team, row.home_team)] = float(line.spread)
+                break
+    return spreads
+
+
+def season_weeks(
+    api_fetcher: APIDataFetcher,
+    season: int,
+    weeks: list[int] | None = None,
+    as_of: bool = True,
+) -> Iterator[tuple[int, list[GameResult], TeamRegistry]]:
+    """
+    Load a season once and yield, week by week, its completed games with the team
+    metrics to predict them from.
+
+    :param api_fetcher: fetcher to load the season with
+    :param season: season year
+    :param weeks: weeks to yield, defaults to backtest_first_week onwards
+    :param as_of: use metrics as of the previous week; False uses the season-level
+        tables, which leak later results into earlier weeks but need no play-by-play
+    :return: iterator of (week, results, registry), skipping weeks without results
+    """
+    with get_recorder().stage("backtest.load"):
+        results = build_game_results(api_fetcher, season)
+        played_weeks = sorted({game.week for game in results})
+        if as_of:
+            store = AsOfStore.build(
+                api_plays(api_fetcher, played_weeks, season), results, season
+            )
+        else:
+            loader = DataLoader(api_fetcher, None, season=season)
+            loader.load()
+
+    if weeks is None:
+        weeks = [week for week in played_weeks if week >= backtest_first_week]
+
+    by_week: dict[int, list[GameResult]] = {}
+    for game in results:
+        by_week.setdefault(game.week, []).append(game)
+
+    for week in weeks:
+        week_results = by_week.get(week, [])
+        if week_results:
+            registry = store.registry(week - 1) if as_of else loader.teams
+            yield week, week_results, registry
+
+
+def backtest_season(
+    api_fetcher: APIDataFetcher,
+    season: int,
+    weeks: list[int] | None = None,
+    as_of: bool = True,
+    policy: str = missing_policy,
+) -> dict[str, ErrorStats]:
+    """
+    Score every metric combination over one season.
+
+    :param api_fetcher: fetcher to load the season with
+    :param season: season year
+    :param weeks: weeks to score, defaults to backtest_first_week onwards
+    :param as_of: see season_weeks
+    :param policy: "drop" scores only games with every factor, otherwise missing
+        factors count as 0
+    :return: dict mapping combination name to ErrorStats
+    """
+    recorder = get_recorder()
+    with recorder.stage("backtest.load"):
+        spreads = _spreads(api_fetcher, season)
+    stats = {combination_name(c): ErrorStats() for c in combinations()}
+
+    for week, week_results, registry in season_weeks(
+        api_fetcher, season, weeks, as_of
+    ):
+        with recorder.stage("backtest.score"):
+            games = [(game.away_team, game.home_team) for game in week_results]
+            neutral = np.array([game.neutral_site for game in week_results], bool)
+            factors = MatchupEngine(registry).compute(games, neutral)
+
+            values = {}
+            valid = factors.srs_valid.copy()
+            for name in factor_names:
+                column, mask = _factor_columns[name]
+                values[name] = np.where(
+                    getattr(factors, mask), getattr(factors, column), 0.0
+                )
+                if policy == "drop":
+                    valid &= getattr(factors, mask)
+
+            rows = np.flatnonzero(valid)
+            actual = np.array(
+                [g.home_points - g.away_points for g in week_results], dtype=float
+            )[rows]
+            spread = np.array(
+                [spreads.get(game, np.nan) for game in games], dtype=float
+            )[rows]
+
+            for combination in combinations():
+                predicted = factors.srs_line[rows].copy()
+                for name in combination:
+                    predicted += values[name][rows]
+                stats[combination_name(combination)].add(predicted, actual, spread)
+            recorder.add_rows("backtest.score", len(rows))
+
+    return stats
+
+
+def default_fetcher() -> APIDataFetcher:
+    cache = None
+    if cache_enabled:
+        cache = ResponseCache(
+            backtest_cache_path,
+            ttls={"default": backtest_cache_ttl},
+            max_bytes=backtest_cache_max_bytes,
+            offline=cache_offline,
+        )
+    return make_api_fetcher(cache)
+
+
+def _run_season(
+    fetcher_factory: Callable[[], Any], season: int, as_of: bool, policy: str
+) -> tuple[int, dict[str, ErrorStats]]:
+    stats = backtest_season(fetcher_factory(), season, as_of=as_of, policy=policy)
+    return season, stats
+
+
+def run_backtest(
+    seasons: list[int],
+    fetcher_factory: Callable[[], Any] = default_fetcher,
+    processes: int | None = backtest_processes,
+    as_of: bool = True,
+    policy: str = missing_policy,
+) -> dict[str, Any]:
+    """
+    Backtest many seasons in parallel, one season per task.
+
+    :param seasons: season years
+    :param fetcher_factory: picklable zero-argument callable building a fetcher in
+        each worker; the default uses the shared backtest response cache
+    :param processes: worker processes, None for one per CPU and 1 to stay in-process
+    :param as_of: see backtest_season
+    :param policy: see backtest_season
+    :return: {"combinations": overall stats, "seasons": stats per season}
+    """
+    per_season: dict[int, dict[str, ErrorStats]] = {}
+    with get_recorder().stage("backtest.run"):
+        if processes == 1 or len(seasons) <= 1:
+            for season in seasons:
+                _, per_season[season] = _run_season(
+                    fetcher_factory, season, as_of, policy
+                )
+        else:
+            with ProcessPoolExecutor(max_workers=processes) as pool:
+                futures = [
+                    pool.submit(_run_season, fetcher_factory, season, as_of, policy)
+                    for season in seasons
+                ]
+                for future in futures:
+                    season, stats = future.result()
+                    per_season[season] = stats
+
+    overall = {combination_name(c): ErrorStats() for c in combinations()}
+    for stats in per_season.values():
+        for name, season_stats in stats.items():
+            overall[name].merge(season_stats)
+
+    return {
+        "combinations": {name: s.as_dict() for name, s in overall.items()},
+        "seasons": {
+            season: {name: s.as_dict() for name, s in stats.items()}
+            for season, stats in per_season.items()
+        },
+    }
+
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (2, 3):
+        sys.exit("Usage: python -m src.statforge.backtest <seasons> [processes]")
+
+    report = run_backtest(
+        parse_weeks(sys.argv[1]) or [],
+        processes=int(sys.argv[2]) if len(sys.argv) == 3 else backtest_processes,
+    )
+
+    def cell(value: float | None, spec: str) -> str:
+        return "-" if value is None else format(value, spec)
+
+    print(f"{'combination':<36}{'games':>8}{'MAE':>8}{'RMSE':>8}{'ATS':>8}")
+    for name, row in report["combinations"].items():
+        print(
+            f"{name:<36}{row['games']:>8}"
+            f"{cell(row['mae'], '.2f'):>8}"
+            f"{cell(row['rmse'], '.2f'):>8}"
+            f"{cell(row['ats_hit_rate'], '.1%'):>8}"
+        )
@@ -0,0 +1,142 @@
+"""
+Season batch mode: compute adjusted lines for many weeks in one process.
+
+The SRS, PPA and havoc tables are season-level, so they are loaded once and the whole
+schedule comes back from a single games call. Backfilling every week of a season then
+costs the same set of API requests as a single weekly run.
+
+Season-level tables leak later results into early weeks. With "asof" each week's lines
+use only data through the week before, read from the metric history's as-of recordings
+(history.py) when the week was recorded, otherwise from an AsOfStore built in the same
+pass and recorded for next time.
+
+Usage:
+    python -m src.statforge.batch 2024 all
+    python -m src.statforge.batch 2024 3-10
+    python -m src.statforge.batch 2024 1,4,7
+    python -m src.statforge.batch 2024 all asof
+"""
+
+import sys
+
+from typing import Iterator
+
+from src.statforge.asof import build_as_of_store
+from src.statforge.cache import ResponseCache
+from src.statforge.combine import AdjustedLines, combine_factors, load_factor_weights
+from src.statforge.config import cache_enabled, cache_offline, missing_policy
+from src.statforge.data_loader import APIDataFetcher, DataLoader, make_api_fetcher
+from src.statforge.history import AS_OF, MetricHistory, open_history
+from src.statforge.main import calculate_adjusted_lines
+from src.statforge.metrics.engine import MatchupEngine
+from src.statforge.writers import open_writer
+
+
+def parse_weeks(spec: str) -> list[int] | None:
+    """
+    Parse a week selection such as "all", "3-10" or "1,4,7".
+
+    :param spec: week selection string
+    :return: sorted list of weeks, or None for every week on the schedule
+    """
+    if spec.strip().lower() == "all":
+        return None
+
+    weeks: set[int] = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if "-" in part:
+            start, end = part.split("-", 1)
+            weeks.update(range(int(start), int(end) + 1))
+        elif part:
+            weeks.add(int(part))
+
+    return sorted(weeks)
+
+
+def run_season(
+    api_fetcher: APIDataFetcher,
+    season: int,
+    weeks: list[int] | None = None,
+    as_of: bool = False,
+    history: MetricHistory | None = None,
+) -> dict[int, AdjustedLines]:
+    """
+    Load a season once and compute adjusted lines for each requested week.
+
+    :param api_fetcher: fetcher used for the single season-level load
+    :param season: season year
+    :param weeks: weeks to compute, or None for every week on the schedule
+    :param as_of: build each week's lines from data through the previous week only
+    :param history: MetricHistory to record loads in and, with as_of, to read recorded
+        weeks from instead of rebuilding them
+    :return: dict mapping week to that week's adjusted lines
+    """
+    return dict(iter_season(api_fetcher, season, weeks, as_of, history))
+
+
+def iter_season(
+    api_fetcher: APIDataFetcher,
+    season: int,
+    weeks: list[int] | None = None,
+    as_of: bool = False,
+    history: MetricHistory | None = None,
+) -> Iterator[tuple[int, AdjustedLines]]:
+    """
+    Like run_season, but yield each week's lines as soon as they are computed so they
+    can be streamed to a writer.
+    """
+    loader = DataLoader(api_fetcher, None, season=season, history=history)
+    # As-of lines only need the schedule; their metrics come from the history or an
+    # AsOfStore, so the season-level SRS, PPA and havoc tables would be thrown away
+    loader.load(sources=() if as_of else None)
+
+    if weeks is None:
+        weeks = list(loader.games_by_week)
+
+    store = None
+    weights = load_factor_weights()
+
+    for week in weeks:
+        games = loader.games_by_week.get(week, [])
+        if not games:
+            print(f"No games found for week {week}")
+            continue
+
+        if as_of:
+            registry = None
+            if history is not None:
+                registry = history.registry(season, week, source=AS_OF)
+            if registry is None:
+                # Built on the first week the history doesn't have
+                if store is None:
+                    store = build_as_of_store(api_fetcher, season)
+                registry = store.registry(week - 1)
+                if history is not None:
+                    history.record(season, week, registry, source=AS_OF)
+            engine = MatchupEngine(registry, weights.home_field)
+            yield week, combine_factors(engine.compute(games), missing_policy, weights)
+        else:
+            yield week, calculate_adjusted_lines(
+                loader, games, week, verbose=False, weights=weights
+            )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (3, 4) or sys.argv[3:] not in ([], ["asof"]):
+        sys.exit("Usage: python -m src.statforge.batch <season> <weeks|all> [asof]")
+
+    cache = ResponseCache(offline=cache_offline) if cache_enabled else None
+    api_fetcher: APIDataFetcher = make_api_fetcher(cache)
+
+    batch_season = int(sys.argv[1])
+    batch_weeks = parse_weeks(sys.argv[2])
+    with open_writer("text") as writer:
+        for week, adjusted_factors in iter_season(
+            api_fetcher,
+            batch_season,
+            batch_weeks,
+            as_of=len(sys.argv) == 4,
+            history=open_history(),
+        ):
+            writer.write(batch_season, week, adjusted_factors)
@@ -0,0 +1,296 @@
+"""
+Module for caching CFBD API responses on disk.
+
+Responses are keyed on the endpoint plus its call parameters (year, week, conference,
+exclude_garbage_time, ...) and stored as zlib-compressed JSON rows in a single SQLite
+file. Each endpoint has its own TTL, the file is kept under a byte budget by evicting
+the least recently used entries, and an offline mode serves strictly from the cache so
+a recorded cache can stand in for the live service.
+
+Responses come back as CachedRow records rather than cfbd models, whether served from
+the cache or freshly fetched, and the wrapped api is only built on the first miss, so
+a run served entirely from the cache never imports cfbd or needs an API key.
+"""
+
+import datetime
+import functools
+import json
+import re
+import sqlite3
+import threading
+import time
+import zlib
+
+from types import SimpleNamespace
+from typing import Any, Callable
+
+from src.statforge.config import (
+    cache_busy_timeout,
+    cache_max_bytes,
+    cache_path,
+    cache_ttls,
+)
+from src.statforge.instrumentation import get_recorder
+
+# Endpoint method names whose responses are cached. Other methods are passed straight
+# through to the wrapped api uncached.
+cacheable_endpoints: frozenset[str] = frozenset(
+    {
+        "get_games",
+        "get_srs",
+        "get_predicted_points_added_by_team",
+        "get_advanced_season_stats",
+        "get_plays",
+        "get_lines",
+    }
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _snake_case(key: str) -> str:
+    key = re.sub(r"([A-Z]+)([A-Z][a-z])", r"\1_\2", key)
+    return re.sub(r"(?<=[a-z0-9])([A-Z])", r"_\1", key).lower()
+
+
+class CachedRow(SimpleNamespace):
+    """
+    Attribute view of a cached response row, shaped like the cfbd model it was recorded
+    from: field names in snake_case and nested objects as CachedRows. Values keep
+    their JSON types, so dates and enums read back as strings.
+    """
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "CachedRow":
+        return cls(
+            **{_snake_case(key): _from_json(value) for key, value in data.items()}
+        )
+
+
+def _from_json(value: Any) -> Any:
+    if isinstance(value, dict):
+        return CachedRow.from_dict(value)
+    if isinstance(value, list):
+        return [_from_json(item) for item in value]
+    return value
+
+
+class CacheMiss(LookupError):
+    """
+    Raised in offline mode when a request has no cached response.
+    """
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+def make_key(endpoint: str, params: dict[str, Any]) -> str:
+    """
+    Build a stable cache key from an endpoint and its call parameters. None-valued
+    parameters are dropped so that omitted and explicitly-None arguments share a key.
+
+    :param endpoint: api method name, e.g. "get_srs"
+    :param params: keyword arguments passed to the endpoint
+    :return: cache key string
+    """
+    cleaned = {k: v for k, v in params.items() if v is not None}
+    return f"{endpoint}?{json.dumps(cleaned, sort_keys=True, default=_json_default)}"
+
+
+class ResponseCache:
+    """
+    Size-bounded, TTL-aware LRU cache of API responses backed by a SQLite file.
+
+    Attributes:
+        path: location of the SQLite file (":memory:" for a throwaway cache)
+        ttls: seconds an entry stays fresh, per endpoint; endpoints not listed use
+            ttls["default"]
+        max_bytes: upper bound on the total compressed payload size
+        offline: when True, never hit the network and ignore TTLs
+        max_age: when set, caps every TTL, e.g. so a periodic refresh never re-serves
+            a response fetched by the refresh before it
+        hits / misses: counters for the lifetime of this object
+    """
+
+    def __init__(
+        self,
+        path: str = cache_path,
+        ttls: dict[str, float] | None = None,
+        max_bytes: int = cache_max_bytes,
+        offline: bool = False,
+        max_age: float | None = None,
+    ) -> None:
+        self.path = path
+        self.ttls = dict(cache_ttls if ttls is None else ttls)
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+
+        # DataLoader issues calls from a thread pool, so the connection is shared
+        # behind a lock rather than bound to the creating thread.
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            path, timeout=cache_busy_timeout, check_same_thread=False
+        )
+        # Worker processes (backtest, simulation) share the file: with WAL readers
+        # never block on a writer, and writers wait out each other's transactions
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, endpoint TEXT NOT NULL, created REAL NOT NULL, "
+            "accessed REAL NOT NULL, size INTEGER NOT NULL, payload BLOB NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)"
+        )
+        self._conn.commit()
+
+    def get(self, endpoint: str, key: str) -> list[dict] | None:
+        """
+        Look up a cached response.
+
+        :param endpoint: api method name, used to pick the TTL
+        :param key: key built by make_key
+        :return: the cached rows as dicts, or None if absent or expired
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT created, payload FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            created, payload = row
+            ttl = self.ttls.get(endpoint, self.ttls.get("default", 0))
+            if self.max_age is not None:
+                ttl = min(ttl, self.max_age)
+            if not self.offline and now - created > ttl:
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE responses SET accessed = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            self.hits += 1
+
+        return json.loads(zlib.decompress(payload))
+
+    def put(self, endpoint: str, key: str, rows: list[dict]) -> None:
+        """
+        Store a response, evicting least recently used entries if the cache grows past
+        max_bytes.
+
+        :param endpoint: api method name
+        :param key: key built by make_key
+        :param rows: response rows as plain dicts
+        """
+        payload = zlib.compress(
+            json.dumps(rows, separators=(",", ":"), default=_json_default).encode()
+        )
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (key, endpoint, now, now, len(payload), payload),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _evict(self) -> None:
+        (total,) = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        if total <= self.max_bytes:
+            return
+
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed ASC"
+        ).fetchall():
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+
+class CachedApi:
+    """
+    Wrapper around a cfbd api object (RatingsApi, GamesApi, ...) that serves known
+    endpoints from a ResponseCache and records fresh responses into it.
+
+    Attributes:
+        api: the wrapped cfbd api, or None when running purely offline
+        cache: the ResponseCache backing this wrapper
+    """
+
+    def __init__(
+        self,
+        api: Any,
+        cache: ResponseCache,
+        factory: Callable[[], Any] | None = None,
+    ) -> None:
+        """
+        :param api: the cfbd api to wrap, or None
+        :param cache: the ResponseCache to serve from
+        :param factory: builds the api on the first miss when api is None, so runs
+            served from the cache never construct a client
+        """
+        self._api = api
+        self._factory = factory
+        self._factory_lock = threading.Lock()
+        self.cache = cache
+
+    @property
+    def api(self) -> Any:
+        if self._api is None and self._factory is not None:
+            with self._factory_lock:
+                if self._api is None:
+                    self._api = self._factory()
+        return self._api
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        if name not in cacheable_endpoints:
+            if self.api is None:
+                raise CacheMiss(f"{name} is not cacheable and no api is configured")
+            return getattr(self.api, name)
+
+        def call(**params: Any) -> list:
+            key = make_key(name, params)
+            rows = self.cache.get(name, key)
+
+            if rows is None:
+                get_recorder().count(f"cache.miss:{name}")
+                if self.cache.offline or self.api is None:
+                    raise CacheMiss(f"No cached response for {key}")
+                response = getattr(self.api, name)(**params)
+                # Round-trip through JSON so a fresh response reads exactly like a
+                # cached one: dates and enums as strings, nested objects as CachedRows
+                rows = json.loads(
+                    json.dumps(
+                        [entry.to_dict() for entry in response], default=_json_default
+                    )
+                )
+                self.cache.put(name, key, rows)
+            else:
+                get_recorder().count(f"cache.hit:{name}")
+
+            return [CachedRow.from_dict(row) for row in rows]
+
+        return call
@@ -0,0 +1,293 @@
+"""
+Module for combining SRS, PPA and Havoc factors into adjusted per-matchup lines.
+
+Every factor source is joined on the (away, home) matchup, never by list position, so
+a game missing from one source can't shift the rows of another. What happens to a game
+missing a factor is set by a policy:
+- "drop": only games with every factor are kept
+- "zero": games with an SRS line are kept and missing factors count as 0
+- "partial": like "zero", but missing factors stay NaN in the table and the row is
+  flagged incomplete
+
+SRS is the base of every line, so a game without one is always dropped.
+
+The adjusted line is the SRS line plus each factor times its weight. The weights and the
+home-field points of the SRS line default to 1 and config's home_field_advantage, and
+are replaced by the ones fitting.py saves to factor_weights_path once a fit has run.
+"""
+
+import json
+import os
+
+from typing import Iterator, Literal, NamedTuple
+
+import numpy as np
+
+from src.statforge.config import factor_weights_path, home_field_advantage
+from src.statforge.instrumentation import get_recorder
+from src.statforge.metrics.engine import MatchupFactors
+
+MissingPolicy = Literal["drop", "zero", "partial"]
+
+missing_policies: tuple[str, ...] = ("drop", "zero", "partial")
+
+
+class FactorWeights(NamedTuple):
+    home_field: float = home_field_advantage
+    ppa: float = 1.0
+    havoc_top: float = 1.0
+    havoc_bottom: float = 1.0
+
+
+def load_factor_weights(path: str | None = factor_weights_path) -> FactorWeights:
+    """
+    Read the weights saved by fitting.py.
+
+    :param path: weights file, None to skip loading
+    :return: the saved FactorWeights, or the defaults if there is no file
+    """
+    if path is None or not os.path.exists(path):
+        return FactorWeights()
+    with open(path) as f:
+        return FactorWeights(**json.load(f)["weights"])
+
+
+def save_factor_weights(
+    weights: FactorWeights, path: str = factor_weights_path, **details
+) -> None:
+    """
+    Write weights for load_factor_weights, replacing any previous file in one step.
+
+    :param weights: the FactorWeights to save
+    :param path: weights file
+    :param details: extra JSON-serializable fields stored alongside, e.g. fit scores
+    """
+    temporary = f"{path}.tmp"
+    with open(temporary, "w") as f:
+        json.dump({"weights": weights._asdict(), **details}, f, indent=2)
+    os.replace(temporary, path)
+
+
+class AdjustedLine(NamedTuple):
+    away_team: str
+    home_team: str
+    srs_line: float
+    ppa_factor: float
+    havoc_factor_top: float
+    havoc_factor_bottom: float
+    adjusted: float
+    complete: bool
+
+
+class AdjustedLines:
+    """
+    Column-oriented table of adjusted lines, one entry per kept matchup.
+
+    Attributes:
+        games: the (away, home) matchups
+        srs_line, ppa_factor, havoc_top, havoc_bottom: factor columns
+        adjusted: srs_line plus every available factor times its weight
+        complete: whether every factor was present for the game
+        extra: dict mapping other registered metrics to their factor columns
+        weights: FactorWeights the factors were summed with
+    """
+
+    __slots__ = (
+        "games",
+        "srs_line",
+        "ppa_factor",
+        "havoc_top",
+        "havoc_bottom",
+        "adjusted",
+        "complete",
+        "extra",
+        "weights",
+        "_index",
+    )
+
+    def __init__(
+        self,
+        games: list[tuple[str, str]],
+        srs_line: np.ndarray,
+        ppa_factor: np.ndarray,
+        havoc_top: np.ndarray,
+        havoc_bottom: np.ndarray,
+        complete: np.ndarray,
+        extra: dict[str, np.ndarray] | None = None,
+        weights: FactorWeights | None = None,
+    ) -> None:
+        self.games = games
+        self.srs_line = srs_line
+        self.ppa_factor = ppa_factor
+        self.havoc_top = havoc_top
+        self.havoc_bottom = havoc_bottom
+        self.complete = complete
+        self.extra = extra or {}
+        self.weights = weights or FactorWeights()
+        # Influence is defined as the weighted aggregation of all available factors
+        w = self.weights
+        self.adjusted = srs_line + np.nansum(
+            np.stack(
+                [
+                    w.ppa * ppa_factor,
+                    w.havoc_top * havoc_top,
+                    w.havoc_bottom * havoc_bottom,
+                    *self.extra.values(),
+                ]
+            ),
+            axis=0,
+        )
+        self._index: dict[tuple[str, str], int] | None = None
+
+    def __len__(self) -> int:
+        return len(self.games)
+
+    def __iter__(self) -> Iterator[AdjustedLine]:
+        for i, (away_team, home_team) in enumerate(self.games):
+            yield AdjustedLine(
+                away_team,
+                home_team,
+                float(self.srs_line[i]),
+                float(self.ppa_factor[i]),
+                float(self.havoc_top[i]),
+                float(self.havoc_bottom[i]),
+                float(self.adjusted[i]),
+                bool(self.complete[i]),
+            )
+
+    def items(self) -> Iterator[tuple[str, float]]:
+        """
+        Yield ("away_team vs home_team", adjusted line) pairs for display.
+        """
+        for (away_team, home_team), adjusted in zip(self.games, self.adjusted):
+            yield f"{away_team} vs {home_team}", float(adjusted)
+
+    def to_dict(self) -> dict[str, float]:
+        return dict(self.items())
+
+    def lookup(self, away_team: str, home_team: str) -> float | None:
+        """
+        Adjusted line for a single matchup, or None if it isn't in the table.
+        """
+        if self._index is None:
+            self._index = {game: i for i, game in enumerate(self.games)}
+        i = self._index.get((away_team, home_team))
+        return None if i is None else float(self.adjusted[i])
+
+
+def combine_factors(
+    factors: MatchupFactors,
+    policy: MissingPolicy = "drop",
+    weights: FactorWeights | None = None,
+) -> AdjustedLines:
+    """
+    Combine the engine's aligned factor columns into adjusted lines in a single
+    vectorized pass.
+
+    :param factors: MatchupFactors from MatchupEngine.compute
+    :param policy: how to treat games missing a PPA or havoc factor
+    :param weights: factor weights, None for unit weights; the home field is already
+        part of the engine's SRS line
+    :return: AdjustedLines table
+    """
+    if policy not in missing_policies:
+        raise ValueError(f"Unknown missing-data policy: {policy}")
+
+    get_recorder().add_rows("combine_factors", len(factors))
+    complete = (
+        factors.srs_valid
+        & factors.ppa_valid
+        & factors.havoc_top_valid
+        & factors.havoc_bottom_valid
+    )
+    for _, valid in factors.extra.values():
+        complete = complete & valid
+    keep = complete if policy == "drop" else factors.srs_valid
+    rows = np.flatnonzero(keep)
+
+    def column(values: np.ndarray, valid: np.ndarray) -> np.ndarray:
+        values = np.where(valid, values, np.nan)[rows]
+        return np.nan_to_num(values) if policy == "zero" else values
+
+    return AdjustedLines(
+        [factors.games[i] for i in rows],
+        factors.srs_line[rows],
+        column(factors.ppa_factor, factors.ppa_valid),
+        column(factors.havoc_top, factors.havoc_top_valid),
+        column(factors.havoc_bottom, factors.havoc_bottom_valid),
+        complete[rows],
+        {name: column(*factor) for name, factor in factors.extra.items()},
+        weights,
+    )
+
+
+def join_factor_rows(
+    srs_lines: dict[str, float],
+    ppa_factors: list[dict[str, float]],
+    havoc_factors_top: list[dict[str, float]],
+    havoc_factors_bottom: list[dict[str, float]],
+    policy: MissingPolicy = "drop",
+    weights: FactorWeights | None = None,
+) -> AdjustedLines:
+    """
+    Keyed join of the per-game calculator outputs, for callers that still use the
+    dict/list shapes rather than the matchup engine.
+
+    :param srs_lines: dict mapping "away_team vs home_team" to the SRS line
+    :param ppa_factors: rows containing total_factor per matchup
+    :param havoc_factors_top: rows containing havoc_factor_top per matchup
+    :param havoc_factors_bottom: rows containing havoc_factor_bottom per matchup
+    :param policy: how to treat games missing a PPA or havoc factor
+    :param weights: factor weights, None for unit weights; the home field is already
+        part of srs_lines, so build them with CalculateSRSLine(...,
+        home_field=weights.home_field)
+    :return: AdjustedLines table in srs_lines order
+    """
+    if policy not in missing_policies:
+        raise ValueError(f"Unknown missing-data policy: {policy}")
+
+    # matchup -> ((away, home), [ppa, havoc_top, havoc_bottom])
+    keyed: dict[str, tuple[tuple[str, str], list[float]]] = {}
+    sources = (
+        (ppa_factors, "total_factor"),
+        (havoc_factors_top, "havoc_factor_top"),
+        (havoc_factors_bottom, "havoc_factor_bottom"),
+    )
+    for position, (rows, field) in enumerate(sources):
+        for row in rows:
+            game = (row["away_team"], row["home_team"])
+            matchup = f"{game[0]} vs {game[1]}"
+            if matchup not in keyed:
+                keyed[matchup] = (game, [np.nan, np.nan, np.nan])
+            keyed[matchup][1][position] = row[field]
+
+    games: list[tuple[str, str]] = []
+    columns: list[list[float]] = []
+    for matchup, srs_line in srs_lines.items():
+        entry = keyed.get(matchup)
+        if entry is None:
+            if policy == "drop":
+                continue
+            away_team, home_team = matchup.split(" vs ", 1)
+            entry = ((away_team, home_team), [np.nan, np.nan, np.nan])
+
+        game, values = entry
+        if policy == "drop" and any(np.isnan(value) for value in values):
+            continue
+        games.append(game)
+        columns.append([srs_line, *values])
+
+    table = np.array(columns, dtype=float).reshape(-1, 4)
+    complete = ~np.isnan(table).any(axis=1)
+    if policy == "zero":
+        table = np.nan_to_num(table)
+
+    return AdjustedLines(
+        games,
+        table[:, 0],
+        table[:, 1],
+        table[:, 2],
+        table[:, 3],
+        complete,
+        weights=weights,
+    )
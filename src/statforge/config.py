@@ -1 +1,132 @@
 year: int = 2024
+
+# Upper bound on concurrent API calls made by DataLoader.load. 1 keeps the old
+# strictly sequential behaviour.
+max_workers: int = 8
+
+# On-disk response cache used by APIDataFetcher. TTLs are in seconds per endpoint;
+# schedules change during a season far more often than the season-level ratings.
+cache_enabled: bool = True
+cache_offline: bool = False
+cache_path: str = ".statforge_cache.sqlite3"
+cache_max_bytes: int = 64 * 1024 * 1024
+cache_ttls: dict[str, float] = {
+    "default": 60 * 60,
+    "get_games": 15 * 60,
+    "get_srs": 6 * 60 * 60,
+    "get_predicted_points_added_by_team": 6 * 60 * 60,
+    "get_advanced_season_stats": 6 * 60 * 60,
+}
+# Seconds a process waits for another one writing to the cache file before failing.
+cache_busy_timeout: float = 30.0
+
+# How adjust_factor treats a game missing a PPA or havoc factor: "drop", "zero" or
+# "partial". See combine.py.
+missing_policy: str = "drop"
+
+# Fetcher used by the entry points: "sync" for the generated cfbd clients, "async" for
+# the pooled aiohttp client in async_fetcher.py.
+fetcher: str = "sync"
+cfbd_host: str = "https://api.collegefootballdata.com"
+request_timeout: float = 30.0
+rate_limit_per_second: float = 10.0
+rate_limit_burst: int = 20
+max_retries: int = 4
+backoff_base: float = 0.5
+backoff_cap: float = 8.0
+
+# When set, main.py records per-stage/per-call timings, row counts and peak memory and
+# writes them here at the end of the run, as "json" or "prometheus" text.
+metrics_path: str | None = None
+metrics_format: str = "json"
+
+# Where DataLoader gets SRS ratings: "api" for CFBD's precomputed per-conference
+# ratings, "solver" to compute them from every game result (all divisions) with
+# metrics/srs_solver.py. srs_margin_cap clips blowouts, None for no cap.
+srs_source: str = "api"
+srs_margin_cap: float | None = None
+
+# Monte Carlo season simulation (simulation.py). Each game's home margin is drawn from
+# a normal distribution centred on its adjusted line with this standard deviation.
+simulation_margin_sd: float = 14.0
+simulation_seasons: int = 100_000
+simulation_chunk_size: int = 10_000
+# Worker processes for simulation chunks: None for one per CPU, 1 to run in-process.
+simulation_processes: int | None = None
+
+# Where DataLoader gets PPA and havoc: "api" for CFBD's season-level aggregates, "plays"
+# to stream play-by-play week by week through plays.py with our own rules.
+team_metrics_source: str = "api"
+plays_exclude_garbage_time: bool = True
+plays_opponent_adjust: bool = False
+
+# Multi-season backtest (backtest.py): weeks before backtest_first_week have no prior
+# data to rate teams with; processes as for the simulation.
+backtest_first_week: int = 2
+backtest_processes: int | None = None
+# Backtests and fits have their own response cache, sized for many seasons of weekly
+# play-by-play (roughly 50 MB compressed per season) and kept for a week, so a rerun
+# or refit loads nothing from the API and weekly runs can't evict it.
+backtest_cache_path: str = ".statforge_backtest_cache.sqlite3"
+backtest_cache_max_bytes: int = 2 * 1024 * 1024 * 1024
+backtest_cache_ttl: float = 7 * 24 * 60 * 60
+
+# HTTP service mode (service.py): address to bind and seconds between background
+# reloads of the season data.
+service_host: str = "127.0.0.1"
+service_port: int = 8080
+service_refresh_seconds: float = 15 * 60
+
+# Metrics main.py computes (names from metrics/registry.py), None for all of them. Only
+# the data sources the selected metrics need are fetched.
+selected_metrics: list[str] | None = None
+
+# Fetch SRS and PPA with one season-wide request each, filtered locally, instead of one
+# request per conference. A bulk response with bulk_truncation_rows or more rows is
+# assumed truncated and re-fetched per conference.
+bulk_requests: bool = True
+bulk_truncation_rows: int = 10_000
+
+# Points credited to the home side of every SRS line. Fitted weights (fitting.py) saved
+# at factor_weights_path override it along with the PPA and havoc weights; without
+# that file every factor has weight 1.
+home_field_advantage: float = 2.5
+factor_weights_path: str | None = ".statforge_weights.json"
+# Cached game-by-factor matrices, so refits don't reload or recompute any season, and
+# the ridge penalties and number of folds tried when cross-validating a fit.
+fitting_cache_dir: str = ".statforge_features"
+fitting_alphas: tuple[float, ...] = (0.0, 0.001, 0.01, 0.1, 1.0, 10.0)
+fitting_folds: int = 5
+
+# All-pairs matchup matrix file, written by `python -m src.statforge.matchup_matrix
+# build` and memory-mapped by lookups.
+matchup_matrix_path: str = ".statforge_matchups.bin"
+
+# Output of the main.py CLI (writers.py): "text", "csv", "jsonl" or "parquet", written
+# to output_path ("-" for stdout) through a buffer of writer_buffer_bytes. Parquet
+# buffers weeks into row groups of at least parquet_row_group_rows rows.
+output_format: str = "text"
+output_path: str = "-"
+writer_buffer_bytes: int = 1024 * 1024
+parquet_row_group_rows: int = 64 * 1024
+
+# Wall-time budget in seconds for importing the CLI entry point, checked by the
+# benchmark suite. cfbd, dotenv and the API clients are only loaded once a request
+# actually goes out, so a run from the cache or a snapshot starts without them. NumPy
+# is still imported (through the metrics engine) and accounts for most of the roughly
+# 0.15-0.2 s a cold import takes.
+import_time_budget: float = 0.25
+
+# Append-only history of team metrics per (season, week) (history.py), recorded after
+# every full load by the entry points. A partition of a season before `year` is
+# compacted into one segment once it holds history_compact_segments segments.
+history_enabled: bool = True
+history_path: str = ".statforge_history"
+history_compact_segments: int = 8
+
+# Game-day live mode (live.py): seconds between schedule polls. When no more than
+# live_team_request_limit teams finished since the last poll, DataLoader.load_teams
+# refetches their PPA and havoc with one request per team; beyond that the season-wide
+# requests are cheaper.
+live_poll_seconds: float = 60.0
+live_team_request_limit: int = 10
@@ -1,28 +1,58 @@
 import sys
-import cfbd
 import os
-
-from typing import TypedDict
-from dotenv import load_dotenv
-from cfbd import TeamSeasonPredictedPointsAdded, DivisionClassification
-from src.statforge.config import year
-
-
-load_dotenv()
-
-conferences: list[str] = [
-    "FBS Independents",
-    "American Athletic",
-    "ACC",
-    "Big 12",
-    "Big Ten",
-    "Conference USA",
-    "Mid-American",
-    "Mountain West",
-    "Pac-12",
-    "SEC",
-    "Sun Belt",
-]
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import TYPE_CHECKING, Any, Callable, Iterable, TypedDict
+from src.statforge.cache import CachedApi, ResponseCache
+from src.statforge.config import (
+    bulk_requests,
+    fetcher,
+    live_team_request_limit,
+    max_workers,
+    plays_exclude_garbage_time,
+    plays_opponent_adjust,
+    srs_source,
+    team_metrics_source,
+    year,
+)
+from src.statforge.history import MetricHistory, load_source
+from src.statforge.instrumentation import get_recorder
+from src.statforge.metrics.srs_solver import GameResult, SRSSolver
+from src.statforge.plays import aggregate_plays, api_plays
+from src.statforge.request_planner import bulk_call, conference_codes
+from src.statforge.snapshot import read_snapshot, write_snapshot
+from src.statforge.teams import TeamHavocStats, TeamRegistry, changed_teams
+
+if TYPE_CHECKING:
+    from cfbd import TeamSeasonPredictedPointsAdded
+
+# cfbd is imported on first use rather than here: it takes most of a second to import
+# and runs served from the cache or a snapshot never need it.
+
+# Value of cfbd.DivisionClassification.FBS; the clients accept the plain string.
+FBS: str = "fbs"
+
+# APIDataFetcher attribute -> cfbd api class, built on first access.
+api_classes: dict[str, str] = {
+    "ratings_api": "RatingsApi",
+    "games_api": "GamesApi",
+    "metrics_api": "MetricsApi",
+    "stats_api": "StatsApi",
+    "plays_api": "PlaysApi",
+    "betting_api": "BettingApi",
+}
+
+conferences: list[str] = list(conference_codes)
+
+# Team-level data DataLoader.load can fetch; the schedule is always loaded.
+data_sources: tuple[str, ...] = ("srs", "ppa", "havoc")
+
+# SRS endpoint uses abbreviations - will NOT work with the globally defined list
+# (see conference_codes in request_planner.py)
+srs_conferences: list[str] = list(conference_codes.values())
 
 
 def get_api_key() -> str:
@@ -32,6 +62,10 @@ def get_api_key() -> str:
 
     :return: API_KEY from .env
     """
+    # Read .env only when a key is actually needed
+    from dotenv import load_dotenv
+
+    load_dotenv()
     api_key: str | None = os.getenv("CFBD_API_KEY")
     if not api_key:
         sys.exit("Error: Missing API_KEY environment variable.")
@@ -39,22 +73,91 @@ def get_api_key() -> str:
 
 
 class APIDataFetcher:
-    def __init__(self):
-        self.api_key = get_api_key()
-        self.api_client = self._create_api_client()
-        self.ratings_api = cfbd.RatingsApi(self.api_client)
-        self.games_api = cfbd.GamesApi(self.api_client)
-        self.metrics_api = cfbd.MetricsApi(self.api_client)
-        self.stats_api = cfbd.StatsApi(self.api_client)
+    """
+    Holds the cfbd api clients used by DataLoader.
+
+    Nothing is built up front: each api in api_classes is created on first access, and
+    the shared client, the API key and cfbd itself only when a request actually goes
+    out. When given a ResponseCache every api is wrapped so repeated requests are
+    served from disk, and the real api behind it is only built on a miss. An offline
+    cache never builds a client at all, so no API key is needed.
+    """
+
+    def __init__(self, cache: ResponseCache | None = None):
+        self.cache = cache
+        self._api_key: str | None = None
+        self._api_client: Any = None
+        self._lock = threading.RLock()
+
+    @property
+    def api_key(self) -> str | None:
+        if self._api_key is None and not self.offline:
+            self._api_key = get_api_key()
+        return self._api_key
+
+    @property
+    def offline(self) -> bool:
+        return self.cache is not None and self.cache.offline
+
+    @property
+    def api_client(self) -> Any:
+        if self._api_client is None and not self.offline:
+            with self._lock:
+                if self._api_client is None:
+                    self._api_client = self._create_api_client()
+        return self._api_client
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes not set yet; the built api is stored on the
+        # instance, so later accesses never come back here.
+        api_class = api_classes.get(name)
+        if api_class is None:
+            raise AttributeError(name)
+        with self._lock:
+            api = self.__dict__.get(name)
+            if api is None:
+                if self.cache is None:
+                    api = self._create_api(api_class)
+                else:
+                    factory = None
+                    if not self.offline:
+                        factory = partial(self._create_api, api_class)
+                    api = CachedApi(None, self.cache, factory)
+                self.__dict__[name] = api
+        return api
+
+    def _create_api(self, api_class: str) -> Any:
+        import cfbd
+
+        return getattr(cfbd, api_class)(self.api_client)
 
     def _create_api_client(self):
-        config = cfbd.Configuration(access_token=get_api_key())
+        import cfbd
+
+        config = cfbd.Configuration(access_token=self.api_key)
         return cfbd.ApiClient(config)
 
 
-def build_game_tuples(api_fetcher: APIDataFetcher, current_week: int) -> list[tuple]:
+def make_api_fetcher(cache: ResponseCache | None = None) -> APIDataFetcher:
+    """
+    Build the fetcher selected by config.fetcher.
+
+    :param cache: optional ResponseCache to serve repeated requests from
+    :return: APIDataFetcher, or AsyncAPIDataFetcher when config.fetcher is "async"
+    """
+    if fetcher == "async":
+        # Imported lazily so aiohttp is only needed when the async fetcher is used
+        from src.statforge.async_fetcher import AsyncAPIDataFetcher
+
+        return AsyncAPIDataFetcher(cache)
+    return APIDataFetcher(cache)
+
+
+def build_game_tuples(
+    api_fetcher: APIDataFetcher, current_week: int, season: int = year
+) -> list[tuple]:
     games = api_fetcher.games_api.get_games(
-        year=year, week=current_week, classification=DivisionClassification.FBS
+        year=season, week=current_week, classification=FBS
     )
 
     out = []
@@ -68,120 +171,554 @@ def build_game_tuples(api_fetcher: APIDataFetcher, current_week: int) -> list[tu
     return out
 
 
-class TeamHavocStats(TypedDict):
-    offense: float | None
-    defense: float | None
+def build_game_results(
+    api_fetcher: APIDataFetcher, season: int = year
+) -> list[GameResult]:
+    """
+    Fetch every completed game of a season, across all divisions, in one call.
+
+    :param api_fetcher: fetcher to use
+    :param season: season year
+    :return: list of GameResult for games with final scores
+    """
+    return _to_results(api_fetcher.games_api.get_games(year=season))
+
+
+def current_week(games: list) -> int | None:
+    """
+    The week season-to-date data reflects: the first week on a schedule with a game not
+    yet final, or the week after the last one once every game is.
+
+    :param games: schedule rows with week and completed
+    :return: week, or None for an empty schedule
+    """
+    if not games:
+        return None
+    pending = [game.week for game in games if not game.completed]
+    return min(pending) if pending else max(game.week for game in games) + 1
+
+
+def _to_results(games: list) -> list[GameResult]:
+    return [
+        GameResult(
+            game.week,
+            game.away_team,
+            game.home_team,
+            game.away_points,
+            game.home_points,
+            bool(game.neutral_site),
+        )
+        for game in games
+        if game.completed
+        and game.away_points is not None
+        and game.home_points is not None
+    ]
+
+
+class CallResult(TypedDict):
+    name: str
+    rows: list | None
+    seconds: float
+    error: Exception | None
+
+
+def timed_call(name: str, call: Callable[[], Any]) -> CallResult:
+    """
+    Run a single API call, timing it and capturing any exception so that one failed
+    call never takes down the calls running beside it.
+
+    :param name: label for the call, e.g. "srs:SEC"
+    :param call: zero-argument callable performing the request
+    :return: the rows (or None on failure), elapsed seconds and the captured error
+    """
+    start = time.perf_counter()
+    try:
+        rows = list(call())
+        error = None
+    except Exception as e:
+        rows = None
+        error = e
+    seconds = time.perf_counter() - start
+
+    get_recorder().record_call(
+        name, seconds, len(rows) if rows is not None else 0, error is not None
+    )
+    return {"name": name, "rows": rows, "seconds": seconds, "error": error}
 
 
 class DataLoader:
     """
     To handle all API work. Goal is to load in and shape the data accordingly, while
     allowing calculators to just calculate.
+
+    Every request made by load() is independent of the others, so they are issued
+    together on a thread pool bounded by max_workers and merged afterwards in a fixed
+    order. Per-call wall times end up in self.timings.
+
+    The SRS, PPA and havoc tables are season-level. Passing week=None loads the whole
+    season's schedule in a single games call, grouped into games_by_week, so a batch
+    over many weeks costs the same number of requests as a single week.
+
+    Calling load() again refreshes the tables and records in changed_teams which
+    teams' metrics moved since the previous load, so downstream work can be limited to
+    the games those teams play. load_teams() does the same for a handful of teams
+    whose games just finished with team-filtered requests (see live.py).
+
+    With srs_source="solver" the per-conference SRS calls are replaced by a single
+    all-division results call and ratings are solved locally, as of the week before
+    self.week (or the whole season for week=None). The solver is kept across loads so
+    each refresh warm-starts from the previous ratings.
+
+    With team_metrics_source="plays" the PPA and havoc calls are replaced by streaming
+    play-by-play through plays.py, one week at a time, for the weeks before self.week.
+
+    With bulk_requests (the default) SRS and PPA each come from one season-wide call
+    filtered locally, falling back to per-conference calls only if that call fails or
+    looks truncated (see request_planner.py), so a full load is four requests.
+
+    load(sources=...) fetches only the listed data sources (see metrics/registry.py for
+    planning them from a metric selection); tables for the others are left empty.
+
+    Given a MetricHistory, every full load is recorded in it under the week its tables
+    reflect (see history.py): current_week for season-to-date tables, or self.week when
+    the tables are built locally from data before it, tagged with
+    load_source(srs_source, team_metrics_source) so they never mix with as-of
+    recordings. A single-week load of a week that has already been played is not
+    recorded, since its season-to-date tables include later results.
     """
 
-    def __init__(self, api_fetcher: APIDataFetcher, week: int) -> None:
+    def __init__(
+        self,
+        api_fetcher: APIDataFetcher,
+        week: int | None,
+        max_workers: int = max_workers,
+        season: int = year,
+        srs_source: str = srs_source,
+        team_metrics_source: str = team_metrics_source,
+        bulk_requests: bool = bulk_requests,
+        history: MetricHistory | None = None,
+        team_request_limit: int = live_team_request_limit,
+    ) -> None:
         self.api_fetcher = api_fetcher
         self.week = week
+        self.season = season
+        self.max_workers = max(1, max_workers)
+        self.srs_source = srs_source
+        self.srs_solver = SRSSolver()
+        self.team_metrics_source = team_metrics_source
+        self.bulk_requests = bulk_requests
+        self.history = history
+        self.team_request_limit = team_request_limit
+        self.current_week: int | None = None
+        self.sources: frozenset[str] = frozenset(data_sources)
 
         self.games: list[tuple[str, str]] = []
+        self.games_by_week: dict[int, list[tuple[str, str]]] = {}
+        self.schedule: list = []
+        self.results: list[GameResult] = []
         self.srs_by_team: dict[str, float] = {}
         self.ppa_by_team: dict[str, dict[str, float]] = {}
         self.havoc_by_team: dict[str, TeamHavocStats] = {}
+        self.teams: TeamRegistry = TeamRegistry()
+        self.changed_teams: set[str] = set()
+        self.timings: dict[str, float] = {}
+
+    def load(self, sources: Iterable[str] | None = None) -> None:
+        """
+        Fetch the schedule and the requested team-level data, then rebuild the tables.
+
+        :param sources: subset of data_sources to fetch, None for all of them
+        """
+        self.sources = frozenset(data_sources if sources is None else sources)
+        unknown = self.sources - set(data_sources)
+        if unknown:
+            raise ValueError(f"Unknown data sources: {sorted(unknown)}")
+
+        fetched = ["games", *(name for name in data_sources if name in self.sources)]
+        print(f"Loading {', '.join(fetched)}..", file=sys.stderr)
+        recorder = get_recorder()
+        by_name = self._fetch(self._plan_calls())
+
+        with recorder.stage("load.merge"):
+            self.games_by_week = self._merge_games(by_name["games"])
+            self.games = [
+                game for games in self.games_by_week.values() for game in games
+            ]
+            self.srs_by_team, self.ppa_by_team, self.havoc_by_team = {}, {}, {}
+            if "srs" in self.sources and self.srs_source == "solver":
+                self.srs_by_team = self._solve_srs(by_name["results"])
+            elif "srs" in self.sources:
+                self.srs_by_team = self._merge_srs(
+                    self._results(by_name, "srs", srs_conferences)
+                )
+            if self.team_metrics_source == "plays":
+                if self.sources & {"ppa", "havoc"}:
+                    self._aggregate_plays()
+            else:
+                if "ppa" in self.sources:
+                    self.ppa_by_team = self._merge_ppa(
+                        self._results(by_name, "ppa", conferences)
+                    )
+                if "havoc" in self.sources:
+                    self.havoc_by_team = self._merge_havoc(by_name["havoc"])
+            self._rebuild_registry()
+
+        if by_name["games"]["error"] is None:
+            self.schedule = by_name["games"]["rows"]
+            self.current_week = current_week(self.schedule)
+        if self.history is not None:
+            self._record_history()
+
+    def load_teams(self, teams: Iterable[str]) -> None:
+        """
+        Refresh the tables after a few teams' games finished, instead of a full load().
+
+        PPA and havoc are per-team season aggregates, so only those teams' rows can
+        have moved; each is refetched with one team-filtered request per source. SRS
+        ratings are solved jointly, so one result can move every team's, and they come
+        from the usual season-wide request. With more than team_request_limit teams the
+        season-wide PPA and havoc requests are cheaper and used instead. The schedule is
+        not refetched.
+
+        Tables built locally (srs_source="solver", team_metrics_source="plays") can't be
+        updated team by team, and partial loads have nothing to update, so those fall
+        back to load().
+
+        :param teams: teams whose games just finished
+        """
+        teams = sorted(set(teams))
+        if (
+            self.srs_source != "api"
+            or self.team_metrics_source != "api"
+            or self.sources != set(data_sources)
+        ):
+            return self.load(self.sources)
+
+        api = self.api_fetcher
+        targeted = len(teams) <= self.team_request_limit
+        calls = [
+            (name, call)
+            for name, call in self._plan_calls()
+            if name.startswith("srs") or not targeted
+        ]
+        if targeted:
+            for team in teams:
+                calls.append(
+                    (
+                        f"ppa:{team}",
+                        partial(
+                            api.metrics_api.get_predicted_points_added_by_team,
+                            year=self.season,
+                            team=team,
+                            exclude_garbage_time=True,
+                        ),
+                    )
+                )
+                calls.append(
+                    (
+                        f"havoc:{team}",
+                        partial(
+                            api.stats_api.get_advanced_season_stats,
+                            year=self.season,
+                            team=team,
+                            exclude_garbage_time=True,
+                        ),
+                    )
+                )
 
-    def load(self) -> None:
-        self.games = build_game_tuples(self.api_fetcher, self.week)
-        self.srs_by_team = self._load_srs()
-        self.ppa_by_team = self._load_ppa()
-        self.havoc_by_team = self._load_havoc()
+        by_name = self._fetch(calls)
+        with get_recorder().stage("load.merge"):
+            self.srs_by_team = self._merge_srs(
+                self._results(by_name, "srs", srs_conferences)
+            )
+            if targeted:
+                self.ppa_by_team.update(
+                    self._merge_ppa([by_name[f"ppa:{team}"] for team in teams])
+                )
+                for team in teams:
+                    self.havoc_by_team.update(
+                        self._merge_havoc(by_name[f"havoc:{team}"])
+                    )
+            else:
+                self.ppa_by_team = self._merge_ppa(
+                    self._results(by_name, "ppa", conferences)
+                )
+                self.havoc_by_team = self._merge_havoc(by_name["havoc"])
+            self._rebuild_registry()
+
+        if self.history is not None:
+            self._record_history()
+
+    def _fetch(
+        self, calls: list[tuple[str, Callable[[], Any]]]
+    ) -> dict[str, CallResult]:
+        with get_recorder().stage("load.fetch"):
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                futures = [pool.submit(timed_call, name, call) for name, call in calls]
+                # Collected in submission order so the merge is deterministic no
+                # matter which call finished first.
+                results = [future.result() for future in futures]
+
+        self.timings = {result["name"]: result["seconds"] for result in results}
+        return {result["name"]: result for result in results}
+
+    def _rebuild_registry(self) -> None:
+        previous = self.teams
+        self.teams = TeamRegistry.from_tables(
+            self.srs_by_team, self.ppa_by_team, self.havoc_by_team
+        )
+        self.changed_teams = changed_teams(previous, self.teams)
+
+    def _record_history(self) -> None:
+        if self.sources != set(data_sources):
+            return
+        if self.srs_source == "solver" and self.team_metrics_source == "plays":
+            # Both tables are built from data before self.week only
+            week = self.week if self.week is not None else self.current_week
+        elif self.week is None or self.week == self.current_week:
+            week = self.current_week
+        else:
+            return
+        if week is not None:
+            self.history.record(
+                self.season,
+                week,
+                self.teams,
+                source=load_source(self.srs_source, self.team_metrics_source),
+            )
 
-    def _load_srs(self) -> dict[str, float]:
-        print("Loading srs..")
-        team_ratings: dict[str, float] = {}
-        # SRS endpoint uses abbreviations - will NOT work with the globally defined list
-        srs_conferences: list = [
-            "AAC",
-            "acc",
-            "B12",
-            "B1G",
-            "CUSA",
-            "Ind",
-            "MAC",
-            "MWC",
-            "PAC",
-            "SEC",
-            "SBC",
+    def save_snapshot(self, path: str) -> None:
+        """
+        Write the loaded games and team tables to a binary snapshot file.
+
+        :param path: destination file
+        """
+        games_by_week = self.games_by_week
+        if not games_by_week and self.games:
+            games_by_week = {self.week or 0: self.games}
+        write_snapshot(path, self.season, self.week, self.teams, games_by_week)
+
+    @classmethod
+    def from_snapshot(
+        cls, path: str, api_fetcher: APIDataFetcher | None = None
+    ) -> "DataLoader":
+        """
+        Build an already-loaded DataLoader from a snapshot file. The team registry is
+        backed by a read-only memory mapping of the file; no API calls are made.
+
+        :param path: snapshot file written by save_snapshot
+        :param api_fetcher: optional fetcher for any later loads
+        :return: DataLoader holding the snapshot's games and team tables
+        """
+        snapshot = read_snapshot(path)
+        loader = cls(api_fetcher, snapshot.week, season=snapshot.season)
+
+        loader.teams = snapshot.registry()
+        loader.srs_by_team, loader.ppa_by_team, loader.havoc_by_team = (
+            loader.teams.to_tables()
+        )
+        loader.games_by_week = snapshot.games_by_week()
+        loader.games = [
+            game for games in loader.games_by_week.values() for game in games
+        ]
+        return loader
+
+    def print_timings(self) -> None:
+        """
+        Print the wall time of every call made by the last load(), slowest first.
+        """
+        for name, seconds in sorted(
+            self.timings.items(), key=lambda item: item[1], reverse=True
+        ):
+            print(f"{name}: {seconds:.3f}s")
+
+    def _plan_calls(self) -> list[tuple[str, Callable[[], Any]]]:
+        """
+        Build every request needed for a load as (name, zero-argument callable) pairs.
+        """
+        api = self.api_fetcher
+        calls: list[tuple[str, Callable[[], Any]]] = [
+            (
+                "games",
+                lambda: api.games_api.get_games(
+                    year=self.season,
+                    week=self.week,
+                    classification=FBS,
+                ),
+            )
         ]
 
-        for conference in srs_conferences:
-            try:
-                rows = self.api_fetcher.ratings_api.get_srs(
-                    year=year, conference=conference
+        if "srs" in self.sources and self.srs_source == "solver":
+            # Every division: FCS opponents anchor the FBS ratings.
+            calls.append(
+                ("results", lambda: api.games_api.get_games(year=self.season))
+            )
+        elif "srs" in self.sources:
+            srs_calls = [
+                (
+                    f"srs:{conference}",
+                    lambda c=conference: api.ratings_api.get_srs(
+                        year=self.season, conference=c
+                    ),
+                )
+                for conference in srs_conferences
+            ]
+            if self.bulk_requests:
+                bulk = partial(api.ratings_api.get_srs, year=self.season)
+                calls.append(("srs:all", bulk_call("srs", bulk, srs_calls)))
+            else:
+                calls.extend(srs_calls)
+
+        if self.team_metrics_source == "plays":
+            # Plays are streamed during the merge instead, see _aggregate_plays.
+            return calls
+
+        if "ppa" in self.sources:
+            ppa_calls = [
+                (
+                    f"ppa:{conference}",
+                    lambda c=conference: (
+                        api.metrics_api.get_predicted_points_added_by_team(
+                            year=self.season,
+                            conference=c,
+                            exclude_garbage_time=True,
+                        )
+                    ),
+                )
+                for conference in conferences
+            ]
+            if self.bulk_requests:
+                bulk = partial(
+                    api.metrics_api.get_predicted_points_added_by_team,
+                    year=self.season,
+                    exclude_garbage_time=True,
                 )
+                calls.append(("ppa:all", bulk_call("ppa", bulk, ppa_calls)))
+            else:
+                calls.extend(ppa_calls)
+
+        if "havoc" in self.sources:
+            calls.append(
+                (
+                    "havoc",
+                    lambda: api.stats_api.get_advanced_season_stats(
+                        year=self.season, exclude_garbage_time=True
+                    ),
+                )
+            )
 
-                for entry in rows:
-                    team_ratings[entry.team] = entry.rating
+        return calls
 
-            except Exception as e:
-                print(f"Error getting SRS data for: {conference}. Exception: {e}")
+    @staticmethod
+    def _merge_games(result: CallResult) -> dict[int, list[tuple[str, str]]]:
+        games_by_week: dict[int, list[tuple[str, str]]] = {}
 
-        return team_ratings
+        if result["error"] is not None:
+            print(f"Error fetching games: {result['error']}")
+            return games_by_week
 
-    def _load_ppa(self) -> dict[str, dict[str, float]]:
-        print("Loading ppa...")
-        team_ppa: dict[str, dict[str, float]] = {}
+        for game in result["rows"]:
+            games_by_week.setdefault(game.week, []).append(
+                (game.away_team, game.home_team)
+            )
 
-        for conference in conferences:
-            try:
-                rows: list[TeamSeasonPredictedPointsAdded] = (
-                    self.api_fetcher.metrics_api.get_predicted_points_added_by_team(
-                        year=year, conference=conference, exclude_garbage_time=True
-                    )
+        return dict(sorted(games_by_week.items()))
+
+    def _results(
+        self, by_name: dict[str, CallResult], prefix: str, parts: list[str]
+    ) -> list[CallResult]:
+        if self.bulk_requests:
+            return [by_name[f"{prefix}:all"]]
+        return [by_name[f"{prefix}:{part}"] for part in parts]
+
+    def _solve_srs(self, result: CallResult) -> dict[str, float]:
+        if result["error"] is not None:
+            print(f"Error fetching game results for SRS: {result['error']}")
+            return {}
+
+        self.results = _to_results(result["rows"])
+        through_week = self.week - 1 if self.week is not None else None
+        return self.srs_solver.solve(self.results, through_week=through_week)
+
+    def _aggregate_plays(self) -> None:
+        # Sequential on purpose: only one week of plays is in memory at a time.
+        if self.week is not None:
+            weeks = list(range(1, self.week))
+        else:
+            weeks = sorted(self.games_by_week)
+
+        aggregator = aggregate_plays(
+            api_plays(self.api_fetcher, weeks, self.season),
+            exclude_garbage_time=plays_exclude_garbage_time,
+        )
+        self.ppa_by_team = aggregator.ppa_by_team(plays_opponent_adjust)
+        self.havoc_by_team = aggregator.havoc_by_team()
+
+    @staticmethod
+    def _merge_srs(results: list[CallResult]) -> dict[str, float]:
+        team_ratings: dict[str, float] = {}
+
+        for result in results:
+            if result["error"] is not None:
+                conference = result["name"].split(":", 1)[1]
+                print(
+                    f"Error getting SRS data for: {conference}. "
+                    f"Exception: {result['error']}"
                 )
+                continue
 
-                for entry in rows:
-                    team: str = entry.team
+            for entry in result["rows"]:
+                team_ratings[entry.team] = entry.rating
 
-                    if team not in team_ppa:
-                        team_ppa[team] = {}
+        return team_ratings
 
-                    if entry.offense:
-                        team_ppa[team]["offense"] = entry.offense.overall
-                    else:
-                        print(f"Offense PPA value not found for {team}")
-                    if entry.defense:
-                        team_ppa[team]["defense"] = entry.defense.overall
-                    else:
-                        print(f"Defense PPA value not found for {team}")
+    @staticmethod
+    def _merge_ppa(results: list[CallResult]) -> dict[str, dict[str, float]]:
+        team_ppa: dict[str, dict[str, float]] = {}
+
+        for result in results:
+            if result["error"] is not None:
+                conference = result["name"].split(":", 1)[1]
+                print(f"Error fetching data for {conference}: {result['error']}")
+                continue
+
+            rows: list[TeamSeasonPredictedPointsAdded] = result["rows"]
+            for entry in rows:
+                team: str = entry.team
 
-            except Exception as e:
-                print(f"Error fetching data for {conference}: {e}")
+                if team not in team_ppa:
+                    team_ppa[team] = {}
+
+                if entry.offense:
+                    team_ppa[team]["offense"] = entry.offense.overall
+                else:
+                    print(f"Offense PPA value not found for {team}")
+                if entry.defense:
+                    team_ppa[team]["defense"] = entry.defense.overall
+                else:
+                    print(f"Defense PPA value not found for {team}")
 
         return team_ppa
 
-    def _load_havoc(self) -> dict[str, TeamHavocStats]:
-        print("Loading havoc..")
+    @staticmethod
+    def _merge_havoc(result: CallResult) -> dict[str, TeamHavocStats]:
         team_havoc: dict[str, TeamHavocStats] = {}
 
-        try:
-            rows = self.api_fetcher.stats_api.get_advanced_season_stats(
-                year=year,
-                exclude_garbage_time=True,
-            )
-
-            for entry in rows:
-                if entry.conference not in conferences:
-                    continue
+        if result["error"] is not None:
+            print(f"Error fetching data for havoc: {result['error']}")
+            return team_havoc
 
-                team = entry.team
+        for entry in result["rows"]:
+            if entry.conference not in conferences:
+                continue
 
-                team_havoc[team] = {"offense": None, "defense": None}
+            team = entry.team
 
-                if entry.offense and entry.offense.havoc:
-                    team_havoc[team]["offense"] = entry.offense.havoc.total
-                if entry.defense and entry.defense.havoc:
-                    team_havoc[team]["defense"] = entry.defense.havoc.total
+            team_havoc[team] = {"offense": None, "defense": None}
 
-        except Exception as e:
-            print(f"Error fetching data for havoc: {e}")
+            if entry.offense and entry.offense.havoc:
+                team_havoc[team]["offense"] = entry.offense.havoc.total
+            if entry.defense and entry.defense.havoc:
+                team_havoc[team]["defense"] = entry.defense.havoc.total
 
         return team_havoc
@@ -0,0 +1,413 @@
+"""
+Synthetic season data and a fake CFBD backend for benchmarks and offline testing.
+
+generate_season builds a season of games, SRS ratings, PPA and havoc from hidden team
+strengths with configurable size and missing-data rates, and play-by-play for any
+completed game on demand; finish_games plays out pending games as on a game day.
+FakeAPIDataFetcher serves any number of those seasons through the same ratings_api /
+games_api / metrics_api / stats_api / plays_api / betting_api methods the pipeline
+calls, with optional per-call latency, and needs no API key.
+
+Rows are lightweight records with the same attribute shape as the cfbd models the
+real endpoints return (entry.team, entry.offense.havoc.total, ...), plus to_dict.
+"""
+
+import random
+import threading
+import time
+
+from types import SimpleNamespace
+from typing import Any
+
+from src.statforge.data_loader import conferences
+from src.statforge.request_planner import conference_codes
+
+
+class FakeRow(SimpleNamespace):
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            key: value.to_dict() if isinstance(value, FakeRow) else value
+            for key, value in vars(self).items()
+        }
+
+
+class SyntheticSeason:
+    """
+    One generated season.
+
+    Attributes:
+        season: season year
+        teams: team names
+        conference_of: dict mapping each team to its conference
+        strength: hidden true rating of each team used to draw game margins
+        games / srs / ppa / advanced / lines: rows served by the matching fake
+            endpoints
+    """
+
+    def __init__(self, season: int) -> None:
+        self.season = season
+        self.teams: list[str] = []
+        self.conference_of: dict[str, str] = {}
+        self.strength: dict[str, float] = {}
+        self.games: list[FakeRow] = []
+        self.srs: list[FakeRow] = []
+        self.ppa: list[FakeRow] = []
+        self.advanced: list[FakeRow] = []
+        self.lines: list[FakeRow] = []
+
+
+def generate_season(
+    season: int = 2024,
+    teams: int = 130,
+    weeks: int = 15,
+    games_per_week: int | None = None,
+    missing_rate: float = 0.0,
+    completed_weeks: int | None = None,
+    seed: int = 0,
+) -> SyntheticSeason:
+    """
+    Generate a synthetic season.
+
+    :param season: season year
+    :param teams: number of teams, spread evenly over the FBS conferences
+    :param weeks: number of regular-season weeks
+    :param games_per_week: games scheduled each week, at most teams // 2
+    :param missing_rate: probability that any one team is missing from each of the SRS,
+        PPA and havoc tables, or has one side of a metric missing
+    :param completed_weeks: weeks that already have final scores (default: all)
+    :param seed: random seed
+    :return: SyntheticSeason
+    """
+    rng = random.Random(seed)
+    # Separate stream so drawing the lines leaves the games and tables unchanged.
+    line_rng = random.Random(f"{seed}:lines")
+    games_per_week = min(teams // 2, games_per_week or teams // 2)
+    completed_weeks = weeks if completed_weeks is None else completed_weeks
+    out = SyntheticSeason(season)
+
+    def missing() -> bool:
+        return rng.random() < missing_rate
+
+    for i in range(teams):
+        team = f"Team {i:04d}"
+        out.teams.append(team)
+        out.conference_of[team] = conferences[i % len(conferences)]
+        out.strength[team] = rng.gauss(0, 12)
+
+    game_id = season * 100_000
+    for week in range(1, weeks + 1):
+        shuffled = out.teams[:]
+        rng.shuffle(shuffled)
+        for j in range(games_per_week):
+            away, home = shuffled[2 * j], shuffled[2 * j + 1]
+            neutral = rng.random() < 0.03
+            completed = week <= completed_weeks
+            expected = (
+                out.strength[home] - out.strength[away] + (0 if neutral else 2.5)
+            )
+            margin = expected + rng.gauss(0, 14)
+            home_points = max(0, round(24 + margin / 2)) if completed else None
+            away_points = max(0, round(24 - margin / 2)) if completed else None
+            game_id += 1
+            # Market spread: the home side's handicap, negative when home is favoured.
+            spread = -round((expected + line_rng.gauss(0, 3)) * 2) / 2
+            out.lines.append(
+                FakeRow(
+                    id=game_id,
+                    season=season,
+                    week=week,
+                    home_team=home,
+                    away_team=away,
+                    home_score=home_points,
+                    away_score=away_points,
+                    lines=[FakeRow(provider="consensus", spread=spread)],
+                )
+            )
+            out.games.append(
+                FakeRow(
+                    id=game_id,
+                    season=season,
+                    week=week,
+                    completed=completed,
+                    neutral_site=neutral,
+                    conference_game=out.conference_of[away] == out.conference_of[home],
+                    away_team=away,
+                    home_team=home,
+                    away_conference=out.conference_of[away],
+                    home_conference=out.conference_of[home],
+                    away_points=away_points,
+                    home_points=home_points,
+                )
+            )
+
+    for team in out.teams:
+        conference = out.conference_of[team]
+        strength = out.strength[team]
+
+        if not missing():
+            out.srs.append(
+                FakeRow(
+                    year=season,
+                    team=team,
+                    conference=conference,
+                    rating=round(strength + rng.gauss(0, 2), 2),
+                )
+            )
+
+        if not missing():
+            offense = FakeRow(overall=_noisy(rng, 0.1 + strength / 60))
+            defense = FakeRow(overall=_noisy(rng, 0.1 - strength / 60))
+            out.ppa.append(
+                FakeRow(
+                    season=season,
+                    conference=conference,
+                    team=team,
+                    offense=None if missing() else offense,
+                    defense=None if missing() else defense,
+                )
+            )
+
+        if not missing():
+            offense_havoc = FakeRow(total=round(rng.uniform(0.1, 0.2), 4))
+            defense_havoc = FakeRow(total=round(rng.uniform(0.1, 0.2), 4))
+            out.advanced.append(
+                FakeRow(
+                    season=season,
+                    team=team,
+                    conference=conference,
+                    offense=FakeRow(havoc=None if missing() else offense_havoc),
+                    defense=FakeRow(havoc=None if missing() else defense_havoc),
+                )
+            )
+
+    return out
+
+
+def finish_games(
+    season: SyntheticSeason, week: int, count: int, seed: int = 0
+) -> list[FakeRow]:
+    """
+    Complete up to count of a week's pending games, as on a game day: draw final
+    scores and nudge the SRS, PPA and havoc of the teams that played. Rows are replaced
+    rather than mutated, like a fresh API response.
+
+    :param season: SyntheticSeason to update
+    :param week: week whose games finish
+    :param count: number of pending games to complete
+    :param seed: random seed
+    :return: the completed games
+    """
+    rng = random.Random(f"{seed}:{week}:{len(season.games)}:{count}")
+    finished: list[FakeRow] = []
+    played: set[str] = set()
+    for i, game in enumerate(season.games):
+        if len(finished) == count:
+            break
+        if game.week != week or game.completed:
+            continue
+        home_field = 0 if game.neutral_site else 2.5
+        margin = (
+            season.strength[game.home_team]
+            - season.strength[game.away_team]
+            + home_field
+            + rng.gauss(0, 14)
+        )
+        season.games[i] = FakeRow(
+            **{
+                **vars(game),
+                "completed": True,
+                "home_points": max(0, round(24 + margin / 2)),
+                "away_points": max(0, round(24 - margin / 2)),
+            }
+        )
+        finished.append(season.games[i])
+        played.update((game.away_team, game.home_team))
+
+    def nudged(row: FakeRow, path: tuple[str, ...], scale: float) -> FakeRow:
+        # Copy along the path so rows already handed out stay unchanged
+        values = vars(row).copy()
+        head, *rest = path
+        if values.get(head) is None:
+            return row
+        if rest:
+            values[head] = nudged(values[head], tuple(rest), scale)
+        else:
+            values[head] = round(values[head] + rng.gauss(0, scale), 4)
+        return FakeRow(**values)
+
+    for table, path, scale in (
+        (season.srs, ("rating",), 0.5),
+        (season.ppa, ("offense", "overall"), 0.01),
+        (season.ppa, ("defense", "overall"), 0.01),
+        (season.advanced, ("offense", "havoc", "total"), 0.002),
+        (season.advanced, ("defense", "havoc", "total"), 0.002),
+    ):
+        for i, row in enumerate(table):
+            if row.team in played:
+                table[i] = nudged(row, path, scale)
+    return finished
+
+
+def _noisy(rng: random.Random, mean: float) -> float:
+    return round(mean + rng.gauss(0, 0.05), 4)
+
+
+# Play types drawn for synthetic play-by-play, with weights.
+_play_types: tuple[tuple[str, int], ...] = (
+    ("Rush", 40),
+    ("Pass Reception", 30),
+    ("Pass Incompletion", 15),
+    ("Sack", 3),
+    ("Interception", 1),
+    ("Fumble Recovery (Opponent)", 1),
+    ("Punt", 6),
+    ("Kickoff", 4),
+)
+
+
+def generate_plays(
+    season: SyntheticSeason, game: FakeRow, plays: int = 140
+) -> list[FakeRow]:
+    """
+    Play-by-play for one completed game, generated on demand so a season of plays is
+    never held in memory. The same game always yields the same plays.
+
+    :param season: season the game belongs to
+    :param game: game row from season.games
+    :param plays: number of plays, split evenly between the two offenses
+    :return: rows shaped like cfbd Play models
+    """
+    rng = random.Random(game.id)
+    names = [name for name, _ in _play_types]
+    weights = [weight for _, weight in _play_types]
+    sides = (
+        (game.away_team, game.home_team, game.away_points, game.home_points),
+        (game.home_team, game.away_team, game.home_points, game.away_points),
+    )
+
+    out = []
+    for number in range(plays):
+        offense, defense, offense_points, defense_points = sides[number % 2]
+        progress = number / plays
+        play_type = rng.choices(names, weights)[0]
+        edge = (season.strength[offense] - season.strength[defense]) / 60
+        yards = round(rng.gauss(5 + 20 * edge, 7))
+        out.append(
+            FakeRow(
+                id=game.id * 1000 + number,
+                game_id=game.id,
+                offense=offense,
+                defense=defense,
+                period=min(4, 1 + int(progress * 4)),
+                offense_score=round((offense_points or 0) * progress),
+                defense_score=round((defense_points or 0) * progress),
+                play_type=play_type,
+                yards_gained=-abs(yards) if play_type == "Sack" else yards,
+                ppa=round(rng.gauss(0.1 + edge, 0.8), 4),
+            )
+        )
+    return out
+
+
+class _FakeEndpoints:
+    def __init__(self, fetcher: "FakeAPIDataFetcher") -> None:
+        self._fetcher = fetcher
+
+    def _season(self, endpoint: str, year: int | None) -> SyntheticSeason:
+        self._fetcher._record(endpoint)
+        return self._fetcher.seasons[year]
+
+    def get_games(
+        self,
+        year: int | None = None,
+        week: int | None = None,
+        team: str | None = None,
+        **kwargs,
+    ) -> list[FakeRow]:
+        season = self._season("get_games", year)
+        return [
+            game
+            for game in season.games
+            if (week is None or game.week == week)
+            and (team is None or team in (game.away_team, game.home_team))
+        ]
+
+    def get_plays(
+        self, year: int | None = None, week: int | None = None, **kwargs
+    ) -> list[FakeRow]:
+        season = self._season("get_plays", year)
+        return [
+            play
+            for game in season.games
+            if game.week == week and game.completed
+            for play in generate_plays(season, game)
+        ]
+
+    def get_lines(
+        self, year: int | None = None, week: int | None = None, **kwargs
+    ) -> list[FakeRow]:
+        season = self._season("get_lines", year)
+        return [row for row in season.lines if week is None or row.week == week]
+
+    def get_srs(
+        self, year: int | None = None, team: str | None = None, conference=None
+    ) -> list[FakeRow]:
+        season = self._season("get_srs", year)
+        return [
+            row
+            for row in season.srs
+            if (conference is None or conference_codes[row.conference] == conference)
+            and (team is None or row.team == team)
+        ]
+
+    def get_predicted_points_added_by_team(
+        self,
+        year: int | None = None,
+        team: str | None = None,
+        conference: str | None = None,
+        exclude_garbage_time: bool | None = None,
+    ) -> list[FakeRow]:
+        season = self._season("get_predicted_points_added_by_team", year)
+        return [
+            row
+            for row in season.ppa
+            if (conference is None or row.conference == conference)
+            and (team is None or row.team == team)
+        ]
+
+    def get_advanced_season_stats(
+        self, year: int | None = None, team: str | None = None, **kwargs
+    ) -> list[FakeRow]:
+        season = self._season("get_advanced_season_stats", year)
+        return [row for row in season.advanced if team is None or row.team == team]
+
+
+class FakeAPIDataFetcher:
+    """
+    Stand-in for APIDataFetcher serving SyntheticSeason data.
+
+    Attributes:
+        seasons: dict mapping season year to its SyntheticSeason
+        latency: seconds each call sleeps before answering, to mimic round trips
+        calls: dict counting calls per endpoint
+    """
+
+    def __init__(
+        self, seasons: SyntheticSeason | list[SyntheticSeason], latency: float = 0.0
+    ) -> None:
+        if isinstance(seasons, SyntheticSeason):
+            seasons = [seasons]
+        self.seasons: dict[int, SyntheticSeason] = {s.season: s for s in seasons}
+        self.latency = latency
+        self.calls: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        api = _FakeEndpoints(self)
+        self.ratings_api = self.games_api = self.metrics_api = self.stats_api = api
+        self.plays_api = self.betting_api = api
+
+    def _record(self, endpoint: str) -> None:
+        with self._lock:
+            self.calls[endpoint] = self.calls.get(endpoint, 0) + 1
+        if self.latency:
+            time.sleep(self.latency)
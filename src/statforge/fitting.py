@@ -0,0 +1,348 @@
+"""
+Fit the factor weights and home-field advantage against actual margins.
+
+The adjusted line is
+
+    srs_diff + home_field * home + w_ppa * ppa + w_top * top + w_bottom * bottom
+
+with srs_diff = home SRS - away SRS and home = 0 at neutral sites. SRS is already in
+points of margin, so it keeps weight 1 and the fit solves for the rest: a ridge
+regression of margin - srs_diff on the other columns, shrunk towards the unfitted
+defaults (home_field_advantage and weight 1), so a large penalty falls back to the
+current lines rather than to zero.
+
+MatchupEngine.compute leaves the home field out of games flagged neutral, as the fit
+does, wherever the caller knows the site (simulation, backtest). The (away, home)
+schedule tuples main, batch, service and live compute lines for carry no site, so
+there every game is scored as a home game.
+
+Every scored game becomes one row of a FeatureMatrix, built from the same as-of-week
+metrics the backtest uses and cached on disk per selection of seasons. A refit, with
+other penalties or after a code change to the fit, loads the matrix instead of loading
+or recomputing any season. The penalty is picked by cross-validation with whole seasons
+(or whole weeks, for a single season) as folds; each fold only needs the 4x4 Gram
+matrix of its rows, so every penalty is evaluated without touching the rows again.
+
+The fitted weights are saved to factor_weights_path, where combine.py picks them up.
+
+Usage:
+    python -m src.statforge.fitting 2014-2023
+    python -m src.statforge.fitting 2014-2023 refresh
+"""
+
+import hashlib
+import os
+import sys
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, NamedTuple
+
+import numpy as np
+
+from src.statforge.backtest import default_fetcher, season_weeks
+from src.statforge.batch import parse_weeks
+from src.statforge.combine import FactorWeights, save_factor_weights
+from src.statforge.config import (
+    backtest_processes,
+    factor_weights_path,
+    fitting_alphas,
+    fitting_cache_dir,
+    fitting_folds,
+)
+from src.statforge.data_loader import APIDataFetcher
+from src.statforge.instrumentation import get_recorder
+from src.statforge.metrics.engine import MatchupEngine
+
+# FeatureMatrix columns, in FactorWeights order.
+feature_names: tuple[str, ...] = FactorWeights._fields
+
+# FeatureMatrix arrays saved to and loaded from disk.
+_arrays: tuple[str, ...] = ("features", "srs_diff", "margin", "season", "week")
+
+
+class FeatureMatrix:
+    """
+    Game-by-factor design matrix, one row per completed game with an SRS line.
+
+    Attributes:
+        features: (games, len(feature_names)) array; the home_field column is 1 for a
+            home game and 0 at a neutral site, factor columns are 0 where missing
+        srs_diff: home SRS minus away SRS
+        margin: actual home margin
+        season / week: where each row came from, used to form cross-validation folds
+    """
+
+    __slots__ = _arrays
+
+    def __init__(
+        self,
+        features: np.ndarray,
+        srs_diff: np.ndarray,
+        margin: np.ndarray,
+        season: np.ndarray,
+        week: np.ndarray,
+    ) -> None:
+        self.features = features
+        self.srs_diff = srs_diff
+        self.margin = margin
+        self.season = season
+        self.week = week
+
+    def __len__(self) -> int:
+        return len(self.margin)
+
+    @classmethod
+    def concatenate(cls, parts: list["FeatureMatrix"]) -> "FeatureMatrix":
+        if not parts:
+            empty = np.empty(0)
+            return cls(np.empty((0, len(feature_names))), empty, empty, empty, empty)
+        return cls(
+            *(np.concatenate([getattr(p, name) for p in parts]) for name in _arrays)
+        )
+
+    def save(self, path: str) -> None:
+        temporary = f"{path}.tmp.npz"
+        np.savez(temporary, **{name: getattr(self, name) for name in _arrays})
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path: str) -> "FeatureMatrix":
+        with np.load(path) as saved:
+            return cls(*(saved[name] for name in _arrays))
+
+
+def season_features(
+    api_fetcher: APIDataFetcher,
+    season: int,
+    weeks: list[int] | None = None,
+    as_of: bool = True,
+) -> FeatureMatrix:
+    """
+    Feature rows for one season's completed games.
+
+    :param api_fetcher: fetcher to load the season with
+    :param season: season year
+    :param weeks: weeks to include, defaults to backtest_first_week onwards
+    :param as_of: see backtest.season_weeks
+    :return: FeatureMatrix for the season
+    """
+    parts = []
+    for week, results, registry in season_weeks(api_fetcher, season, weeks, as_of):
+        games = [(game.away_team, game.home_team) for game in results]
+        # Without a home field the engine's SRS line is the plain rating difference
+        factors = MatchupEngine(registry, home_field=0.0).compute(games)
+        rows = np.flatnonzero(factors.srs_valid)
+
+        home = np.array([not game.neutral_site for game in results], dtype=float)
+        columns = [home]
+        for column, mask in (
+            ("ppa_factor", "ppa_valid"),
+            ("havoc_top", "havoc_top_valid"),
+            ("havoc_bottom", "havoc_bottom_valid"),
+        ):
+            columns.append(
+                np.where(getattr(factors, mask), getattr(factors, column), 0.0)
+            )
+        margin = np.array(
+            [game.home_points - game.away_points for game in results], dtype=float
+        )
+
+        parts.append(
+            FeatureMatrix(
+                np.column_stack(columns)[rows],
+                factors.srs_line[rows],
+                margin[rows],
+                np.full(len(rows), season),
+                np.full(len(rows), week),
+            )
+        )
+    return FeatureMatrix.concatenate(parts)
+
+
+def _season_features(
+    fetcher_factory: Callable[[], Any], season: int, as_of: bool
+) -> FeatureMatrix:
+    return season_features(fetcher_factory(), season, as_of=as_of)
+
+
+def feature_cache_path(
+    seasons: list[int], as_of: bool = True, cache_dir: str = fitting_cache_dir
+) -> str:
+    """
+    Where the FeatureMatrix for a selection of seasons is cached.
+    """
+    key = f"{sorted(seasons)}:{as_of}"
+    digest = hashlib.sha1(key.encode()).hexdigest()[:12]
+    mode = "asof" if as_of else "season"
+    return os.path.join(
+        cache_dir, f"features-{min(seasons)}-{max(seasons)}-{mode}-{digest}.npz"
+    )
+
+
+def load_feature_matrix(
+    seasons: list[int],
+    as_of: bool = True,
+    refresh: bool = False,
+    fetcher_factory: Callable[[], Any] = default_fetcher,
+    processes: int | None = backtest_processes,
+    cache_dir: str | None = fitting_cache_dir,
+) -> FeatureMatrix:
+    """
+    The FeatureMatrix for the given seasons, from the on-disk cache when possible.
+
+    :param seasons: season years
+    :param as_of: see backtest.season_weeks
+    :param refresh: rebuild even if a cached matrix exists, e.g. once the current
+        season has new results
+    :param fetcher_factory: picklable zero-argument callable building a fetcher in
+        each worker, see backtest.run_backtest
+    :param processes: worker processes, None for one per CPU and 1 to stay in-process
+    :param cache_dir: cache directory, None to build without caching
+    :return: FeatureMatrix, seasons in the order given
+    """
+    if not seasons:
+        raise ValueError("No seasons to build features for")
+
+    path = None
+    if cache_dir is not None:
+        path = feature_cache_path(seasons, as_of, cache_dir)
+        if not refresh and os.path.exists(path):
+            get_recorder().count("fitting.feature_cache_hit")
+            return FeatureMatrix.load(path)
+
+    with get_recorder().stage("fitting.features"):
+        if processes == 1 or len(seasons) <= 1:
+            parts = [
+                _season_features(fetcher_factory, season, as_of) for season in seasons
+            ]
+        else:
+            with ProcessPoolExecutor(max_workers=processes) as pool:
+                futures = [
+                    pool.submit(_season_features, fetcher_factory, season, as_of)
+                    for season in seasons
+                ]
+                parts = [future.result() for future in futures]
+        matrix = FeatureMatrix.concatenate(parts)
+
+    if path is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        matrix.save(path)
+    return matrix
+
+
+class FitResult(NamedTuple):
+    weights: FactorWeights
+    alpha: float
+    cv_rmse: dict[float, float]
+    cv_mae: dict[float, float]
+    baseline_rmse: float
+    games: int
+
+
+def _ridge(
+    gram: np.ndarray, moment: np.ndarray, games: int, alpha: float, prior: np.ndarray
+) -> np.ndarray:
+    # minimizes |X w - r|^2 + alpha * games * |w - prior|^2
+    penalty = alpha * games
+    lhs = gram + penalty * np.eye(len(prior))
+    return np.linalg.lstsq(lhs, moment + penalty * prior, rcond=None)[0]
+
+
+def fit_weights(
+    matrix: FeatureMatrix,
+    alphas: tuple[float, ...] = fitting_alphas,
+    folds: int = fitting_folds,
+    prior: FactorWeights | None = None,
+) -> FitResult:
+    """
+    Fit the home field and factor weights by ridge regression, choosing the penalty by
+    cross-validated RMSE.
+
+    :param matrix: FeatureMatrix from load_feature_matrix
+    :param alphas: penalties to try, per game; 0 is plain least squares
+    :param folds: number of cross-validation folds
+    :param prior: weights the penalty shrinks towards, defaults to the unfitted ones
+    :return: FitResult with the weights refitted on every row at the chosen penalty
+    """
+    if not alphas:
+        raise ValueError("No penalties to try")
+
+    w0 = np.array(prior or FactorWeights(), dtype=float)
+    x = matrix.features
+    r = matrix.margin - matrix.srs_diff
+
+    # Whole seasons as folds when there are several, otherwise whole weeks, so a fold
+    # is never predicted from games played alongside it.
+    groups = matrix.season if len(np.unique(matrix.season)) > 1 else matrix.week
+    _, group_ids = np.unique(groups, return_inverse=True)
+    folds = min(folds, int(group_ids.max(initial=-1)) + 1)
+    if folds < 2:
+        raise ValueError("Cross-validation needs at least two seasons or weeks")
+    fold_ids = group_ids % folds
+
+    grams = np.zeros((folds, len(w0), len(w0)))
+    moments = np.zeros((folds, len(w0)))
+    np.add.at(grams, fold_ids, x[:, :, None] * x[:, None, :])
+    np.add.at(moments, fold_ids, x * r[:, None])
+    counts = np.bincount(fold_ids, minlength=folds)
+    gram, moment = grams.sum(axis=0), moments.sum(axis=0)
+
+    cv_rmse: dict[float, float] = {}
+    cv_mae: dict[float, float] = {}
+    with get_recorder().stage("fitting.cross_validate"):
+        for alpha in alphas:
+            squared = absolute = 0.0
+            for fold in range(folds):
+                w = _ridge(
+                    gram - grams[fold],
+                    moment - moments[fold],
+                    len(r) - counts[fold],
+                    alpha,
+                    w0,
+                )
+                rows = fold_ids == fold
+                error = x[rows] @ w - r[rows]
+                squared += float(error @ error)
+                absolute += float(np.abs(error).sum())
+            cv_rmse[alpha] = (squared / len(r)) ** 0.5
+            cv_mae[alpha] = absolute / len(r)
+
+    alpha = min(alphas, key=cv_rmse.__getitem__)
+    weights = _ridge(gram, moment, len(r), alpha, w0)
+    baseline = x @ w0 - r
+    return FitResult(
+        FactorWeights(*(float(w) for w in weights)),
+        alpha,
+        cv_rmse,
+        cv_mae,
+        float(np.sqrt(np.mean(baseline**2))),
+        len(r),
+    )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (2, 3) or sys.argv[2:] not in ([], ["refresh"]):
+        sys.exit("Usage: python -m src.statforge.fitting <seasons> [refresh]")
+
+    seasons = parse_weeks(sys.argv[1]) or []
+    features = load_feature_matrix(seasons, refresh=len(sys.argv) == 3)
+    fit = fit_weights(features)
+
+    print(f"{'alpha':>10}{'CV RMSE':>10}{'CV MAE':>10}")
+    for penalty, rmse in fit.cv_rmse.items():
+        print(f"{penalty:>10g}{rmse:>10.3f}{fit.cv_mae[penalty]:>10.3f}")
+    print(f"Unfitted RMSE over {fit.games} games: {fit.baseline_rmse:.3f}")
+    for name, value in fit.weights._asdict().items():
+        print(f"{name}: {value:.3f}")
+
+    if factor_weights_path is None:
+        sys.exit("factor_weights_path is not set, weights not saved")
+    save_factor_weights(
+        fit.weights,
+        factor_weights_path,
+        alpha=fit.alpha,
+        cv_rmse=fit.cv_rmse[fit.alpha],
+        games=fit.games,
+        seasons=seasons,
+    )
+    print(f"Saved weights to {factor_weights_path}")
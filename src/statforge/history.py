@@ -0,0 +1,606 @@
+"""
+Append-only history of every team's metrics per (season, week), kept on local disk.
+
+DataLoader throws its tables away after each run, so without a history any trend ("how
+did a team's havoc rate move through a season?") or backfilled as-of week means going
+back to the API. MetricHistory records the SRS, PPA and havoc columns of every team
+each time a full load completes, and every week of an as-of batch or a backfill, and
+answers range queries from disk:
+
+    history = MetricHistory()
+    history.query(teams=["Michigan"], seasons=2023, weeks=(3, 10))
+    history.query(seasons=(2015, 2024), weeks=7)
+    registry = history.registry(2023, 7)
+
+A row's week is the week whose games the metrics rate, i.e. data through the week
+before, the same convention as AsOfStore.registry(week - 1).
+
+Every recording is tagged with its source, the way its metrics were computed: AS_OF
+for point-in-time metrics from asof.py (as-of batches and backfill), load_source(...)
+for a DataLoader's tables, e.g. CFBD's season-to-date SRS and PPA. Sources are
+separate namespaces; a query reads one of them (AS_OF by default), so two definitions
+of a metric never mix in one registry.
+
+Layout of the store directory:
+- manifest.json: format version, the team dictionary (position is the team id every
+  segment uses), the segment index (file, sequence, source, season, first and last
+  week, rows), and for each (source, season, week) the sequence of the segment holding
+  its latest recording and a digest of that recording's rows
+- <season>/<sequence>.npz: one segment, uncompressed NumPy columns week, team,
+  ppa_present and every column of teams.metric_columns, sorted by week
+
+Segments are never modified. Recording a (source, season, week) again appends a new
+segment that replaces the earlier recording as a whole: queries only read a week's
+rows from its latest segment, so a team missing from the new recording is gone rather
+than left at its old values. An unchanged recording (same digest) is not written at
+all. compact() rewrites an older season's partition as a single segment holding only
+the latest recording of each week. The manifest is replaced atomically after the
+segment it references is written, so a crash leaves at worst an unreferenced file. A
+store has one writer at a time; any number of processes can read it.
+
+Usage:
+    python -m src.statforge.history backfill 2015-2024
+    python -m src.statforge.history team "Michigan" 2023 3-10
+    python -m src.statforge.history week 7 2015-2024
+    python -m src.statforge.history week 7 2024 --source load.api.api
+    python -m src.statforge.history compact
+"""
+
+import hashlib
+import json
+import math
+import os
+import sys
+import threading
+
+from typing import Any, Iterable
+
+import numpy as np
+
+from src.statforge.config import (
+    history_compact_segments,
+    history_enabled,
+    history_path,
+    year,
+)
+from src.statforge.instrumentation import get_recorder
+from src.statforge.teams import TeamRegistry, metric_columns
+
+HISTORY_VERSION: int = 1
+MANIFEST: str = "manifest.json"
+
+# Source of the point-in-time metrics built by asof.py.
+AS_OF: str = "as_of"
+
+# A season or week selection: one value, an inclusive (first, last) range, or None for
+# everything.
+Bounds = int | tuple[int, int] | None
+
+
+class HistoryError(ValueError):
+    """
+    Raised when a history directory was written by an unsupported version.
+    """
+
+
+def load_source(srs_source: str, team_metrics_source: str) -> str:
+    """
+    Source of the tables a DataLoader with these settings loads, e.g. "load.api.api"
+    for CFBD's season-to-date tables.
+    """
+    return f"load.{srs_source}.{team_metrics_source}"
+
+
+def _key(source: str, season: int, week: int) -> str:
+    return f"{source}:{season}:{week}"
+
+
+def _bounds(selection: Bounds) -> tuple[float, float]:
+    if selection is None:
+        return -math.inf, math.inf
+    if isinstance(selection, int):
+        return selection, selection
+    first, last = selection
+    return first, last
+
+
+class HistoryFrame:
+    """
+    Rows returned by MetricHistory.query, one per (season, week, team), sorted in that
+    order.
+
+    Attributes:
+        season / week: where each row belongs
+        team: team id of each row, an index into names
+        names: team dictionary of the store the rows came from
+        columns: dict mapping every name in metric_columns to its values
+        ppa_present: whether each row's team appeared in the PPA table
+    """
+
+    def __init__(
+        self,
+        season: np.ndarray,
+        week: np.ndarray,
+        team: np.ndarray,
+        names: list[str],
+        columns: dict[str, np.ndarray],
+        ppa_present: np.ndarray,
+    ) -> None:
+        self.season = season
+        self.week = week
+        self.team = team
+        self.names = names
+        self.columns = columns
+        self.ppa_present = ppa_present
+
+    def __len__(self) -> int:
+        return len(self.team)
+
+    def teams(self) -> list[str]:
+        """
+        Team name of every row.
+        """
+        return [self.names[team] for team in self.team]
+
+    def series(
+        self, team: str, column: str
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        One team's values of a column over time.
+
+        :param team: team name
+        :param column: one of metric_columns
+        :return: (season, week, value) arrays in time order
+        """
+        team_id = self.names.index(team) if team in self.names else -1
+        rows = np.flatnonzero(self.team == team_id)
+        return self.season[rows], self.week[rows], self.columns[column][rows]
+
+    def registry(self) -> TeamRegistry:
+        """
+        TeamRegistry over the rows; they must all belong to a single (season, week).
+        """
+        if len(np.unique(self.season)) > 1 or len(np.unique(self.week)) > 1:
+            raise ValueError("A registry needs the rows of a single season and week")
+        return TeamRegistry.from_columns(
+            self.teams(),
+            {name: self.columns[name].copy() for name in metric_columns},
+            self.ppa_present.copy(),
+        )
+
+
+class MetricHistory:
+    """
+    Columnar, append-only store of team metrics partitioned by season.
+
+    Attributes:
+        path: store directory
+        compact_segments: record() compacts a season before `year` once its partition
+            holds this many segments; None to only compact on request
+        names: team dictionary, position is the team id
+        ids: dict mapping team names to ids
+        segments: manifest entries of every live segment, in append order
+        recordings: dict mapping "source:season:week" to the sequence of the segment
+            holding that week's latest recording
+    """
+
+    def __init__(
+        self,
+        path: str = history_path,
+        compact_segments: int | None = history_compact_segments,
+    ) -> None:
+        self.path = path
+        self.compact_segments = compact_segments
+        self._lock = threading.Lock()
+        self._manifest_mtime: int | None = None
+        self._read_manifest()
+
+    @property
+    def _manifest_path(self) -> str:
+        return os.path.join(self.path, MANIFEST)
+
+    def _read_manifest(self) -> None:
+        try:
+            with open(self._manifest_path) as f:
+                manifest = json.load(f)
+            self._manifest_mtime = os.stat(self._manifest_path).st_mtime_ns
+        except FileNotFoundError:
+            manifest = {"version": HISTORY_VERSION}
+
+        if manifest["version"] != HISTORY_VERSION:
+            raise HistoryError(
+                f"{self.path} is history version {manifest['version']}, "
+                f"expected {HISTORY_VERSION}"
+            )
+        self.names: list[str] = manifest.get("teams", [])
+        self.ids = {name: i for i, name in enumerate(self.names)}
+        self.segments: list[dict[str, Any]] = manifest.get("segments", [])
+        self.recordings: dict[str, int] = manifest.get("recordings", {})
+        self._digests: dict[str, str] = manifest.get("digests", {})
+        self._next_segment: int = manifest.get("next_segment", 1)
+
+    def _write_manifest(self) -> None:
+        manifest = {
+            "version": HISTORY_VERSION,
+            "next_segment": self._next_segment,
+            "teams": self.names,
+            "segments": self.segments,
+            "recordings": self.recordings,
+            "digests": self._digests,
+        }
+        temporary = f"{self._manifest_path}.tmp"
+        with open(temporary, "w") as f:
+            json.dump(manifest, f, separators=(",", ":"))
+        os.replace(temporary, self._manifest_path)
+        self._manifest_mtime = os.stat(self._manifest_path).st_mtime_ns
+
+    def refresh(self) -> None:
+        """
+        Pick up segments written by another process since the manifest was last read.
+        """
+        try:
+            mtime = os.stat(self._manifest_path).st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime != self._manifest_mtime:
+            self._read_manifest()
+
+    def seasons(self, source: str | None = None) -> list[int]:
+        """
+        Seasons recorded from a source, or from any source when None.
+        """
+        return sorted(
+            {
+                segment["season"]
+                for segment in self.segments
+                if source is None or segment["source"] == source
+            }
+        )
+
+    def weeks(self, season: int, source: str = AS_OF) -> list[int]:
+        """
+        Weeks of a season recorded from a source.
+        """
+        prefix = _key(source, season, 0)[:-1]
+        return sorted(
+            int(key[len(prefix) :]) for key in self.recordings if key.startswith(prefix)
+        )
+
+    def _append_segment(
+        self,
+        source: str,
+        season: int,
+        week: np.ndarray,
+        team: np.ndarray,
+        columns: dict[str, np.ndarray],
+        ppa_present: np.ndarray,
+        compacted: bool = False,
+    ) -> int:
+        sequence = self._next_segment
+        name = os.path.join(str(season), f"{sequence:06d}.npz")
+        path = os.path.join(self.path, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary = f"{path}.tmp.npz"
+        np.savez(
+            temporary,
+            week=week.astype("<i2"),
+            team=team.astype("<i4"),
+            ppa_present=ppa_present.astype(bool),
+            **{column: columns[column].astype("<f8") for column in metric_columns},
+        )
+        os.replace(temporary, path)
+        self._next_segment += 1
+        self.segments.append(
+            {
+                "file": name,
+                "sequence": sequence,
+                "source": source,
+                "season": season,
+                "first_week": int(week.min()),
+                "last_week": int(week.max()),
+                "rows": len(team),
+                "compacted": compacted,
+            }
+        )
+        return sequence
+
+    def record(
+        self, season: int, week: int, registry: TeamRegistry, source: str = AS_OF
+    ) -> bool:
+        """
+        Append every team's metrics as of a week, replacing any earlier recording of
+        the week from the same source.
+
+        :param season: season year
+        :param week: week whose games the metrics rate (data through the week before)
+        :param registry: TeamRegistry with every team's metrics
+        :param source: how the metrics were computed, AS_OF or a load_source(...)
+        :return: False if nothing was written because the registry is empty or
+            identical to what was last recorded for the week
+        """
+        if not len(registry):
+            return False
+
+        recorder = get_recorder()
+        with self._lock, recorder.stage("history.record"):
+            self.refresh()
+            for name in registry.names:
+                if name not in self.ids:
+                    self.ids[name] = len(self.names)
+                    self.names.append(name)
+            team = np.array([self.ids[name] for name in registry.names], dtype="<i4")
+            columns = {name: registry.column(name) for name in metric_columns}
+            ppa_present = registry.ppa_present
+
+            digest = hashlib.sha1(team.tobytes())
+            for name in metric_columns:
+                digest.update(np.ascontiguousarray(columns[name], dtype="<f8"))
+            digest.update(np.ascontiguousarray(ppa_present, dtype=bool))
+            key = _key(source, season, week)
+            if self._digests.get(key) == digest.hexdigest():
+                recorder.count("history.unchanged")
+                return False
+
+            week_column = np.full(len(team), week, dtype="<i2")
+            self.recordings[key] = self._append_segment(
+                source, season, week_column, team, columns, ppa_present
+            )
+            self._digests[key] = digest.hexdigest()
+            self._write_manifest()
+            recorder.add_rows("history.record", len(team))
+
+            if (
+                self.compact_segments is not None
+                and season < year
+                and len(self._partition(source, season)) >= self.compact_segments
+            ):
+                self._compact_season(source, season)
+        return True
+
+    def query(
+        self,
+        teams: Iterable[str] | None = None,
+        seasons: Bounds = None,
+        weeks: Bounds = None,
+        source: str = AS_OF,
+    ) -> HistoryFrame:
+        """
+        Rows for a selection of teams, seasons and weeks recorded from one source; only
+        the latest recording of a (season, week) is read.
+
+        :param teams: team names, None for every team
+        :param seasons: season, inclusive (first, last) range, or None for all
+        :param weeks: week, inclusive (first, last) range, or None for all
+        :param source: AS_OF or a load_source(...)
+        :return: HistoryFrame sorted by season, week and team
+        """
+        self.refresh()
+        first_season, last_season = _bounds(seasons)
+        first_week, last_week = _bounds(weeks)
+        team_ids = None
+        if teams is not None:
+            team_ids = [self.ids[team] for team in teams if team in self.ids]
+
+        parts: list[dict[str, np.ndarray]] = []
+        live = set(self.recordings.values())
+        recorder = get_recorder()
+        with recorder.stage("history.query"):
+            for segment in self.segments:
+                if not (
+                    segment["source"] == source
+                    and segment["sequence"] in live
+                    and first_season <= segment["season"] <= last_season
+                    and segment["first_week"] <= last_week
+                    and segment["last_week"] >= first_week
+                ):
+                    continue
+                with np.load(os.path.join(self.path, segment["file"])) as saved:
+                    arrays = {name: saved[name] for name in saved.files}
+                # Segments are sorted by week, so the week range is a slice
+                start = np.searchsorted(arrays["week"], first_week, side="left")
+                stop = np.searchsorted(arrays["week"], last_week, side="right")
+                rows = np.arange(start, stop)
+                # Only the weeks this segment holds the latest recording of
+                latest = [
+                    week
+                    for week in np.unique(arrays["week"][rows])
+                    if self.recordings.get(_key(source, segment["season"], week))
+                    == segment["sequence"]
+                ]
+                rows = rows[np.isin(arrays["week"][rows], latest)]
+                if team_ids is not None:
+                    rows = rows[np.isin(arrays["team"][rows], team_ids)]
+                part = {name: values[rows] for name, values in arrays.items()}
+                part["season"] = np.full(len(rows), segment["season"], dtype="<i2")
+                parts.append(part)
+
+            frame = self._frame(parts)
+        recorder.add_rows("history.query", len(frame))
+        return frame
+
+    def _frame(self, parts: list[dict[str, np.ndarray]]) -> HistoryFrame:
+        if not parts:
+            empty = np.empty(0, dtype="<i4")
+            return HistoryFrame(
+                empty,
+                empty,
+                empty,
+                self.names,
+                {name: np.empty(0) for name in metric_columns},
+                np.empty(0, dtype=bool),
+            )
+
+        merged = {name: np.concatenate([p[name] for p in parts]) for name in parts[0]}
+        # One recording per (season, week) is read, so every (season, week, team) is
+        # unique and sorting is all that is left
+        rows = np.lexsort((merged["team"], merged["week"], merged["season"]))
+        return HistoryFrame(
+            merged["season"][rows],
+            merged["week"][rows],
+            merged["team"][rows],
+            self.names,
+            {name: merged[name][rows] for name in metric_columns},
+            merged["ppa_present"][rows],
+        )
+
+    def registry(
+        self, season: int, week: int, source: str = AS_OF
+    ) -> TeamRegistry | None:
+        """
+        The team metrics last recorded for a week, read from disk.
+
+        :param season: season year
+        :param week: week whose games the metrics rate
+        :param source: AS_OF or a load_source(...)
+        :return: TeamRegistry, or None if the week was never recorded from source
+        """
+        frame = self.query(seasons=season, weeks=week, source=source)
+        return frame.registry() if len(frame) else None
+
+    def compact(self, before_season: int = year) -> int:
+        """
+        Rewrite each season partition before before_season as one segment.
+
+        :param before_season: seasons from this one on are left alone, defaults to the
+            current season, which is still being appended to
+        :return: number of segments removed
+        """
+        removed = 0
+        with self._lock:
+            self.refresh()
+            partitions = {(s["source"], s["season"]) for s in self.segments}
+            for source, season in sorted(partitions):
+                if season < before_season:
+                    removed += self._compact_season(source, season)
+        return removed
+
+    def _partition(self, source: str, season: int) -> list[dict[str, Any]]:
+        return [
+            s for s in self.segments if s["source"] == source and s["season"] == season
+        ]
+
+    def _compact_season(self, source: str, season: int) -> int:
+        old = self._partition(source, season)
+        if len(old) <= 1:
+            return 0
+
+        with get_recorder().stage("history.compact"):
+            frame = self.query(seasons=season, source=source)
+            self.segments = [s for s in self.segments if s not in old]
+            sequence = self._append_segment(
+                source,
+                season,
+                frame.week,
+                frame.team,
+                frame.columns,
+                frame.ppa_present,
+                compacted=True,
+            )
+            for week in np.unique(frame.week):
+                self.recordings[_key(source, season, week)] = sequence
+            self._write_manifest()
+            for segment in old:
+                try:
+                    os.remove(os.path.join(self.path, segment["file"]))
+                except FileNotFoundError:
+                    pass
+        get_recorder().count("history.compacted_segments", len(old))
+        return len(old) - 1
+
+
+def open_history(path: str = history_path) -> MetricHistory | None:
+    """
+    The configured history store, or None when history_enabled is off.
+    """
+    return MetricHistory(path) if history_enabled else None
+
+
+def backfill(
+    history: MetricHistory, api_fetcher: Any, seasons: list[int]
+) -> dict[int, int]:
+    """
+    Record every week of past seasons from point-in-time metrics (see asof.py), one
+    results call and one pass over the plays per season.
+
+    :param history: store to record into
+    :param api_fetcher: fetcher exposing games_api and plays_api
+    :param seasons: season years
+    :return: dict mapping each season to the number of weeks newly written
+    """
+    # Imported here: asof imports data_loader, which imports this module
+    from src.statforge.asof import build_as_of_store
+
+    written: dict[int, int] = {}
+    for season in seasons:
+        store = build_as_of_store(api_fetcher, season)
+        written[season] = sum(
+            history.record(season, week, store.registry(week - 1))
+            for week in range(1, store.weeks + 2)
+        )
+    return written
+
+
+def _print_frame(frame: HistoryFrame) -> None:
+    header = "".join(f"{name:>15}" for name in metric_columns)
+    print(f"{'season':>6} {'week':>4}  {'team':<24}{header}")
+    for i, team in enumerate(frame.teams()):
+        values = "".join(f"{frame.columns[name][i]:>15.4f}" for name in metric_columns)
+        print(f"{frame.season[i]:>6} {frame.week[i]:>4}  {team:<24}{values}")
+
+
+if __name__ == "__main__":
+    # Imported here: batch imports main, which imports data_loader
+    from src.statforge.batch import parse_weeks
+
+    usage = (
+        "Usage: python -m src.statforge.history backfill <seasons>\n"
+        "       python -m src.statforge.history team <team> <season> [weeks] "
+        "[--source <source>]\n"
+        "       python -m src.statforge.history week <week> <seasons> "
+        "[--source <source>]\n"
+        "       python -m src.statforge.history compact"
+    )
+
+    def selection(spec: str) -> Bounds:
+        selected = parse_weeks(spec)
+        if selected is None:
+            return None
+        return (selected[0], selected[-1]) if len(selected) > 1 else selected[0]
+
+    command, arguments = (sys.argv[1], sys.argv[2:]) if sys.argv[1:] else ("", [])
+    query_source = AS_OF
+    if arguments[-2:-1] == ["--source"]:
+        query_source, arguments = arguments[-1], arguments[:-2]
+    metric_history = MetricHistory()
+    if command == "backfill" and len(arguments) == 1:
+        from src.statforge.cache import ResponseCache
+        from src.statforge.config import cache_enabled, cache_offline
+        from src.statforge.data_loader import make_api_fetcher
+
+        cache = ResponseCache(offline=cache_offline) if cache_enabled else None
+        fetcher = make_api_fetcher(cache)
+        for season, weeks in backfill(
+            metric_history, fetcher, parse_weeks(arguments[0]) or []
+        ).items():
+            print(f"{season}: recorded {weeks} weeks")
+    elif command == "team" and len(arguments) in (2, 3):
+        _print_frame(
+            metric_history.query(
+                teams=[arguments[0]],
+                seasons=int(arguments[1]),
+                weeks=selection(arguments[2]) if len(arguments) == 3 else None,
+                source=query_source,
+            )
+        )
+    elif command == "week" and len(arguments) == 2:
+        _print_frame(
+            metric_history.query(
+                seasons=selection(arguments[1]),
+                weeks=int(arguments[0]),
+                source=query_source,
+            )
+        )
+    elif command == "compact" and not arguments:
+        print(f"Removed {metric_history.compact()} segments")
+    else:
+        sys.exit(usage)
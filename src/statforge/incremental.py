@@ -0,0 +1,119 @@
+"""
+Module for incremental recomputation of adjusted lines.
+
+IncrementalLines keeps the factors for a fixed schedule together with a team-to-games
+dependency index. When a refresh changes the metrics of only a few teams (see
+DataLoader.changed_teams) only the games those teams play are recomputed and re-emitted,
+so game-day refresh loops do work proportional to what changed rather than the whole
+schedule.
+"""
+
+import numpy as np
+
+from src.statforge.combine import (
+    AdjustedLines,
+    FactorWeights,
+    MissingPolicy,
+    combine_factors,
+)
+from src.statforge.config import missing_policy
+from src.statforge.metrics.engine import (
+    HOME_FIELD_ADVANTAGE,
+    MatchupEngine,
+    MatchupFactors,
+)
+from src.statforge.teams import TeamRegistry
+
+# MatchupFactors columns copied back when a subset of games is recomputed.
+_factor_columns: tuple[str, ...] = (
+    "away_ids",
+    "home_ids",
+    "srs_line",
+    "ppa_factor",
+    "havoc_top",
+    "havoc_bottom",
+    "srs_valid",
+    "ppa_valid",
+    "havoc_top_valid",
+    "havoc_bottom_valid",
+)
+
+
+class IncrementalLines:
+    """
+    Adjusted lines for a fixed schedule that can be updated team by team.
+
+    Attributes:
+        games: the (away, home) matchups tracked
+        games_by_team: dict mapping each team to the indices of the games it plays
+        factors: MatchupFactors for every game, or None before the first update
+        policy: missing-data policy used when combining factors
+        weights: home field and factor weights
+    """
+
+    def __init__(
+        self,
+        games: list[tuple[str, str]],
+        policy: MissingPolicy = missing_policy,
+        home_field: float = HOME_FIELD_ADVANTAGE,
+        weights: FactorWeights | None = None,
+    ) -> None:
+        self.games = list(games)
+        self.policy = policy
+        # Fitted weights carry their own home field
+        self.weights = weights if weights is not None else FactorWeights(home_field)
+        self.home_field = self.weights.home_field
+        self.factors: MatchupFactors | None = None
+
+        index: dict[str, list[int]] = {}
+        for i, (away_team, home_team) in enumerate(self.games):
+            index.setdefault(away_team, []).append(i)
+            if home_team != away_team:
+                index.setdefault(home_team, []).append(i)
+        self.games_by_team: dict[str, np.ndarray] = {
+            team: np.array(indices, dtype=np.intp) for team, indices in index.items()
+        }
+
+    def affected_games(self, teams: set[str]) -> np.ndarray:
+        """
+        Indices of every game involving at least one of the given teams.
+
+        :param teams: team names
+        :return: sorted array of game indices
+        """
+        index = self.games_by_team
+        parts = [index[team] for team in teams if team in index]
+        if not parts:
+            return np.empty(0, dtype=np.intp)
+        return np.unique(np.concatenate(parts))
+
+    def update(
+        self, registry: TeamRegistry, changed: set[str] | None = None
+    ) -> AdjustedLines:
+        """
+        Recompute the games affected by a change and return only those lines.
+
+        :param registry: the current TeamRegistry
+        :param changed: teams whose metrics changed, or None to recompute everything
+        :return: AdjustedLines for the recomputed games
+        """
+        engine = MatchupEngine(registry, self.home_field)
+
+        if self.factors is None or changed is None:
+            self.factors = engine.compute(self.games)
+            return combine_factors(self.factors, self.policy, self.weights)
+
+        rows = self.affected_games(changed)
+        subset = engine.compute([self.games[i] for i in rows])
+        for column in _factor_columns:
+            getattr(self.factors, column)[rows] = getattr(subset, column)
+
+        return combine_factors(subset, self.policy, self.weights)
+
+    def lines(self) -> AdjustedLines:
+        """
+        Adjusted lines for every tracked game as of the last update.
+        """
+        if self.factors is None:
+            raise RuntimeError("IncrementalLines.update has not been called yet")
+        return combine_factors(self.factors, self.policy, self.weights)
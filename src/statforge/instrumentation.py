@@ -0,0 +1,291 @@
+"""
+Module for timing, API-call and memory instrumentation of the weekly pipeline.
+
+Instrumentation is off by default: the active recorder is a no-op whose methods return
+immediately, so the hooks threaded through the fetchers, DataLoader and the calculators
+cost next to nothing. Wrapping a run in instrument() installs a Recorder that collects
+- wall time per stage and per API call
+- call counts, errors and response sizes (rows)
+- rows processed per calculator
+- peak traced Python memory and peak RSS (0 on Windows, which has no resource module)
+and can be dumped as JSON or Prometheus text exposition at the end of the run.
+
+    with instrument() as recorder:
+        loader.load()
+        ...
+    print(recorder.to_prometheus())
+"""
+
+import contextlib
+import functools
+import json
+import sys
+import threading
+import time
+import tracemalloc
+
+from typing import Any, Callable, Iterator
+
+# Hooks are called as hook(kind, name, value) for every recorded event, where kind is
+# one of "stage", "call", "rows" or "count".
+Hook = Callable[[str, str, float], None]
+
+
+class Timing:
+    """
+    Count and wall-time totals for one stage or call name.
+    """
+
+    __slots__ = ("count", "errors", "rows", "total_seconds", "max_seconds")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.errors = 0
+        self.rows = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+
+    def as_dict(self) -> dict[str, float]:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "rows": self.rows,
+            "total_seconds": self.total_seconds,
+            "max_seconds": self.max_seconds,
+        }
+
+
+class NullRecorder:
+    """
+    Recorder used while instrumentation is off. Every method is a no-op.
+    """
+
+    enabled = False
+    _null_stage = contextlib.nullcontext()
+
+    def stage(self, name: str) -> contextlib.AbstractContextManager:
+        return self._null_stage
+
+    def record_call(
+        self, name: str, seconds: float, rows: int, error: bool = False
+    ) -> None:
+        pass
+
+    def add_rows(self, name: str, rows: int) -> None:
+        pass
+
+    def count(self, name: str, amount: int = 1) -> None:
+        pass
+
+
+class Recorder(NullRecorder):
+    """
+    Collects stage timings, API calls, row counts and counters for one run.
+
+    Attributes:
+        stages: dict mapping stage names to Timing
+        calls: dict mapping API call names to Timing (rows = response rows)
+        rows: dict mapping calculator names to rows processed
+        counters: free-form event counters, e.g. cache hits
+        hooks: callables notified of every event
+    """
+
+    enabled = True
+
+    def __init__(self, hooks: list[Hook] | None = None) -> None:
+        self.stages: dict[str, Timing] = {}
+        self.calls: dict[str, Timing] = {}
+        self.rows: dict[str, int] = {}
+        self.counters: dict[str, int] = {}
+        self.hooks: list[Hook] = list(hooks or [])
+        self.peak_traced_bytes = 0
+        self.peak_rss_bytes = 0
+        self._lock = threading.Lock()
+
+    def add_hook(self, hook: Hook) -> None:
+        self.hooks.append(hook)
+
+    def _emit(self, kind: str, name: str, value: float) -> None:
+        for hook in self.hooks:
+            hook(kind, name, value)
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            with self._lock:
+                self.stages.setdefault(name, Timing()).add(seconds)
+            self._emit("stage", name, seconds)
+
+    def record_call(
+        self, name: str, seconds: float, rows: int, error: bool = False
+    ) -> None:
+        with self._lock:
+            timing = self.calls.setdefault(name, Timing())
+            timing.add(seconds)
+            timing.rows += rows
+            timing.errors += int(error)
+        self._emit("call", name, seconds)
+
+    def add_rows(self, name: str, rows: int) -> None:
+        with self._lock:
+            self.rows[name] = self.rows.get(name, 0) + rows
+        self._emit("rows", name, rows)
+
+    def count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+        self._emit("count", name, amount)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "stages": {name: t.as_dict() for name, t in self.stages.items()},
+            "calls": {name: t.as_dict() for name, t in self.calls.items()},
+            "rows": dict(self.rows),
+            "counters": dict(self.counters),
+            "peak_traced_bytes": self.peak_traced_bytes,
+            "peak_rss_bytes": self.peak_rss_bytes,
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self, prefix: str = "statforge") -> str:
+        """
+        Render the recorded metrics in Prometheus text exposition format.
+        """
+        lines: list[str] = []
+
+        def family(name: str, kind: str, samples: list[tuple[str, float]]) -> None:
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{prefix}_{name}{labels} {value}")
+
+        def label(key: str, value: str) -> str:
+            escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+            return f'{{{key}="{escaped}"}}'
+
+        family(
+            "stage_seconds_total",
+            "counter",
+            [(label("stage", n), t.total_seconds) for n, t in self.stages.items()],
+        )
+        family(
+            "call_seconds_total",
+            "counter",
+            [(label("call", n), t.total_seconds) for n, t in self.calls.items()],
+        )
+        family(
+            "calls_total",
+            "counter",
+            [(label("call", n), t.count) for n, t in self.calls.items()],
+        )
+        family(
+            "call_errors_total",
+            "counter",
+            [(label("call", n), t.errors) for n, t in self.calls.items()],
+        )
+        family(
+            "call_rows_total",
+            "counter",
+            [(label("call", n), t.rows) for n, t in self.calls.items()],
+        )
+        family(
+            "rows_processed_total",
+            "counter",
+            [(label("calculator", n), rows) for n, rows in self.rows.items()],
+        )
+        family(
+            "events_total",
+            "counter",
+            [(label("event", n), count) for n, count in self.counters.items()],
+        )
+        family("peak_traced_bytes", "gauge", [("", self.peak_traced_bytes)])
+        family("peak_rss_bytes", "gauge", [("", self.peak_rss_bytes)])
+
+        return "\n".join(lines) + "\n"
+
+
+_null_recorder = NullRecorder()
+_active: NullRecorder = _null_recorder
+
+
+def get_recorder() -> NullRecorder:
+    """
+    Return the active recorder (a no-op NullRecorder unless inside instrument()).
+    """
+    return _active
+
+
+@contextlib.contextmanager
+def instrument(
+    track_memory: bool = True, hooks: list[Hook] | None = None
+) -> Iterator[Recorder]:
+    """
+    Install a Recorder for the duration of the block.
+
+    :param track_memory: trace Python allocations with tracemalloc for peak memory;
+        adds overhead, so turn it off when only timings matter
+    :param hooks: callables notified of every recorded event
+    :return: the installed Recorder
+    """
+    global _active
+
+    recorder = Recorder(hooks)
+    previous = _active
+    _active = recorder
+    started_tracing = track_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+
+    try:
+        yield recorder
+    finally:
+        if tracemalloc.is_tracing():
+            recorder.peak_traced_bytes = tracemalloc.get_traced_memory()[1]
+        if started_tracing:
+            tracemalloc.stop()
+        recorder.peak_rss_bytes = _peak_rss_bytes()
+        _active = previous
+
+
+def _peak_rss_bytes() -> int:
+    # Imported here: resource is Unix-only and every entry point imports this module
+    try:
+        import resource
+    except ImportError:
+        return 0
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes on Linux and the BSDs
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def timed(name: str) -> Callable:
+    """
+    Decorator recording a calculator method as a stage, with len(self.games) rows.
+
+    :param name: stage name, e.g. "srs.calculate_odds"
+    """
+
+    def decorator(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            recorder = _active
+            if not recorder.enabled:
+                return method(self, *args, **kwargs)
+            with recorder.stage(name):
+                result = method(self, *args, **kwargs)
+            recorder.add_rows(name, len(self.games))
+            return result
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,324 @@
+"""
+Game-day live mode: poll the schedule, and as games finish refetch only the stats they
+affect and push the lines that moved to an output writer.
+
+A one-shot run of main.py reloads every table and rewrites every line. LiveRefresher
+instead does one full load and then, every poll:
+
+1. fetches the games of the week being played (one request)
+2. hashes every game row and compares it with the previous poll, so an unchanged
+   response costs nothing further, and picks out the games that finished or whose
+   matchup changed
+3. refetches only the affected stats with DataLoader.load_teams: the season's SRS in
+   one request, the PPA and havoc of the teams that just finished one request each
+4. recomputes only the games the changed teams play (see incremental.py) and writes
+   just those lines, flushed so a consumer sees them straight away
+
+Once every game of the week is final it moves on to the next week, and it stops after
+the last one. Polls go straight to the API, bypassing the response cache, whose TTLs
+would hide the updates being watched for.
+
+Usage:
+    python -m src.statforge.live
+    python -m src.statforge.live --interval 30 --format jsonl --out live.jsonl
+    python -m src.statforge.live --fake --interval 1 --cycles 10
+"""
+
+import argparse
+import contextlib
+import hashlib
+import json
+import sys
+import threading
+
+from typing import Any, Callable, NamedTuple
+
+from src.statforge.combine import (
+    AdjustedLines,
+    FactorWeights,
+    MissingPolicy,
+    load_factor_weights,
+)
+from src.statforge.config import (
+    live_poll_seconds,
+    missing_policy,
+    output_format,
+    output_path,
+    year,
+)
+from src.statforge.data_loader import FBS, APIDataFetcher, DataLoader, make_api_fetcher
+from src.statforge.history import MetricHistory, open_history
+from src.statforge.incremental import IncrementalLines
+from src.statforge.instrumentation import get_recorder
+from src.statforge.writers import LineWriter, open_writer, output_formats
+
+
+def _jsonable(value: Any) -> Any:
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    if hasattr(value, "__dict__"):
+        return vars(value)
+    return str(value)
+
+
+def row_digest(row: Any) -> str:
+    """
+    Content hash of an API row (cfbd model, cached or fake row); any changed field,
+    nested ones included, changes it.
+    """
+    text = json.dumps(row, default=_jsonable, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(text.encode()).hexdigest()
+
+
+class LiveCycle(NamedTuple):
+    week: int | None
+    changed_games: int
+    finished: list[tuple[str, str]]
+    refetched_teams: int
+    lines: int
+
+
+class LiveRefresher:
+    """
+    Keeps a season's lines current from polls of the week being played.
+
+    Attributes:
+        loader: DataLoader for the whole season (week=None)
+        writer: LineWriter updated lines are pushed to, or None
+        policy: missing-data policy for the lines
+        weights: home field and factor weights for the lines
+        week: week being polled, None before start() and after the season's last week
+        digests: dict mapping each polled game's id to the hash of its last row
+        cycles: polls made so far
+    """
+
+    def __init__(
+        self,
+        api_fetcher: APIDataFetcher,
+        season: int = year,
+        writer: LineWriter | None = None,
+        policy: MissingPolicy = missing_policy,
+        weights: FactorWeights | None = None,
+        history: MetricHistory | None = None,
+    ) -> None:
+        self.loader = DataLoader(api_fetcher, None, season=season, history=history)
+        self.writer = writer
+        self.policy = policy
+        self.weights = weights if weights is not None else load_factor_weights()
+        self.week: int | None = None
+        self.digests: dict[Any, str] = {}
+        self.cycles = 0
+        self._completed: set[Any] = set()
+        self._incremental: dict[int, IncrementalLines] = {}
+        self._started = False
+        self._stop = threading.Event()
+
+    @property
+    def season(self) -> int:
+        return self.loader.season
+
+    def start(self) -> None:
+        """
+        Load the season and write the lines of the current and every later week once.
+        """
+        self.loader.load()
+        self._started = True
+        self.week = self.loader.current_week
+        if self.week not in self.loader.games_by_week:
+            self.week = None
+        for week, games in self.loader.games_by_week.items():
+            if self.week is not None and week >= self.week:
+                self._track(week, games)
+        if self.week is not None:
+            self._seed(self.week, self.loader.schedule)
+
+    def _track(self, week: int, games: list[tuple[str, str]]) -> None:
+        incremental = IncrementalLines(games, self.policy, weights=self.weights)
+        self._incremental[week] = incremental
+        self._write(week, incremental.update(self.loader.teams))
+
+    def _seed(self, week: int, rows: list) -> None:
+        # Rows already seen for the week, so the next poll only reports changes
+        rows = [game for game in rows if game.week == week]
+        self.digests = {game.id: row_digest(game) for game in rows}
+        self._completed = {game.id for game in rows if game.completed}
+
+    def _write(self, week: int, lines: AdjustedLines) -> int:
+        if self.writer is not None and len(lines):
+            self.writer.write(self.season, week, lines)
+            self.writer.flush()
+        return len(lines)
+
+    def poll(self) -> LiveCycle:
+        """
+        Fetch the current week's games once and apply whatever changed.
+
+        :return: LiveCycle summarizing the poll
+        """
+        if not self._started:
+            raise RuntimeError("LiveRefresher.start has not been called yet")
+        week = self.week
+        if week is None:
+            return LiveCycle(None, 0, [], 0, 0)
+
+        recorder = get_recorder()
+        self.cycles += 1
+        recorder.count("live.polls")
+        with recorder.stage("live.poll"):
+            rows = self.loader.api_fetcher.games_api.get_games(
+                year=self.season, week=week, classification=FBS
+            )
+            digests = {game.id: row_digest(game) for game in rows}
+        changed = {
+            game_id
+            for game_id, digest in digests.items()
+            if self.digests.get(game_id) != digest
+        } | (self.digests.keys() - digests.keys())
+        self.digests = digests
+        if not changed:
+            recorder.count("live.unchanged")
+            return LiveCycle(week, 0, [], 0, 0)
+
+        finished = [
+            game
+            for game in rows
+            if game.completed and game.id not in self._completed
+        ]
+        self._completed = {game.id for game in rows if game.completed}
+        recorder.count("live.changed_games", len(changed))
+        recorder.count("live.finished_games", len(finished))
+
+        lines = 0
+        with recorder.stage("live.update"):
+            games = [(game.away_team, game.home_team) for game in rows]
+            if sorted(games) != sorted(self.loader.games_by_week.get(week, [])):
+                # Added, removed or re-paired games: rebuild just this week
+                self.loader.games_by_week[week] = games
+                self._track(week, games)
+                lines += len(games)
+
+            teams = {
+                team for game in finished for team in (game.away_team, game.home_team)
+            }
+            if teams:
+                self.loader.load_teams(teams)
+                moved = self.loader.changed_teams
+                for number, incremental in self._incremental.items():
+                    if moved and len(incremental.affected_games(moved)):
+                        lines += self._write(
+                            number, incremental.update(self.loader.teams, moved)
+                        )
+        recorder.count("live.lines", lines)
+
+        if rows and all(game.completed for game in rows):
+            later = [number for number in self.loader.games_by_week if number > week]
+            self.week = min(later) if later else None
+            if self.week is not None:
+                self._seed(self.week, self.loader.schedule)
+
+        return LiveCycle(
+            week,
+            len(changed),
+            [(game.away_team, game.home_team) for game in finished],
+            len(teams),
+            lines,
+        )
+
+    def run(
+        self,
+        interval: float = live_poll_seconds,
+        cycles: int | None = None,
+        before_poll: Callable[["LiveRefresher"], None] | None = None,
+    ) -> None:
+        """
+        Poll every interval seconds until the season's last week is final, stop() is
+        called, or cycles polls have been made. Progress goes to stderr so the writer
+        can own stdout.
+
+        :param interval: seconds between polls
+        :param cycles: polls to make, None for no limit
+        :param before_poll: called before every poll, e.g. to play out fake games
+        """
+        if not self._started:
+            self.start()
+        while self.week is not None and not self._stop.is_set():
+            if before_poll is not None:
+                before_poll(self)
+            try:
+                cycle = self.poll()
+            except Exception as e:
+                print(f"Error polling week {self.week}: {e}", file=sys.stderr)
+            else:
+                print(
+                    f"Week {cycle.week}: {cycle.changed_games} games changed, "
+                    f"{len(cycle.finished)} finished, {cycle.refetched_teams} teams "
+                    f"refetched, {cycle.lines} lines updated",
+                    file=sys.stderr,
+                )
+            if cycles is not None and self.cycles >= cycles:
+                break
+            self._stop.wait(interval)
+
+    def stop(self) -> None:
+        self._stop.set()
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.statforge.live",
+        description="Keep adjusted lines current as games finish.",
+    )
+    parser.add_argument("--season", type=int, default=year)
+    parser.add_argument("--interval", type=float, default=live_poll_seconds)
+    parser.add_argument("--cycles", type=int, help="stop after this many polls")
+    parser.add_argument("--format", choices=output_formats, default=output_format)
+    parser.add_argument(
+        "--out", default=output_path, help='output file, "-" for stdout'
+    )
+    parser.add_argument(
+        "--fake",
+        action="store_true",
+        help="simulate a game day against the fake backend (fake.py), no API key",
+    )
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    before_poll: Callable[[LiveRefresher], None] | None = None
+
+    if args.fake:
+        from src.statforge.fake import (
+            FakeAPIDataFetcher,
+            finish_games,
+            generate_season,
+        )
+
+        fake_season = generate_season(args.season, completed_weeks=6)
+        api_fetcher: Any = FakeAPIDataFetcher(fake_season)
+
+        def play_games(refresher: LiveRefresher) -> None:
+            finish_games(fake_season, refresher.week, 3, seed=refresher.cycles)
+
+        before_poll = play_games
+    else:
+        api_fetcher = make_api_fetcher(None)
+
+    # Opened before any redirect, so structured output on stdout stays clean
+    writer = open_writer(args.format, args.out)
+    if args.out == "-" and args.format != "text":
+        progress = contextlib.redirect_stdout(sys.stderr)
+    else:
+        progress = contextlib.nullcontext()
+
+    with writer, progress:
+        live = LiveRefresher(
+            api_fetcher,
+            season=args.season,
+            writer=writer,
+            history=None if args.fake else open_history(),
+        )
+        try:
+            live.run(args.interval, args.cycles, before_poll)
+        except KeyboardInterrupt:
+            pass
@@ -1,7 +1,34 @@
-from metrics.havoc import CalculateHavocBottom, CalculateHavocTop
-from metrics.ppa import CalculatePPAFactor
-from metrics.srs import CalculateSRSLine, print_odds
-from src.statforge.data_loader import APIDataFetcher, DataLoader
+import argparse
+import contextlib
+import sys
+
+from src.statforge.metrics.engine import MatchupEngine
+from src.statforge.metrics.registry import MetricPlan, compute_metrics, plan
+from src.statforge.metrics.srs import print_odds
+from src.statforge.cache import ResponseCache
+from src.statforge.combine import (
+    AdjustedLines,
+    FactorWeights,
+    MissingPolicy,
+    combine_factors,
+    join_factor_rows,
+    load_factor_weights,
+)
+from src.statforge.config import (
+    cache_enabled,
+    cache_offline,
+    metrics_format,
+    metrics_path,
+    missing_policy,
+    output_format,
+    output_path,
+    selected_metrics,
+    year,
+)
+from src.statforge.data_loader import APIDataFetcher, DataLoader, make_api_fetcher
+from src.statforge.history import open_history
+from src.statforge.instrumentation import Recorder, instrument
+from src.statforge.writers import MissingDataReport, open_writer, output_formats
 
 
 def adjust_factor(
@@ -9,74 +36,194 @@ def adjust_factor(
     ppa_factors: list[dict[str, float]],
     havoc_factors_top: list[dict[str, float]],
     havoc_factors_bottom: list[dict[str, float]],
-) -> dict[str, float]:
+    policy: MissingPolicy = missing_policy,
+    weights: FactorWeights | None = None,
+) -> AdjustedLines:
     """
     Combine SRS, PPA, and Havoc metrics into an adjusted per-matchup line.
 
-    Each matchup is represented as "away_team vs home_team" and adjusted by
-    summing all calculated factors.
+    Each factor list is joined to the SRS lines on its (away, home) matchup, so games
+    dropped by only one calculator can't misalign the others, and the line is adjusted
+    by summing all calculated factors times their weights.
 
     :param srs_lines: base SRS odds fetched to operate on
     :param ppa_factors: list of dicts containing total_factors for PPA
     :param havoc_factors_top: list of dicts containing havoc_factor_top per matchup
     :param havoc_factors_bottom: list of dicts containing havoc_factor_bottom per matchup
-    :return: dict mapping matchups to adjusted SRS lines
+    :param policy: missing-data policy, one of "drop", "zero" or "partial"
+    :param weights: factor weights, None for unit weights; weights.home_field must
+        already be in srs_lines (CalculateSRSLine(..., home_field=weights.home_field))
+    :return: AdjustedLines table of adjusted SRS lines per matchup
     """
-    adjusted: dict[str, float] = {}
-
-    if havoc_factors_top is None:
-        print("empty dict")
-
-    for ppa_factor, havoc_factor_top, havoc_factor_bottom in zip(
-        ppa_factors, havoc_factors_top, havoc_factors_bottom
-    ):
-        away_team: float = ppa_factor["away_team"]
-        home_team: float = ppa_factor["home_team"]
-
-        matchup: str = f"{away_team} vs {home_team}"
-
-        if matchup in srs_lines:
-            srs_line: float = srs_lines[matchup]
-            # Influence is defined as the aggregation of all calculated factors
-            total_influence: float = (
-                ppa_factor["total_factor"]
-                + havoc_factor_top["havoc_factor_top"]
-                + havoc_factor_bottom["havoc_factor_bottom"]
-            )
-            adjusted_srs: float = srs_line + total_influence
-            adjusted[matchup] = adjusted_srs
-
-    return adjusted
-
-
-if __name__ == "__main__":
-    api_fetcher: APIDataFetcher = APIDataFetcher()
-
-    print("Enter the week you need data for: ")
-    current_week: int = int(input())
-
-    loader: DataLoader = DataLoader(api_fetcher, current_week)
-    loader.load()
-
-    games = loader.games
+    return join_factor_rows(
+        srs_lines, ppa_factors, havoc_factors_top, havoc_factors_bottom, policy, weights
+    )
+
+
+def calculate_adjusted_lines(
+    loader: DataLoader,
+    games: list[tuple[str, str]],
+    week: int,
+    verbose: bool = True,
+    policy: MissingPolicy = missing_policy,
+    metric_plan: MetricPlan | None = None,
+    weights: FactorWeights | None = None,
+    report: MissingDataReport | None = None,
+) -> AdjustedLines:
+    """
+    Run the matchup engine over one week's games against the loader's season-level
+    team tables and combine the factors into adjusted lines.
+
+    :param loader: a DataLoader that has already been loaded
+    :param games: the matchups to compute lines for
+    :param week: week the games belong to
+    :param verbose: print the raw SRS odds and a missing-data summary along the way
+    :param policy: missing-data policy, one of "drop", "zero" or "partial"
+    :param metric_plan: compute only these metrics (see metrics/registry.py); None
+        computes the four built-in factors in one pass
+    :param weights: home field and factor weights, None to load the fitted ones (see
+        fitting.py)
+    :param report: MissingDataReport to record games missing a factor in, instead of
+        printing a summary
+    :return: AdjustedLines table of adjusted SRS lines per matchup
+    """
+    if weights is None:
+        weights = load_factor_weights()
+    engine = MatchupEngine(loader.teams, weights.home_field)
+    if metric_plan is None:
+        factors = engine.compute(games)
+    else:
+        factors = compute_metrics(engine, games, metric_plan)
 
-    srs_calc = CalculateSRSLine(games, loader.srs_by_team)
+    if report is not None:
+        report.add_factors(factors, loader.season, week)
 
-    ppa_calc = CalculatePPAFactor(games, loader.ppa_by_team)
+    if verbose:
+        print_odds(factors.srs_lines())
+    if verbose and report is None:
+        for factor in ("srs", "ppa", "havoc_top", "havoc_bottom"):
+            missing = factors.missing(factor)
+            if missing:
+                print(f"Week {week}: {len(missing)} games missing {factor} data")
 
-    havoc_top_calc = CalculateHavocTop(games, loader.havoc_by_team)
+    return combine_factors(factors, policy, weights)
 
-    havoc_bottom_calc = CalculateHavocBottom(games, loader.havoc_by_team)
 
-    srs_lines = srs_calc.calculate_odds()
-    print_odds(srs_lines)
+def write_metrics(recorder: Recorder, path: str, output_format: str) -> None:
+    """
+    Dump the instrumentation collected during a run.
 
-    ppa_factors = ppa_calc.calculate_total_factor(current_week)
-    havoc_top = havoc_top_calc.calculate_total()
-    havoc_bottom = havoc_bottom_calc.calculate_total()
+    :param recorder: Recorder installed by instrument()
+    :param path: destination file
+    :param output_format: "json" or "prometheus"
+    """
+    if output_format == "prometheus":
+        text = recorder.to_prometheus()
+    else:
+        text = recorder.to_json()
+
+    with open(path, "w") as f:
+        f.write(text)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.statforge.main",
+        description="Compute adjusted SRS lines for one or more weeks of a season.",
+    )
+    parser.add_argument(
+        "--week",
+        help='week selection such as "5", "3-10", "1,4,7" or "all"; asked for '
+        "interactively if omitted",
+    )
+    parser.add_argument("--season", type=int, default=year)
+    parser.add_argument("--format", choices=output_formats, default=output_format)
+    parser.add_argument(
+        "--out", default=output_path, help='output file, "-" for stdout'
+    )
+    parser.add_argument(
+        "--missing-report",
+        metavar="PATH",
+        help="write the games missing each factor to this JSON file",
+    )
+    parser.add_argument(
+        "--snapshot",
+        metavar="PATH",
+        help="compute from a snapshot file instead of the API; --season is ignored",
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        default=cache_offline,
+        help="serve every request from the response cache, never the API",
+    )
+    return parser.parse_args(argv)
 
-    adjusted_factors = adjust_factor(srs_lines, ppa_factors, havoc_top, havoc_bottom)
 
-    print("Adjusted SRS Odds:")
-    for match, adjusted_srs_line in adjusted_factors.items():
-        print(f"{match}: {adjusted_srs_line}")
+if __name__ == "__main__":
+    # Imported here: batch imports this module
+    from src.statforge.batch import parse_weeks
+
+    args = parse_args()
+    if args.week is None:
+        print("Enter the week you need data for: ")
+        args.week = input()
+    selected_weeks = parse_weeks(args.week)
+
+    with instrument() if metrics_path else contextlib.nullcontext() as recorder:
+        report = MissingDataReport()
+        # Opened before any redirect, so structured output on stdout stays clean
+        writer = open_writer(args.format, args.out)
+        if args.out == "-" and args.format != "text":
+            progress = contextlib.redirect_stdout(sys.stderr)
+        else:
+            progress = contextlib.nullcontext()
+
+        with writer, progress:
+            single_week = selected_weeks is not None and len(selected_weeks) == 1
+            metric_plan = plan(selected_metrics)
+            if args.snapshot:
+                loader = DataLoader.from_snapshot(args.snapshot)
+                single_week = False
+            else:
+                cache = None
+                if cache_enabled or args.offline:
+                    cache = ResponseCache(offline=args.offline)
+                api_fetcher: APIDataFetcher = make_api_fetcher(cache)
+                loader = DataLoader(
+                    api_fetcher,
+                    selected_weeks[0] if single_week else None,
+                    season=args.season,
+                    history=open_history(),
+                )
+                loader.load(sources=metric_plan.sources)
+                loader.print_timings()
+
+            if single_week:
+                games_by_week = {selected_weeks[0]: loader.games}
+            else:
+                games_by_week = {
+                    week: games
+                    for week, games in sorted(loader.games_by_week.items())
+                    if selected_weeks is None or week in selected_weeks
+                }
+
+            for week, games in games_by_week.items():
+                adjusted_factors = calculate_adjusted_lines(
+                    loader,
+                    games,
+                    week,
+                    verbose=False,
+                    metric_plan=metric_plan,
+                    report=report,
+                )
+                writer.write(loader.season, week, adjusted_factors)
+
+        if args.missing_report:
+            report.write(args.missing_report)
+        if len(report):
+            counts = ", ".join(f"{n} {factor}" for factor, n in report.counts().items())
+            print(f"Games missing data: {counts}", file=sys.stderr)
+
+    if metrics_path:
+        write_metrics(recorder, metrics_path, metrics_format)
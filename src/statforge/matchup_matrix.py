@@ -0,0 +1,310 @@
+"""
+Module for the all-pairs matchup matrix: the adjusted line of every team against every
+other team, answerable for any pairing without recomputation.
+
+The engine only computes lines for a given list of games, so a hypothetical matchup
+(a bowl or playoff scenario) used to need a rerun with a handcrafted schedule. The
+matrix instead holds the neutral-site adjusted line of every (home, away) pair, built
+from the registry in one vectorized pass with the same formulas, weights and
+missing-data policy as combine_factors:
+
+    lines[home, away] = srs[home] - srs[away] + weighted PPA and havoc factors
+
+The home-field points are added on lookup, so one matrix answers home, away and
+neutral-site variants. Lines are stored as float32, which is ~70 KB for the FBS and a
+few MB even with every division, and a saved matrix is memory-mapped back, so workers
+and services can share one file without parsing or copying it.
+
+Layout of a matrix file:
+- 8-byte magic b"SFMATRIX"
+- uint32 format version, uint32 header length (little endian)
+- UTF-8 JSON header: team names, home field, weights and policy
+- the float32 line matrix, then the uint8 completeness matrix, each aligned to 64 bytes
+
+Usage:
+    python -m src.statforge.matchup_matrix build
+    python -m src.statforge.matchup_matrix "Michigan" "Ohio State"
+    python -m src.statforge.matchup_matrix "Georgia" "Alabama" neutral
+"""
+
+import json
+import math
+import os
+import struct
+import sys
+
+import numpy as np
+
+from src.statforge.cache import ResponseCache
+from src.statforge.combine import (
+    FactorWeights,
+    MissingPolicy,
+    load_factor_weights,
+    missing_policies,
+)
+from src.statforge.config import (
+    cache_enabled,
+    cache_offline,
+    matchup_matrix_path,
+    missing_policy,
+)
+from src.statforge.data_loader import DataLoader, make_api_fetcher
+from src.statforge.instrumentation import get_recorder
+from src.statforge.snapshot import ALIGNMENT
+from src.statforge.teams import TeamRegistry
+
+MAGIC: bytes = b"SFMATRIX"
+MATRIX_VERSION: int = 1
+
+_preamble = struct.Struct("<8sII")
+
+
+class MatrixFileError(ValueError):
+    """
+    Raised when a file is not a matchup matrix or was written by an unsupported version.
+    """
+
+
+class MatchupMatrix:
+    """
+    Neutral-site adjusted lines for every (home, away) team pair.
+
+    Attributes:
+        teams: team names, position is the row/column index
+        ids: dict mapping team names to indices
+        lines: (teams, teams) float32 array, row = home team, column = away team, NaN
+            where the pair has no line under the policy
+        complete: (teams, teams) bool array, whether every factor was present
+        home_field: points added to the home side on lookup
+        weights: FactorWeights the factors were summed with
+        policy: missing-data policy the matrix was built with
+    """
+
+    def __init__(
+        self,
+        teams: list[str],
+        lines: np.ndarray,
+        complete: np.ndarray,
+        weights: FactorWeights,
+        policy: MissingPolicy,
+    ) -> None:
+        self.teams = teams
+        self.ids = {team: i for i, team in enumerate(teams)}
+        self.lines = lines
+        self.complete = complete
+        self.weights = weights
+        self.home_field = weights.home_field
+        self.policy = policy
+
+    def __len__(self) -> int:
+        return len(self.teams)
+
+    @classmethod
+    def build(
+        cls,
+        registry: TeamRegistry,
+        weights: FactorWeights | None = None,
+        policy: MissingPolicy = missing_policy,
+    ) -> "MatchupMatrix":
+        """
+        Compute every pairing from the registry's columns with NumPy broadcasting.
+
+        :param registry: TeamRegistry filled by DataLoader or an AsOfStore
+        :param weights: home field and factor weights, None for the defaults
+        :param policy: "drop" leaves pairs missing a factor as NaN, "zero" and
+            "partial" count missing factors as 0, as in the adjusted column of
+            combine_factors
+        :return: MatchupMatrix over every team in the registry
+        """
+        if policy not in missing_policies:
+            raise ValueError(f"Unknown missing-data policy: {policy}")
+        weights = weights or FactorWeights()
+
+        recorder = get_recorder()
+        with recorder.stage("matchup_matrix.build"):
+            srs = registry.column("srs")
+            ppa_offense = registry.column("ppa_offense")
+            ppa_defense = registry.column("ppa_defense")
+            havoc_offense = registry.column("havoc_offense")
+            havoc_defense = registry.column("havoc_defense")
+            ppa_present = registry.ppa_present
+
+            # Rows are the home team, columns the away team.
+            home, away = np.s_[:, None], np.s_[None, :]
+            factors = (
+                (
+                    (ppa_offense[home] - ppa_offense[away])
+                    - (ppa_defense[home] - ppa_defense[away]),
+                    ppa_present[home] & ppa_present[away],
+                    weights.ppa,
+                ),
+                (
+                    havoc_offense[away] - havoc_defense[home],
+                    None,
+                    weights.havoc_top,
+                ),
+                (
+                    havoc_defense[away] - havoc_offense[home],
+                    None,
+                    weights.havoc_bottom,
+                ),
+            )
+
+            lines = srs[home] - srs[away]
+            complete = ~np.isnan(lines)
+            for values, valid, weight in factors:
+                if valid is None:
+                    valid = ~np.isnan(values)
+                complete &= valid
+                lines += weight * np.where(valid, values, 0.0)
+            if policy == "drop":
+                lines[~complete] = np.nan
+        recorder.add_rows("matchup_matrix.build", lines.size)
+
+        return cls(
+            list(registry.names), lines.astype(np.float32), complete, weights, policy
+        )
+
+    def line(
+        self, away_team: str, home_team: str, neutral: bool = False
+    ) -> float | None:
+        """
+        Adjusted line for one pairing, in constant time.
+
+        :param away_team: away (or, at a neutral site, nominal away) team
+        :param home_team: home (or nominal home) team
+        :param neutral: leave out the home-field points
+        :return: the line, or None if a team is unknown or the pair has no line
+        """
+        away = self.ids.get(away_team)
+        home = self.ids.get(home_team)
+        if away is None or home is None:
+            return None
+        value = float(self.lines[home, away])
+        if math.isnan(value):
+            return None
+        return value if neutral else value + self.home_field
+
+    def lines_for(
+        self, games: list[tuple[str, str]], neutral: bool = False
+    ) -> np.ndarray:
+        """
+        Adjusted lines for many (away, home) pairings at once, NaN where unknown.
+
+        :param games: a list of tuples representing matchups
+        :param neutral: leave out the home-field points
+        :return: float64 array aligned with games
+        """
+        unknown = len(self.teams)
+        ids = np.fromiter(
+            (self.ids.get(team, unknown) for game in games for team in game),
+            dtype=np.intp,
+            count=2 * len(games),
+        )
+        away, home = ids[0::2], ids[1::2]
+        known = (away < unknown) & (home < unknown)
+        out = np.full(len(games), np.nan)
+        out[known] = self.lines[home[known], away[known]]
+        return out if neutral else out + self.home_field
+
+    def save(self, path: str) -> None:
+        """
+        Write the matrix to a file load() can memory-map.
+        """
+        header = json.dumps(
+            {
+                "teams": self.teams,
+                "weights": self.weights._asdict(),
+                "policy": self.policy,
+            },
+            separators=(",", ":"),
+        ).encode()
+        data_start = -(-(_preamble.size + len(header)) // ALIGNMENT) * ALIGNMENT
+        lines = np.ascontiguousarray(self.lines, dtype="<f4")
+        complete_start = data_start + -(-lines.nbytes // ALIGNMENT) * ALIGNMENT
+
+        with open(path, "wb") as out:
+            out.write(_preamble.pack(MAGIC, MATRIX_VERSION, len(header)))
+            out.write(header)
+            out.seek(data_start)
+            out.write(lines.tobytes())
+            out.seek(complete_start)
+            out.write(np.ascontiguousarray(self.complete, dtype=np.uint8).tobytes())
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "MatchupMatrix":
+        """
+        Read a matrix written by save().
+
+        :param path: matrix file
+        :param mmap: map the file read-only instead of reading it into memory
+        :return: MatchupMatrix
+        """
+        with open(path, "rb") as f:
+            magic, version, header_length = _preamble.unpack(f.read(_preamble.size))
+            if magic != MAGIC:
+                raise MatrixFileError(f"{path} is not a StatForge matchup matrix")
+            if version != MATRIX_VERSION:
+                raise MatrixFileError(
+                    f"{path} is matrix version {version}, expected {MATRIX_VERSION}"
+                )
+            header = json.loads(f.read(header_length))
+
+        n = len(header["teams"])
+        data_start = -(-(_preamble.size + header_length) // ALIGNMENT) * ALIGNMENT
+        complete_start = data_start + -(-(n * n * 4) // ALIGNMENT) * ALIGNMENT
+        if mmap:
+            buffer = np.memmap(path, dtype=np.uint8, mode="r")
+        else:
+            with open(path, "rb") as f:
+                buffer = np.frombuffer(f.read(), dtype=np.uint8)
+
+        lines = np.ndarray((n, n), dtype="<f4", buffer=buffer, offset=data_start)
+        complete = np.ndarray(
+            (n, n), dtype=np.uint8, buffer=buffer, offset=complete_start
+        ).view(bool)
+        return cls(
+            header["teams"],
+            lines,
+            complete,
+            FactorWeights(**header["weights"]),
+            header["policy"],
+        )
+
+
+def build_matchup_matrix(path: str = matchup_matrix_path) -> MatchupMatrix:
+    """
+    Load the configured season, build its matrix with the fitted weights and save it.
+
+    :param path: destination file
+    :return: the new MatchupMatrix
+    """
+    cache = ResponseCache(offline=cache_offline) if cache_enabled else None
+    loader = DataLoader(make_api_fetcher(cache), None)
+    loader.load()
+    matrix = MatchupMatrix.build(loader.teams, load_factor_weights())
+    matrix.save(path)
+    return matrix
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["build"]:
+        built = build_matchup_matrix()
+        print(f"Saved {len(built)} x {len(built)} matchups to {matchup_matrix_path}")
+        sys.exit()
+
+    if len(sys.argv) not in (3, 4) or sys.argv[3:] not in ([], ["neutral"]):
+        sys.exit(
+            "Usage: python -m src.statforge.matchup_matrix build\n"
+            "       python -m src.statforge.matchup_matrix <away> <home> [neutral]"
+        )
+
+    if os.path.exists(matchup_matrix_path):
+        matrix = MatchupMatrix.load(matchup_matrix_path)
+    else:
+        matrix = build_matchup_matrix()
+    away_team, home_team = sys.argv[1], sys.argv[2]
+    line = matrix.line(away_team, home_team, neutral=len(sys.argv) == 4)
+    if line is None:
+        sys.exit(f"No line for {away_team} vs {home_team}")
+    print(f"{away_team} vs {home_team}: {line:.1f}")
@@ -0,0 +1,218 @@
+"""
+Vectorized matchup engine computing every game-level factor in one pass with NumPy.
+
+Team metrics are laid out in arrays indexed by an integer team id and games become two
+index arrays (away, home), so the SRS line, PPA total factor and both havoc factors are
+whole-array expressions rather than per-game dict building. Games with missing data are
+reported through boolean masks instead of being printed one at a time.
+
+The formulas match the per-game calculators exactly:
+- srs_line = (home_srs + home_field) - away_srs, without home_field at neutral sites
+- ppa_factor = (home_off - away_off) - (home_def - away_def)
+- havoc_top = away_havoc_off - home_havoc_def
+- havoc_bottom = away_havoc_def - home_havoc_off
+"""
+
+import numpy as np
+
+from src.statforge.config import home_field_advantage
+from src.statforge.instrumentation import get_recorder
+from src.statforge.teams import TeamHavocStats, TeamRegistry
+
+HOME_FIELD_ADVANTAGE: float = home_field_advantage
+
+
+class MatchupFactors:
+    """
+    Column-oriented result of MatchupEngine.compute. Every array is aligned with games.
+
+    Attributes:
+        games: the (away, home) matchups the factors belong to
+        away_ids / home_ids: integer team ids for each side
+        srs_line, ppa_factor, havoc_top, havoc_bottom: factor values (NaN when invalid)
+        srs_valid, ppa_valid, havoc_top_valid, havoc_bottom_valid: missing-data masks
+        extra: dict mapping any other registered metric to its (values, valid)
+    """
+
+    __slots__ = (
+        "games",
+        "away_ids",
+        "home_ids",
+        "srs_line",
+        "ppa_factor",
+        "havoc_top",
+        "havoc_bottom",
+        "srs_valid",
+        "ppa_valid",
+        "havoc_top_valid",
+        "havoc_bottom_valid",
+        "extra",
+    )
+
+    def __init__(self, games: list[tuple[str, str]], **columns: np.ndarray) -> None:
+        self.games = games
+        self.extra: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+        for name, column in columns.items():
+            setattr(self, name, column)
+
+    def __len__(self) -> int:
+        return len(self.games)
+
+    def missing(self, factor: str) -> list[tuple[str, str]]:
+        """
+        List the matchups a factor could not be computed for.
+
+        :param factor: one of "srs", "ppa", "havoc_top", "havoc_bottom"
+        :return: list of (away, home) tuples missing that factor
+        """
+        mask: np.ndarray = getattr(self, f"{factor}_valid")
+        return [self.games[i] for i in np.flatnonzero(~mask)]
+
+    def srs_lines(self) -> dict[str, float]:
+        """
+        Same structure as CalculateSRSLine.calculate_odds.
+        """
+        return {
+            f"{self.games[i][0]} vs {self.games[i][1]}": float(self.srs_line[i])
+            for i in np.flatnonzero(self.srs_valid)
+        }
+
+    def ppa_factors(self) -> list[dict[str, float]]:
+        """
+        Same structure as CalculatePPAFactor.calculate_total_factor.
+        """
+        return [
+            {
+                "away_team": self.games[i][0],
+                "home_team": self.games[i][1],
+                "total_factor": float(self.ppa_factor[i]),
+            }
+            for i in np.flatnonzero(self.ppa_valid)
+        ]
+
+    def havoc_top_factors(self) -> list[dict[str, float | str]]:
+        """
+        Same rows as CalculateHavocTop.calculate_total, without the raw inputs.
+        """
+        return [
+            {
+                "away_team": self.games[i][0],
+                "home_team": self.games[i][1],
+                "havoc_factor_top": float(self.havoc_top[i]),
+            }
+            for i in np.flatnonzero(self.havoc_top_valid)
+        ]
+
+    def havoc_bottom_factors(self) -> list[dict[str, float | str]]:
+        """
+        Same rows as CalculateHavocBottom.calculate_total, without the raw inputs.
+        """
+        return [
+            {
+                "away_team": self.games[i][0],
+                "home_team": self.games[i][1],
+                "havoc_factor_bottom": float(self.havoc_bottom[i]),
+            }
+            for i in np.flatnonzero(self.havoc_bottom_valid)
+        ]
+
+
+class MatchupEngine:
+    """
+    Computes factors for any list of games by joining against a TeamRegistry by id.
+
+    Attributes:
+        registry: the TeamRegistry holding every team's metrics
+        home_field: points added to the home side of the SRS line
+    """
+
+    def __init__(
+        self, registry: TeamRegistry, home_field: float = HOME_FIELD_ADVANTAGE
+    ) -> None:
+        """
+        Snapshot the registry's columns for vectorized lookups.
+        :param registry: TeamRegistry filled by DataLoader
+        :param home_field: home-field adjustment applied to the SRS line
+        """
+        self.registry = registry
+        self.home_field = home_field
+
+        # One extra trailing row with no data backs every team the registry doesn't
+        # know, so unknown teams still index cleanly and simply come out invalid.
+        self.srs = np.append(registry.column("srs"), np.nan)
+        self.ppa_offense = np.append(registry.column("ppa_offense"), np.nan)
+        self.ppa_defense = np.append(registry.column("ppa_defense"), np.nan)
+        self.ppa_present = np.append(registry.ppa_present, False)
+        self.havoc_offense = np.append(registry.column("havoc_offense"), np.nan)
+        self.havoc_defense = np.append(registry.column("havoc_defense"), np.nan)
+
+    @classmethod
+    def from_tables(
+        cls,
+        team_srs: dict[str, float],
+        team_ppa: dict[str, dict[str, float]],
+        team_havoc: dict[str, TeamHavocStats],
+        home_field: float = HOME_FIELD_ADVANTAGE,
+    ) -> "MatchupEngine":
+        """
+        Build an engine straight from the name-keyed DataLoader tables.
+        """
+        return cls(TeamRegistry.from_tables(team_srs, team_ppa, team_havoc), home_field)
+
+    def index_games(
+        self, games: list[tuple[str, str]]
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Convert (away, home) name tuples into two aligned team id arrays.
+
+        :param games: a list of tuples representing matchups
+        :return: (away_ids, home_ids)
+        """
+        unknown = len(self.registry)
+        ids = np.fromiter(
+            (self.registry.ids.get(team, unknown) for game in games for team in game),
+            dtype=np.int32,
+            count=2 * len(games),
+        )
+        return ids[0::2], ids[1::2]
+
+    def compute(
+        self, games: list[tuple[str, str]], neutral: np.ndarray | None = None
+    ) -> MatchupFactors:
+        """
+        Compute the SRS line, PPA total factor and both havoc factors for every game.
+
+        :param games: a list of tuples representing matchups
+        :param neutral: per game, whether it is played at a neutral site and so gets no
+            home field; None treats every game as a home game, as the (away, home)
+            schedule tuples carry no site
+        :return: MatchupFactors with one entry per game
+        """
+        recorder = get_recorder()
+        with recorder.stage("engine.compute"):
+            away, home = self.index_games(games)
+
+            home_field = self.home_field
+            if neutral is not None:
+                home_field = np.where(neutral, 0.0, home_field)
+            srs_line = (self.srs[home] + home_field) - self.srs[away]
+            ppa_factor = (self.ppa_offense[home] - self.ppa_offense[away]) - (
+                self.ppa_defense[home] - self.ppa_defense[away]
+            )
+            havoc_top = self.havoc_offense[away] - self.havoc_defense[home]
+            havoc_bottom = self.havoc_defense[away] - self.havoc_offense[home]
+        recorder.add_rows("engine.compute", len(games))
+
+        return MatchupFactors(
+            games,
+            away_ids=away,
+            home_ids=home,
+            srs_line=srs_line,
+            ppa_factor=ppa_factor,
+            havoc_top=havoc_top,
+            havoc_bottom=havoc_bottom,
+            srs_valid=~np.isnan(srs_line),
+            ppa_valid=self.ppa_present[away] & self.ppa_present[home],
+            havoc_top_valid=~np.isnan(havoc_top),
+            havoc_bottom_valid=~np.isnan(havoc_bottom),
+        )
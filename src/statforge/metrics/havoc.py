@@ -9,10 +9,9 @@ These two lists can later be merged with SRS/PPA when building an adjusted line.
 
 from typing import TypedDict
 
-
-class TeamHavocStats(TypedDict):
-    offense: float | None
-    defense: float | None
+from src.statforge.instrumentation import timed
+from src.statforge.teams import TeamHavocStats
+from src.statforge.writers import MissingDataReport
 
 
 class HavocGameTop(TypedDict):
@@ -36,9 +35,17 @@ class CalculateHavocTop:
     Away offense vs. home defense
     """
 
-    def __init__(self, games, team_havoc) -> None:
+    def __init__(
+        self, games, team_havoc, report: MissingDataReport | None = None
+    ) -> None:
         self.games = games
         self.team_havoc = team_havoc
+        # Games without havoc data are skipped, and recorded here if given
+        self.report = report
+
+    def _missing(self, away_team: str, home_team: str) -> None:
+        if self.report is not None:
+            self.report.add("havoc_top", away_team, home_team)
 
     def build_game_data(self) -> list[dict[str, float | str]]:
         rows: list[dict[str, float | str]] = []
@@ -47,11 +54,13 @@ class CalculateHavocTop:
             away = self.team_havoc.get(away_team)
             home = self.team_havoc.get(home_team)
             if not away or not home:
+                self._missing(away_team, home_team)
                 continue
 
             away_off = away.get("offense")
             home_def = home.get("defense")
             if away_off is None or home_def is None:
+                self._missing(away_team, home_team)
                 continue
 
             rows.append(
@@ -65,6 +74,7 @@ class CalculateHavocTop:
 
         return rows
 
+    @timed("havoc_top.calculate_total")
     def calculate_total(self) -> list[dict[str, float | str]]:
         game_data = self.build_game_data()
         out: list[dict[str, float | str]] = []
@@ -119,9 +129,17 @@ class CalculateHavocBottom:
     Home offense vs. away defense
     """
 
-    def __init__(self, games, team_havoc) -> None:
+    def __init__(
+        self, games, team_havoc, report: MissingDataReport | None = None
+    ) -> None:
         self.games = games
         self.team_havoc = team_havoc
+        # Games without havoc data are skipped, and recorded here if given
+        self.report = report
+
+    def _missing(self, away_team: str, home_team: str) -> None:
+        if self.report is not None:
+            self.report.add("havoc_bottom", away_team, home_team)
 
     def build_game_data(self) -> list[dict[str, float | str]]:
         rows: list[dict[str, float | str]] = []
@@ -130,11 +148,13 @@ class CalculateHavocBottom:
             away = self.team_havoc.get(away_team)
             home = self.team_havoc.get(home_team)
             if not away or not home:
+                self._missing(away_team, home_team)
                 continue
 
             home_off = home.get("offense")
             away_def = away.get("defense")
             if home_off is None or away_def is None:
+                self._missing(away_team, home_team)
                 continue
 
             rows.append(
@@ -148,6 +168,7 @@ class CalculateHavocBottom:
 
         return rows
 
+    @timed("havoc_bottom.calculate_total")
     def calculate_total(self) -> list[dict[str, float | str]]:
         game_data = self.build_game_data()
         out: list[dict[str, float | str]] = []
@@ -8,6 +8,9 @@ This module defines the CalculatePPAFactor class, which computes the PPA factors
 (offensive, defensive, total) used in the calculation of total influence.
 """
 
+from src.statforge.instrumentation import timed
+from src.statforge.writers import MissingDataReport
+
 
 class CalculatePPAFactor:
     """
@@ -16,19 +19,25 @@ class CalculatePPAFactor:
     Attributes:
         games: A list of game tuples for the given week
         team_ppa: Cached dict to map teams to their offensive and defensive PPA metrics
+        report: MissingDataReport collecting games without PPA, None to print them
     """
 
     def __init__(
-        self, games: list[tuple], team_ppa: dict[str, dict[str, float]]
+        self,
+        games: list[tuple],
+        team_ppa: dict[str, dict[str, float]],
+        report: MissingDataReport | None = None,
     ) -> None:
         """
         Initialize the calculator with a list of games and a dict mapping teams to
         PPA values
         :param games: a list of tuples containing matchups
         :param team_ppa: a dict mapping teams to PPA values
+        :param report: optional MissingDataReport to record missing games in
         """
         self.games = games
         self.team_ppa = team_ppa
+        self.report = report
 
     def build_game_data(self) -> list[dict[str, float]]:
         """
@@ -64,6 +73,8 @@ class CalculatePPAFactor:
                 }
 
                 game_ppa_list.append(game_dict)
+            elif self.report is not None:
+                self.report.add("ppa", away_team, home_team)
             else:
                 print(
                     f"PPA data not available for the following teams: "
@@ -72,7 +83,9 @@ class CalculatePPAFactor:
 
         return game_ppa_list
 
-    def calculate_offense_factors(self) -> list[dict[str, float]]:
+    def calculate_offense_factors(
+        self, game_data: list[dict[str, float]] | None = None
+    ) -> list[dict[str, float]]:
         """
         Function to calculate total offensive PPA factor per game, and map each game to
         the calculated factor. Each matchup is represented as:
@@ -82,9 +95,11 @@ class CalculatePPAFactor:
                 "offensive_factor": <float>
             }
 
+        :param game_data: output of build_game_data, built here if not given
         :return: a list of dictionaries containing PPA offensive factors per game
         """
-        game_data: list[dict[str, float]] = self.build_game_data()
+        if game_data is None:
+            game_data = self.build_game_data()
         offense_factors: list[dict[str, float]] = []
 
         for game in game_data:
@@ -104,7 +119,9 @@ class CalculatePPAFactor:
 
         return offense_factors
 
-    def calculate_defense_factors(self) -> list[dict[str, float]]:
+    def calculate_defense_factors(
+        self, game_data: list[dict[str, float]] | None = None
+    ) -> list[dict[str, float]]:
         """
         Function to calculate total defensive PPA factor per game, and map each game to
         the calculated factor. Each matchup is represented as:
@@ -114,10 +131,11 @@ class CalculatePPAFactor:
                 "defensive_factor": <float>
             }
 
+        :param game_data: output of build_game_data, built here if not given
         :return: a list of dictionaries containing PPA defensive factors per game
         """
-
-        game_data: list[dict[str, float]] = self.build_game_data()
+        if game_data is None:
+            game_data = self.build_game_data()
         defense_factors: list[dict[str, float]] = []
 
         for game in game_data:
@@ -137,6 +155,7 @@ class CalculatePPAFactor:
 
         return defense_factors
 
+    @timed("ppa.calculate_total_factor")
     def calculate_total_factor(self, week: int) -> list[dict[str, float]]:
         """
         Function to combine both offensive and defensive PPA factors into a single dict.
@@ -153,8 +172,10 @@ class CalculatePPAFactor:
         :param week: week to calculate for
         :return: a list of dictionaries containing PPA total factors per game
         """
-        offense_factors: list[dict[str, float]] = self.calculate_offense_factors()
-        defense_factors: list[dict[str, float]] = self.calculate_defense_factors()
+        # Built once so each missing team is reported once, not once per side
+        game_data: list[dict[str, float]] = self.build_game_data()
+        offense_factors = self.calculate_offense_factors(game_data)
+        defense_factors = self.calculate_defense_factors(game_data)
         total_factors: list[dict[str, float]] = []
 
         for i in range(min(len(offense_factors), len(defense_factors))):
@@ -0,0 +1,205 @@
+"""
+Registry of the metrics that make up an adjusted line, and a planner over them.
+
+Each metric declares the DataLoader sources it reads ("srs", "ppa", "havoc"), the
+metrics it depends on, and a function computing its per-game factor from a
+MatchupEngine. plan() resolves a selection of metrics into the dependency closure, the
+set of sources to fetch, and topological levels; metrics in the same level don't depend
+on each other and compute_metrics runs them concurrently on large inputs. A run that
+only asks for SRS lines fetches only the schedule and SRS, and a newly registered metric
+costs nothing for runs that don't select it.
+
+SRS is the base of every line, so it is part of every plan.
+
+    register(Metric("my_factor", ("ppa",), my_factor))
+    metric_plan = plan(["srs", "my_factor"])
+    loader.load(sources=metric_plan.sources)
+    factors = compute_metrics(MatchupEngine(loader.teams), games, metric_plan)
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, NamedTuple
+
+import numpy as np
+
+from src.statforge.instrumentation import get_recorder
+from src.statforge.metrics.engine import MatchupEngine, MatchupFactors
+
+# factor(engine, away_ids, home_ids, inputs) -> (values, valid); inputs maps each
+# required metric to its own (values, valid).
+FactorFunction = Callable[
+    [
+        MatchupEngine,
+        np.ndarray,
+        np.ndarray,
+        dict[str, tuple[np.ndarray, np.ndarray]],
+    ],
+    tuple[np.ndarray, np.ndarray],
+]
+
+# Levels with at least this many games are computed on threads; below it the pool
+# costs more than NumPy saves by releasing the GIL.
+PARALLEL_MIN_GAMES: int = 100_000
+
+
+class Metric(NamedTuple):
+    name: str
+    sources: tuple[str, ...]
+    compute: FactorFunction
+    requires: tuple[str, ...] = ()
+
+
+class MetricPlan(NamedTuple):
+    metrics: tuple[str, ...]
+    sources: frozenset[str]
+    levels: tuple[tuple[str, ...], ...]
+
+
+_metrics: dict[str, Metric] = {}
+
+# Built-in metrics -> the MatchupFactors columns they fill. Any other metric ends up in
+# MatchupFactors.extra.
+_builtin_columns: dict[str, tuple[str, str]] = {
+    "srs": ("srs_line", "srs_valid"),
+    "ppa": ("ppa_factor", "ppa_valid"),
+    "havoc_top": ("havoc_top", "havoc_top_valid"),
+    "havoc_bottom": ("havoc_bottom", "havoc_bottom_valid"),
+}
+
+
+def register(metric: Metric) -> Metric:
+    """
+    Add a metric to the registry.
+
+    :param metric: the Metric declaration
+    :return: the same metric
+    """
+    if metric.name in _metrics:
+        raise ValueError(f"Metric {metric.name} is already registered")
+    _metrics[metric.name] = metric
+    return metric
+
+
+def available_metrics() -> list[str]:
+    return list(_metrics)
+
+
+def plan(selected: Iterable[str] | None = None) -> MetricPlan:
+    """
+    Resolve selected metrics into everything needed to compute them.
+
+    :param selected: metric names, None for every registered metric
+    :return: MetricPlan with the dependency closure, sources to fetch and
+        topological levels
+    """
+    wanted = ["srs", *(available_metrics() if selected is None else selected)]
+
+    closure: dict[str, Metric] = {}
+    visiting: set[str] = set()
+
+    def visit(name: str) -> None:
+        if name in closure:
+            return
+        if name in visiting:
+            raise ValueError(f"Metric dependency cycle through {name}")
+        metric = _metrics.get(name)
+        if metric is None:
+            raise ValueError(f"Unknown metric: {name}")
+        visiting.add(name)
+        for dependency in metric.requires:
+            visit(dependency)
+        visiting.discard(name)
+        closure[name] = metric
+
+    for name in wanted:
+        visit(name)
+
+    levels: list[tuple[str, ...]] = []
+    done: set[str] = set()
+    while len(done) < len(closure):
+        level = tuple(
+            name
+            for name, metric in closure.items()
+            if name not in done and all(d in done for d in metric.requires)
+        )
+        levels.append(level)
+        done.update(level)
+
+    return MetricPlan(
+        tuple(closure),
+        frozenset(source for m in closure.values() for source in m.sources),
+        tuple(levels),
+    )
+
+
+def compute_metrics(
+    engine: MatchupEngine, games: list[tuple[str, str]], metric_plan: MetricPlan
+) -> MatchupFactors:
+    """
+    Compute the planned metrics for every game.
+
+    Built-in factors that aren't planned are left NaN but flagged valid, so they don't
+    drop games under any missing-data policy and add nothing to the adjusted line.
+
+    :param engine: MatchupEngine over the loaded team metrics
+    :param games: a list of tuples representing matchups
+    :param metric_plan: plan from plan()
+    :return: MatchupFactors, with non-built-in metrics in .extra
+    """
+    recorder = get_recorder()
+    with recorder.stage("metrics.compute"):
+        away, home = engine.index_games(games)
+        results: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+
+        def run(name: str) -> tuple[np.ndarray, np.ndarray]:
+            metric = _metrics[name]
+            inputs = {dependency: results[dependency] for dependency in metric.requires}
+            with recorder.stage(f"metric.{name}"):
+                return metric.compute(engine, away, home, inputs)
+
+        for level in metric_plan.levels:
+            if len(level) > 1 and len(games) >= PARALLEL_MIN_GAMES:
+                with ThreadPoolExecutor(max_workers=len(level)) as pool:
+                    results.update(zip(level, pool.map(run, level)))
+            else:
+                results.update((name, run(name)) for name in level)
+    recorder.add_rows("metrics.compute", len(games))
+
+    not_planned = (np.full(len(games), np.nan), np.ones(len(games), dtype=bool))
+    columns: dict[str, np.ndarray] = {}
+    for name, (column, mask) in _builtin_columns.items():
+        columns[column], columns[mask] = results.get(name, not_planned)
+
+    factors = MatchupFactors(games, away_ids=away, home_ids=home, **columns)
+    factors.extra = {
+        name: result for name, result in results.items() if name not in _builtin_columns
+    }
+    return factors
+
+
+def _srs_line(engine, away, home, inputs):
+    values = (engine.srs[home] + engine.home_field) - engine.srs[away]
+    return values, ~np.isnan(values)
+
+
+def _ppa_factor(engine, away, home, inputs):
+    values = (engine.ppa_offense[home] - engine.ppa_offense[away]) - (
+        engine.ppa_defense[home] - engine.ppa_defense[away]
+    )
+    return values, engine.ppa_present[away] & engine.ppa_present[home]
+
+
+def _havoc_top(engine, away, home, inputs):
+    values = engine.havoc_offense[away] - engine.havoc_defense[home]
+    return values, ~np.isnan(values)
+
+
+def _havoc_bottom(engine, away, home, inputs):
+    values = engine.havoc_defense[away] - engine.havoc_offense[home]
+    return values, ~np.isnan(values)
+
+
+register(Metric("srs", ("srs",), _srs_line))
+register(Metric("ppa", ("ppa",), _ppa_factor))
+register(Metric("havoc_top", ("havoc",), _havoc_top))
+register(Metric("havoc_bottom", ("havoc",), _havoc_bottom))
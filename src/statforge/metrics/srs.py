@@ -9,17 +9,24 @@ This module defines the CalculateSRSLine class, which calculates matchup-level o
 each individual FBS game.
 """
 
+import sys
+
+from src.statforge.config import home_field_advantage
+from src.statforge.instrumentation import timed
+from src.statforge.writers import MissingDataReport
+
 
 def print_odds(odds: dict[str, float]) -> None:
     """
-    Print each game and its calculated SRS odds in a readable format. Temporary before
-    eventual move to logging.
+    Print each game and its calculated SRS odds in a readable format, in a single
+    write. Temporary before eventual move to logging.
 
     :param odds: dict mapping "away_team vs home_team" to predicted point spread
     """
-    for game, calculated_odds in odds.items():
-        formatted_odds = "{}, {:.1f}".format(game, calculated_odds)
-        print(formatted_odds)
+    if odds:
+        sys.stdout.write(
+            "".join(f"{game}, {value:.1f}\n" for game, value in odds.items())
+        )
 
 
 class CalculateSRSLine:
@@ -29,26 +36,38 @@ class CalculateSRSLine:
     Attributes:
         games: a list of game tuples representing matchups
         team_srs: a dict mapping teams to SRS ratings
+        report: MissingDataReport collecting games without SRS, None to print them
+        home_field: points added to the home team, e.g. FactorWeights.home_field
     """
 
     def __init__(
-        self, games: list[tuple[str, str]], team_srs: dict[str, float]
+        self,
+        games: list[tuple[str, str]],
+        team_srs: dict[str, float],
+        report: MissingDataReport | None = None,
+        home_field: float = home_field_advantage,
     ) -> None:
         """
         Initialize the class with a data fetcher.
         :param games: a list of tuples representing matchups
         :param team_srs: a dict mapping teams to SRS ratings
+        :param report: optional MissingDataReport to record missing games in
+        :param home_field: home-field adjustment, defaults to config's
         """
         self.games = games
         self.team_srs = team_srs
+        self.report = report
+        self.home_field = home_field
 
+    @timed("srs.calculate_odds")
     def calculate_odds(self) -> dict[str, float]:
         """
         Function to calculate SRS odds per game. Computes the predicted point
         differential between teams based on their SRS ratings.
 
-        A 2.5-point home-field adjustment is applied to the home team before calculating
-        the spread.
+        The home-field adjustment (config's 2.5 points unless given, e.g. the fitted
+        FactorWeights.home_field) is applied to the home team before calculating the
+        spread.
 
         Output structure:
             {
@@ -65,8 +84,10 @@ class CalculateSRSLine:
             away_srs: float = self.team_srs.get(away_team)
             home_srs: float = self.team_srs.get(home_team)
             if home_srs is not None and away_srs is not None:
-                calculated_odds: float = (home_srs + 2.5) - away_srs
+                calculated_odds: float = (home_srs + self.home_field) - away_srs
                 odds[f"{away_team} vs {home_team}"] = calculated_odds
+            elif self.report is not None:
+                self.report.add("srs", away_team, home_team)
             else:
                 print(f"Invalid SRS values for {away_team} vs {home_team}")
 
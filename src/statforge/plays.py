@@ -0,0 +1,363 @@
+"""
+Streaming play-by-play ingestion for PPA and havoc computed under our own rules.
+
+The season-level PPA and advanced-stats endpoints bake in CFBD's garbage-time filter
+and have no date cutoff or opponent adjustment. Here plays flow through a generator
+pipeline instead:
+
+    source (API week by week, JSON lines or CSV) -> filters -> PlayAggregator
+
+and the aggregator keeps a fixed set of running totals per team plus play counts per
+(offense, defense) pairing, so memory grows with the number of teams and matchups,
+never with the number of plays. Only one API page (a week of plays) is held at a time.
+
+The results have the same shapes as DataLoader.ppa_by_team and DataLoader.havoc_by_team.
+
+Havoc is the share of scrimmage plays ending in a tackle for loss, sack, interception
+or fumble. Play-by-play has no passes-defensed marker, so it runs slightly below CFBD's
+havoc rate, which also counts breakups.
+"""
+
+import csv
+import json
+
+from typing import Any, Iterable, Iterator, NamedTuple
+
+from src.statforge.config import year
+from src.statforge.instrumentation import get_recorder
+from src.statforge.teams import TeamHavocStats
+
+# Scoreboard margin above which a play is garbage time, by quarter. Matches the
+# margins CFBD uses for exclude_garbage_time.
+garbage_time_margins: dict[int, int] = {2: 38, 3: 28, 4: 22}
+
+# Play types that are not plays from scrimmage.
+non_scrimmage_play_types: frozenset[str] = frozenset(
+    {
+        "Kickoff",
+        "Kickoff Return (Offense)",
+        "Kickoff Return Touchdown",
+        "Punt",
+        "Punt Return Touchdown",
+        "Blocked Punt",
+        "Blocked Punt Touchdown",
+        "Field Goal Good",
+        "Field Goal Missed",
+        "Blocked Field Goal",
+        "Blocked Field Goal Touchdown",
+        "Missed Field Goal Return",
+        "Missed Field Goal Return Touchdown",
+        "Extra Point Good",
+        "Extra Point Missed",
+        "Two Point Pass",
+        "Two Point Rush",
+        "Defensive 2pt Conversion",
+        "Timeout",
+        "End Period",
+        "End of Half",
+        "End of Game",
+        "End of Regulation",
+        "Penalty",
+        "Uncategorized",
+        "placeholder",
+    }
+)
+
+havoc_play_types: frozenset[str] = frozenset(
+    {
+        "Sack",
+        "Interception",
+        "Pass Interception Return",
+        "Interception Return Touchdown",
+        "Fumble Recovery (Opponent)",
+        "Fumble Recovery (Own)",
+        "Fumble Return Touchdown",
+        "Safety",
+    }
+)
+
+
+class PlayRecord(NamedTuple):
+    week: int | None
+    offense: str
+    defense: str
+    period: int
+    offense_score: int
+    defense_score: int
+    play_type: str
+    yards_gained: int
+    ppa: float | None
+
+
+def _record(row: Any, week: int | None) -> PlayRecord:
+    # Accepts cfbd Play models, fake rows and dump rows in snake_case or camelCase.
+    values = row if isinstance(row, dict) else vars(row)
+
+    def field(*names: str) -> Any:
+        for name in names:
+            value = values.get(name)
+            if value is not None and value != "":
+                return value
+        return None
+
+    ppa = field("ppa")
+    row_week = field("week")
+    return PlayRecord(
+        int(row_week) if row_week is not None else week,
+        field("offense"),
+        field("defense"),
+        int(field("period") or 0),
+        int(field("offense_score", "offenseScore") or 0),
+        int(field("defense_score", "defenseScore") or 0),
+        field("play_type", "playType") or "",
+        int(field("yards_gained", "yardsGained") or 0),
+        float(ppa) if ppa is not None else None,
+    )
+
+
+def api_plays(
+    api_fetcher: Any, weeks: Iterable[int], season: int = year
+) -> Iterator[PlayRecord]:
+    """
+    Stream a season's plays from the API one week (one response) at a time.
+
+    :param api_fetcher: fetcher exposing plays_api
+    :param weeks: weeks to fetch, in order
+    :param season: season year
+    :return: generator of PlayRecord
+    """
+    recorder = get_recorder()
+    for week in weeks:
+        with recorder.stage("plays.fetch"):
+            page = api_fetcher.plays_api.get_plays(year=season, week=week)
+        recorder.add_rows("plays.fetch", len(page))
+        for row in page:
+            yield _record(row, week)
+        del page
+
+
+def jsonl_plays(path: str) -> Iterator[PlayRecord]:
+    """
+    Stream plays from a JSON-lines dump, one play object per line. Keys may be
+    snake_case or the API's camelCase; an optional "week" key enables week cutoffs.
+    """
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                yield _record(json.loads(line), None)
+
+
+def csv_plays(path: str) -> Iterator[PlayRecord]:
+    """
+    Stream plays from a CSV dump with a header row, using the same column names as
+    jsonl_plays.
+    """
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            yield _record(row, None)
+
+
+def is_garbage_time(play: PlayRecord) -> bool:
+    margin = garbage_time_margins.get(play.period)
+    return margin is not None and abs(play.offense_score - play.defense_score) > margin
+
+
+def scrimmage_plays(
+    plays: Iterable[PlayRecord],
+    through_week: int | None = None,
+    exclude_garbage_time: bool = True,
+) -> Iterator[PlayRecord]:
+    """
+    Keep plays from scrimmage, optionally up to a week and outside garbage time.
+
+    :param plays: any play source
+    :param through_week: drop plays from later weeks; plays without a week are kept
+    :param exclude_garbage_time: drop plays in garbage time
+    :return: generator of the kept plays
+    """
+    for play in plays:
+        if not play.offense or not play.defense:
+            continue
+        if play.play_type in non_scrimmage_play_types:
+            continue
+        if through_week is not None and play.week is not None:
+            if play.week > through_week:
+                continue
+        if exclude_garbage_time and is_garbage_time(play):
+            continue
+        yield play
+
+
+def is_havoc(play: PlayRecord) -> bool:
+    if play.play_type in havoc_play_types:
+        return True
+    # Tackle for loss
+    return play.play_type.startswith("Rush") and play.yards_gained < 0
+
+
+class _TeamTotals:
+    __slots__ = (
+        "offense_ppa",
+        "offense_ppa_plays",
+        "offense_havoc",
+        "offense_plays",
+        "defense_ppa",
+        "defense_ppa_plays",
+        "defense_havoc",
+        "defense_plays",
+    )
+
+    def __init__(self) -> None:
+        self.offense_ppa = 0.0
+        self.offense_ppa_plays = 0
+        self.offense_havoc = 0
+        self.offense_plays = 0
+        self.defense_ppa = 0.0
+        self.defense_ppa_plays = 0
+        self.defense_havoc = 0
+        self.defense_plays = 0
+
+
+class PlayAggregator:
+    """
+    Running per-team PPA and havoc totals fed from a play stream.
+
+    Attributes:
+        totals: dict mapping each team to its running totals
+        pairings: PPA play counts per (offense, defense) pairing, for opponent
+            adjustment
+        plays: number of plays consumed
+    """
+
+    def __init__(self) -> None:
+        self.totals: dict[str, _TeamTotals] = {}
+        self.pairings: dict[tuple[str, str], int] = {}
+        self.plays = 0
+
+    def _team(self, team: str) -> _TeamTotals:
+        totals = self.totals.get(team)
+        if totals is None:
+            totals = self.totals[team] = _TeamTotals()
+        return totals
+
+    def consume(self, plays: Iterable[PlayRecord]) -> "PlayAggregator":
+        """
+        Fold plays into the running totals. Can be called repeatedly, e.g. once per
+        week or per dump file.
+
+        :param plays: filtered play stream, see scrimmage_plays
+        :return: self
+        """
+        count = 0
+        with get_recorder().stage("plays.aggregate"):
+            for play in plays:
+                count += 1
+                offense = self._team(play.offense)
+                defense = self._team(play.defense)
+                offense.offense_plays += 1
+                defense.defense_plays += 1
+
+                if is_havoc(play):
+                    offense.offense_havoc += 1
+                    defense.defense_havoc += 1
+
+                if play.ppa is not None:
+                    offense.offense_ppa += play.ppa
+                    offense.offense_ppa_plays += 1
+                    defense.defense_ppa += play.ppa
+                    defense.defense_ppa_plays += 1
+                    key = (play.offense, play.defense)
+                    self.pairings[key] = self.pairings.get(key, 0) + 1
+
+        self.plays += count
+        get_recorder().add_rows("plays.aggregate", count)
+        return self
+
+    def ppa_by_team(self, opponent_adjust: bool = False) -> dict[str, dict[str, float]]:
+        """
+        PPA per play, in the shape of DataLoader.ppa_by_team.
+
+        :param opponent_adjust: shift each side by how far its opponents' opposite
+            side was from the league average, weighted by plays against each
+        :return: dict mapping team to {"offense": ..., "defense": ...}
+        """
+        raw: dict[str, dict[str, float]] = {}
+        for team, totals in self.totals.items():
+            raw[team] = {}
+            if totals.offense_ppa_plays:
+                raw[team]["offense"] = totals.offense_ppa / totals.offense_ppa_plays
+            if totals.defense_ppa_plays:
+                raw[team]["defense"] = totals.defense_ppa / totals.defense_ppa_plays
+
+        if not opponent_adjust:
+            return raw
+
+        plays = sum(self.pairings.values())
+        if not plays:
+            return raw
+        league = sum(t.offense_ppa for t in self.totals.values()) / plays
+
+        # sum over opponents of plays * (opponent's side - league average)
+        offense_shift: dict[str, float] = {}
+        defense_shift: dict[str, float] = {}
+        for (offense, defense), count in self.pairings.items():
+            opponent_defense = raw[defense].get("defense", league) - league
+            opponent_offense = raw[offense].get("offense", league) - league
+            offense_shift[offense] = offense_shift.get(offense, 0.0) + (
+                count * opponent_defense
+            )
+            defense_shift[defense] = defense_shift.get(defense, 0.0) + (
+                count * opponent_offense
+            )
+
+        adjusted: dict[str, dict[str, float]] = {}
+        for team, sides in raw.items():
+            totals = self.totals[team]
+            adjusted[team] = {}
+            if "offense" in sides:
+                adjusted[team]["offense"] = sides["offense"] - (
+                    offense_shift.get(team, 0.0) / totals.offense_ppa_plays
+                )
+            if "defense" in sides:
+                adjusted[team]["defense"] = sides["defense"] - (
+                    defense_shift.get(team, 0.0) / totals.defense_ppa_plays
+                )
+        return adjusted
+
+    def havoc_by_team(self) -> dict[str, TeamHavocStats]:
+        """
+        Havoc rate per scrimmage play, in the shape of DataLoader.havoc_by_team.
+        """
+        return {
+            team: {
+                "offense": (
+                    totals.offense_havoc / totals.offense_plays
+                    if totals.offense_plays
+                    else None
+                ),
+                "defense": (
+                    totals.defense_havoc / totals.defense_plays
+                    if totals.defense_plays
+                    else None
+                ),
+            }
+            for team, totals in self.totals.items()
+        }
+
+
+def aggregate_plays(
+    plays: Iterable[PlayRecord],
+    through_week: int | None = None,
+    exclude_garbage_time: bool = True,
+) -> PlayAggregator:
+    """
+    Filter a play stream and aggregate it in one pass.
+
+    :param plays: any play source, e.g. api_plays(...) or jsonl_plays(path)
+    :param through_week: ignore plays after this week
+    :param exclude_garbage_time: drop plays in garbage time
+    :return: PlayAggregator holding the totals
+    """
+    return PlayAggregator().consume(
+        scrimmage_plays(plays, through_week, exclude_garbage_time)
+    )
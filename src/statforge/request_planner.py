@@ -0,0 +1,85 @@
+"""
+Request planning: collapse per-conference API fan-out into season-wide bulk calls.
+
+The SRS and PPA endpoints both accept a conference filter but don't need one, so a
+single season-wide call returns every conference at once and the rows are filtered
+locally, as the havoc call always has been. The per-conference split is kept only as a
+fallback, used when the bulk call fails or comes back suspiciously large (possibly
+truncated), so one bad conference still can't take the others down with it.
+
+conference_codes is the one mapping between the full conference names most endpoints
+use and the abbreviations the SRS endpoint filters on.
+"""
+
+from typing import Any, Callable, Iterable
+
+from src.statforge.config import bulk_truncation_rows
+from src.statforge.instrumentation import get_recorder
+
+# Full FBS conference name -> SRS endpoint abbreviation.
+conference_codes: dict[str, str] = {
+    "FBS Independents": "Ind",
+    "American Athletic": "AAC",
+    "ACC": "acc",
+    "Big 12": "B12",
+    "Big Ten": "B1G",
+    "Conference USA": "CUSA",
+    "Mid-American": "MAC",
+    "Mountain West": "MWC",
+    "Pac-12": "PAC",
+    "SEC": "SEC",
+    "Sun Belt": "SBC",
+}
+
+
+def in_conferences(row: Any) -> bool:
+    return row.conference in conference_codes
+
+
+def bulk_call(
+    name: str,
+    bulk: Callable[[], list],
+    parts: Iterable[tuple[str, Callable[[], list]]],
+    keep: Callable[[Any], bool] = in_conferences,
+    truncation_rows: int = bulk_truncation_rows,
+) -> Callable[[], list]:
+    """
+    Wrap a season-wide request with a local filter and a split fallback.
+
+    :param name: request name for log lines and counters, e.g. "srs"
+    :param bulk: zero-argument callable making the season-wide request
+    :param parts: (part name, callable) pairs whose rows together cover the same data,
+        e.g. one per conference
+    :param keep: filter applied to bulk rows, defaults to FBS conferences only
+    :param truncation_rows: a bulk response with at least this many rows is treated as
+        truncated
+    :return: zero-argument callable returning the rows
+    """
+    parts = list(parts)
+
+    def call() -> list:
+        recorder = get_recorder()
+        try:
+            rows = bulk()
+        except Exception as e:
+            reason = f"failed ({e})"
+        else:
+            if len(rows) < truncation_rows:
+                return [row for row in rows if keep(row)]
+            reason = f"returned {len(rows)} rows and may be truncated"
+
+        recorder.count(f"planner.fallback:{name}")
+        print(f"Bulk {name} request {reason}, splitting by conference")
+        out: list = []
+        error: Exception | None = None
+        for part, fetch in parts:
+            try:
+                out.extend(fetch())
+            except Exception as e:
+                error = e
+                print(f"Error fetching {name} data for {part}: {e}")
+        if error is not None and not out:
+            raise error
+        return out
+
+    return call
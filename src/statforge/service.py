@@ -0,0 +1,354 @@
+"""
+Long-running HTTP service serving precomputed adjusted lines.
+
+The season is loaded once through DataLoader and every week's lines are computed and
+serialized up front, so a request is a dict lookup plus a write of ready-made JSON
+bytes. A background thread reloads the data on an interval, through a response cache
+whose entries expire after that interval, so each reload sees new results. Only weeks
+whose games involve a team with changed metrics are recomputed (see incremental.py),
+and the new state replaces the old one in a single reference swap, so readers never
+lock and never see a half-built table. Every response carries an ETag of the data
+version, so a client can skip unchanged bodies with If-None-Match.
+
+Endpoints:
+    GET  /lines?week=N                   every line for week N
+    GET  /matchup?away=A&home=H[&week=N] one matchup, the latest week unless given
+    GET  /pair?away=A&home=H[&neutral=1] any pairing, scheduled or not, from the
+                                         all-pairs matrix (see matchup_matrix.py)
+    POST /matchups                       {"games": [[away, home], ...]} -> lines
+    GET  /health                         data version and load time
+
+Usage:
+    python -m src.statforge.service
+    python -m src.statforge.service 8080
+"""
+
+import json
+import math
+import sys
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+from src.statforge.cache import ResponseCache
+from src.statforge.combine import (
+    AdjustedLines,
+    FactorWeights,
+    MissingPolicy,
+    load_factor_weights,
+)
+from src.statforge.config import (
+    cache_enabled,
+    cache_offline,
+    missing_policy,
+    service_host,
+    service_port,
+    service_refresh_seconds,
+    year,
+)
+from src.statforge.data_loader import APIDataFetcher, DataLoader, make_api_fetcher
+from src.statforge.history import MetricHistory, open_history
+from src.statforge.incremental import IncrementalLines
+from src.statforge.instrumentation import get_recorder
+from src.statforge.matchup_matrix import MatchupMatrix
+
+# Largest POST /matchups body accepted, in bytes.
+MAX_BODY_BYTES: int = 1024 * 1024
+
+
+def _line_rows(week: int, lines: AdjustedLines) -> list[dict[str, Any]]:
+    rows = []
+    for line in lines:
+        row: dict[str, Any] = {"week": week, **line._asdict()}
+        for key, value in row.items():
+            # JSON has no NaN; "partial" rows keep missing factors as NaN
+            if isinstance(value, float) and math.isnan(value):
+                row[key] = None
+        rows.append(row)
+    return rows
+
+
+def _dumps(value: Any) -> bytes:
+    return json.dumps(value, separators=(",", ":")).encode()
+
+
+class ServiceState:
+    """
+    One immutable, fully serialized version of the served data.
+
+    Attributes:
+        version: increases by one on every refresh that changed something
+        loaded_at: unix time of the load this state was built from
+        weeks: dict mapping week to its response body
+        matchups: dict mapping (away, home) to that matchup's rows, oldest week first
+        matrix: MatchupMatrix over every loaded team, or None before the first load
+    """
+
+    __slots__ = ("version", "loaded_at", "weeks", "matchups", "matrix", "etag")
+
+    def __init__(
+        self,
+        version: int,
+        loaded_at: float,
+        weeks: dict[int, bytes],
+        matchups: dict[tuple[str, str], list[dict[str, Any]]],
+        matrix: MatchupMatrix | None = None,
+    ) -> None:
+        self.version = version
+        self.loaded_at = loaded_at
+        self.weeks = weeks
+        self.matchups = matchups
+        self.matrix = matrix
+        self.etag = f'"{version}"'
+
+    def matchup(
+        self, away_team: str, home_team: str, week: int | None = None
+    ) -> dict[str, Any] | None:
+        rows = self.matchups.get((away_team, home_team))
+        if not rows:
+            return None
+        if week is None:
+            return rows[-1]
+        return next((row for row in rows if row["week"] == week), None)
+
+
+class LineService:
+    """
+    Owns the DataLoader, the per-week IncrementalLines and the current ServiceState.
+
+    Attributes:
+        loader: DataLoader for the whole season (week=None)
+        policy: missing-data policy for the lines
+        weights: home field and factor weights for the lines
+        state: the ServiceState requests are answered from
+    """
+
+    def __init__(
+        self,
+        api_fetcher: APIDataFetcher,
+        season: int = year,
+        policy: MissingPolicy = missing_policy,
+        weights: FactorWeights | None = None,
+        history: MetricHistory | None = None,
+    ) -> None:
+        self.loader = DataLoader(api_fetcher, None, season=season, history=history)
+        self.policy = policy
+        self.weights = weights if weights is not None else load_factor_weights()
+        self.state = ServiceState(0, 0.0, {}, {})
+        self._incremental: dict[int, IncrementalLines] = {}
+        self._rows: dict[int, list[dict[str, Any]]] = {}
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def refresh(self) -> bool:
+        """
+        Reload the season and rebuild whatever changed. Safe to call from any thread;
+        concurrent calls are serialized.
+
+        :return: True if a new state was published
+        """
+        with self._refresh_lock, get_recorder().stage("service.refresh"):
+            self.loader.load()
+            registry = self.loader.teams
+            first_load = not self._incremental
+            changed = None if first_load else self.loader.changed_teams
+
+            dirty: list[int] = []
+            for week, games in self.loader.games_by_week.items():
+                incremental = self._incremental.get(week)
+                if incremental is None or incremental.games != games:
+                    incremental = IncrementalLines(
+                        games, self.policy, weights=self.weights
+                    )
+                    self._incremental[week] = incremental
+                    incremental.update(registry)
+                elif changed and len(incremental.affected_games(changed)):
+                    incremental.update(registry, changed)
+                else:
+                    continue
+                dirty.append(week)
+
+            removed = set(self._incremental) - set(self.loader.games_by_week)
+            for week in removed:
+                del self._incremental[week]
+                self._rows.pop(week, None)
+
+            # Changed teams off the schedule still move the all-pairs matrix
+            if not dirty and not removed and not first_load and not changed:
+                return False
+
+            for week in dirty:
+                self._rows[week] = _line_rows(week, self._incremental[week].lines())
+            self._publish()
+            return True
+
+    def _publish(self) -> None:
+        weeks = {week: _dumps(rows) for week, rows in self._rows.items()}
+        matchups: dict[tuple[str, str], list[dict[str, Any]]] = {}
+        for week in sorted(self._rows):
+            for row in self._rows[week]:
+                matchups.setdefault((row["away_team"], row["home_team"]), []).append(
+                    row
+                )
+        matrix = MatchupMatrix.build(self.loader.teams, self.weights, self.policy)
+        # A single reference assignment: readers see the old state or the new one.
+        self.state = ServiceState(
+            self.state.version + 1, time.time(), weeks, matchups, matrix
+        )
+
+    def start_refreshing(self, interval: float = service_refresh_seconds) -> None:
+        """
+        Refresh every interval seconds on a daemon thread, off the request path.
+        """
+
+        def loop() -> None:
+            while not self._stop.wait(interval):
+                try:
+                    self.refresh()
+                except Exception as e:
+                    print(f"Error refreshing data: {e}")
+
+        threading.Thread(target=loop, daemon=True).start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in one segment, flushed once per request; otherwise
+    # Nagle and delayed ACKs stall every keep-alive request by tens of milliseconds.
+    wbufsize = 64 * 1024
+    disable_nagle_algorithm = True
+    service: LineService
+
+    def log_message(self, format: str, *args: Any) -> None:
+        # Per-request logging to stderr would dominate the cost of a request
+        pass
+
+    def _send(self, status: int, body: bytes, etag: str | None = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if etag:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status: int, message: str) -> None:
+        self._send(status, _dumps({"error": message}))
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        state = self.service.state
+
+        if url.path in ("/lines", "/matchup", "/pair", "/health"):
+            if self.headers.get("If-None-Match") == state.etag:
+                self.send_response(304)
+                self.send_header("ETag", state.etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+
+        try:
+            week = int(query["week"]) if "week" in query else None
+        except ValueError:
+            return self._error(400, "week must be an integer")
+
+        if url.path == "/lines":
+            if week is None:
+                return self._error(400, "week is required")
+            body = state.weeks.get(week)
+            if body is None:
+                return self._error(404, f"no lines for week {week}")
+            return self._send(200, body, state.etag)
+
+        if url.path == "/matchup":
+            if "away" not in query or "home" not in query:
+                return self._error(400, "away and home are required")
+            row = state.matchup(query["away"], query["home"], week)
+            if row is None:
+                return self._error(404, "matchup not found")
+            return self._send(200, _dumps(row), state.etag)
+
+        if url.path == "/pair":
+            if "away" not in query or "home" not in query:
+                return self._error(400, "away and home are required")
+            neutral = query.get("neutral", "0").lower() in ("1", "true", "yes")
+            line = None
+            if state.matrix is not None:
+                line = state.matrix.line(query["away"], query["home"], neutral)
+            if line is None:
+                return self._error(404, "no line for this pairing")
+            pair = {
+                "away_team": query["away"],
+                "home_team": query["home"],
+                "neutral": neutral,
+                "adjusted": line,
+            }
+            return self._send(200, _dumps(pair), state.etag)
+
+        if url.path == "/health":
+            health = {"version": state.version, "loaded_at": state.loaded_at}
+            return self._send(200, _dumps(health), state.etag)
+
+        self._error(404, "not found")
+
+    def do_POST(self) -> None:
+        if urlsplit(self.path).path != "/matchups":
+            return self._error(404, "not found")
+
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            return self._error(413, "request body too large")
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            games = [(str(away), str(home)) for away, home in payload["games"]]
+            week = payload.get("week")
+        except (ValueError, KeyError, TypeError):
+            return self._error(400, 'expected {"games": [[away, home], ...]}')
+
+        state = self.service.state
+        lines = [state.matchup(away, home, week) for away, home in games]
+        self._send(200, _dumps({"lines": lines}), state.etag)
+
+
+def make_server(
+    service: LineService, host: str = service_host, port: int = service_port
+) -> ThreadingHTTPServer:
+    """
+    Build the HTTP server for a LineService; call serve_forever() to run it.
+    """
+    handler = type("Handler", (_Handler,), {"service": service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else service_port
+
+    # Capped at the refresh interval: with the endpoint TTLs (hours) every refresh
+    # would re-serve the rows the previous one fetched and never see new results
+    cache = (
+        ResponseCache(offline=cache_offline, max_age=service_refresh_seconds)
+        if cache_enabled
+        else None
+    )
+    line_service = LineService(make_api_fetcher(cache), history=open_history())
+    line_service.refresh()
+    line_service.start_refreshing()
+
+    httpd = make_server(line_service, port=port)
+    print(f"Serving lines on http://{service_host}:{port}")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        line_service.stop()
+        httpd.server_close()
@@ -0,0 +1,435 @@
+"""
+Monte Carlo simulation of the rest of a season from the adjusted lines.
+
+Each remaining game's adjusted line is the mean of a normal distribution of home
+margins with a configurable spread, so one simulated season is one vector of draws
+over the remaining schedule. Seasons are drawn in chunks as (seasons, games) NumPy
+arrays, win totals come from gathering each team's games out of the outcome matrix, and
+every chunk is reduced straight into counters:
+- win probability of every remaining game
+- distribution of final win totals, expected wins and bowl eligibility (6+ wins)
+- conference title odds: best conference record, ties broken by overall wins and then
+  at random
+
+Chunks are spread over a process pool. Every chunk gets its own RNG stream spawned
+from one SeedSequence, so results depend only on the seed and chunk size, not on the
+number of workers, and no raw draws outlive their chunk.
+
+Usage:
+    python -m src.statforge.simulation 2024 8
+    python -m src.statforge.simulation 2024 8 500000
+"""
+
+import sys
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from src.statforge.cache import ResponseCache
+from src.statforge.combine import (
+    FactorWeights,
+    MissingPolicy,
+    combine_factors,
+    load_factor_weights,
+    missing_policies,
+)
+from src.statforge.config import (
+    cache_enabled,
+    cache_offline,
+    simulation_chunk_size,
+    simulation_margin_sd,
+    simulation_processes,
+    simulation_seasons,
+    year,
+)
+from src.statforge.data_loader import (
+    FBS,
+    APIDataFetcher,
+    DataLoader,
+    conferences,
+    make_api_fetcher,
+)
+from src.statforge.instrumentation import get_recorder
+from src.statforge.metrics.engine import MatchupEngine
+from src.statforge.teams import TeamRegistry
+
+BOWL_ELIGIBLE_WINS: int = 6
+
+# Conferences without a title game or standings to win.
+_no_title: frozenset[str] = frozenset({"FBS Independents"})
+
+
+class SeasonSchedule:
+    """
+    The remaining schedule as arrays, plus the records already banked.
+
+    Attributes:
+        teams: team names, indexed by the ids used in every other array
+        games: the remaining (away, home) matchups
+        away_ids / home_ids: team ids for each remaining game
+        neutral: whether each remaining game is at a neutral site
+        mean_margin: adjusted line (expected home margin) of each remaining game
+        conference_game: whether each remaining game counts toward conference records
+        base_wins / base_conference_wins: wins already recorded per team
+        conference_members: dict mapping each conference to the ids of its teams
+    """
+
+    def __init__(
+        self,
+        teams: list[str],
+        games: list[tuple[str, str]],
+        mean_margin: np.ndarray,
+        conference_game: np.ndarray,
+        base_wins: np.ndarray,
+        base_conference_wins: np.ndarray,
+        conference_members: dict[str, np.ndarray],
+        neutral: np.ndarray | None = None,
+    ) -> None:
+        self.teams = teams
+        self.games = games
+        self.neutral = (
+            np.zeros(len(games), dtype=bool)
+            if neutral is None
+            else np.asarray(neutral, dtype=bool)
+        )
+        ids = {team: i for i, team in enumerate(teams)}
+        self.away_ids = np.fromiter((ids[a] for a, _ in games), np.intp, len(games))
+        self.home_ids = np.fromiter((ids[h] for _, h in games), np.intp, len(games))
+        self.mean_margin = np.asarray(mean_margin, dtype=np.float32)
+        self.conference_game = np.asarray(conference_game, dtype=bool)
+        self.base_wins = base_wins
+        self.base_conference_wins = base_conference_wins
+        self.conference_members = conference_members
+
+        # Slot tables for gathering a team's results out of the outcome matrix built
+        # in _simulate_chunk: columns [0, G) are home wins, [G, 2G) away wins and 2G
+        # is an always-False pad for teams with fewer games.
+        self.win_slots = self._slots(np.ones(len(games), dtype=bool))
+        self.conference_win_slots = self._slots(self.conference_game)
+
+    def __len__(self) -> int:
+        return len(self.games)
+
+    def _slots(self, include: np.ndarray) -> np.ndarray:
+        n_games = len(self.games)
+        per_team: list[list[int]] = [[] for _ in self.teams]
+        for g in np.flatnonzero(include):
+            per_team[self.home_ids[g]].append(g)
+            per_team[self.away_ids[g]].append(n_games + g)
+
+        width = max((len(slots) for slots in per_team), default=0)
+        table = np.full((len(self.teams), max(width, 1)), 2 * n_games, dtype=np.intp)
+        for team, slots in enumerate(per_team):
+            table[team, : len(slots)] = slots
+        return table
+
+
+def build_schedule(
+    api_fetcher: APIDataFetcher,
+    registry: TeamRegistry,
+    season: int = year,
+    from_week: int | None = None,
+    policy: MissingPolicy = "zero",
+    weights: FactorWeights | None = None,
+) -> SeasonSchedule:
+    """
+    Split a season's FBS schedule into banked results and remaining games with lines.
+
+    Games are remaining if they are not completed, or are in from_week or later. A
+    remaining game the lines can't be computed for (no SRS for a side) is simulated as
+    a pick'em. Under "drop" a game missing a PPA or havoc factor, e.g. against an FCS
+    opponent, is simulated from its SRS line alone; the other policies count the
+    missing factors as 0.
+
+    :param api_fetcher: fetcher to use for the season's games
+    :param registry: loaded team metrics, e.g. DataLoader.teams
+    :param season: season year
+    :param from_week: first week to simulate, defaults to the first unplayed game
+    :param policy: missing-data policy for the lines of the remaining games
+    :param weights: home field and factor weights, None to load the fitted ones (see
+        fitting.py); neutral-site games get no home field
+    :return: SeasonSchedule
+    """
+    rows = api_fetcher.games_api.get_games(year=season, classification=FBS)
+
+    teams: dict[str, int] = {}
+    conference_of: dict[str, str] = {}
+    banked: list[tuple[str, bool]] = []
+    remaining: list[tuple[str, str]] = []
+    remaining_conference: list[bool] = []
+    remaining_neutral: list[bool] = []
+
+    for game in rows:
+        for team, conference in (
+            (game.away_team, game.away_conference),
+            (game.home_team, game.home_conference),
+        ):
+            teams.setdefault(team, len(teams))
+            if conference:
+                conference_of[team] = conference
+
+        played = (
+            game.completed
+            and game.home_points is not None
+            and game.away_points is not None
+            and (from_week is None or game.week < from_week)
+        )
+        if played:
+            if game.home_points != game.away_points:
+                winner = (
+                    game.home_team
+                    if game.home_points > game.away_points
+                    else game.away_team
+                )
+                banked.append((winner, bool(game.conference_game)))
+        else:
+            remaining.append((game.away_team, game.home_team))
+            remaining_conference.append(bool(game.conference_game))
+            remaining_neutral.append(bool(game.neutral_site))
+
+    names = list(teams)
+    base_wins = np.zeros(len(names), dtype=np.int32)
+    base_conference_wins = np.zeros(len(names), dtype=np.int32)
+    for winner, conference_game in banked:
+        base_wins[teams[winner]] += 1
+        base_conference_wins[teams[winner]] += conference_game
+
+    if weights is None:
+        weights = load_factor_weights()
+    neutral = np.array(remaining_neutral, dtype=bool)
+    engine = MatchupEngine(registry, weights.home_field)
+    if policy not in missing_policies:
+        raise ValueError(f"Unknown missing-data policy: {policy}")
+    factors = engine.compute(remaining, neutral)
+    # "partial" keeps every game with an SRS line in schedule order, so the lines
+    # match the games by position even when a pairing is played twice (title games)
+    lines = combine_factors(factors, "partial", weights)
+    margin = lines.adjusted
+    if policy == "drop":
+        margin = np.where(lines.complete, margin, lines.srs_line)
+    mean_margin = np.zeros(len(remaining), dtype=np.float32)
+    mean_margin[factors.srs_valid] = margin
+
+    members: dict[str, list[int]] = {}
+    for team, conference in conference_of.items():
+        if conference in conferences and conference not in _no_title:
+            members.setdefault(conference, []).append(teams[team])
+
+    return SeasonSchedule(
+        names,
+        remaining,
+        mean_margin,
+        np.array(remaining_conference, dtype=bool),
+        base_wins,
+        base_conference_wins,
+        {c: np.array(ids, dtype=np.intp) for c, ids in members.items()},
+        neutral,
+    )
+
+
+class SimulationResult:
+    """
+    Counters accumulated over every simulated season. Nothing per-season is kept.
+
+    Attributes:
+        schedule: the SeasonSchedule simulated
+        seasons: number of seasons simulated
+        home_wins: per remaining game, seasons the home side won
+        win_totals: (teams, max wins + 1) histogram of final win totals
+        bowl_eligible: per team, seasons finishing with at least 6 wins
+        titles: dict mapping conference to per-member title counts
+    """
+
+    def __init__(self, schedule: SeasonSchedule) -> None:
+        self.schedule = schedule
+        self.seasons = 0
+        self.home_wins = np.zeros(len(schedule), dtype=np.int64)
+        max_wins = int(schedule.base_wins.max(initial=0)) + schedule.win_slots.shape[1]
+        self.win_totals = np.zeros((len(schedule.teams), max_wins + 1), dtype=np.int64)
+        self.bowl_eligible = np.zeros(len(schedule.teams), dtype=np.int64)
+        self.titles = {
+            conference: np.zeros(len(ids), dtype=np.int64)
+            for conference, ids in schedule.conference_members.items()
+        }
+
+    def merge(self, other: "SimulationResult") -> None:
+        self.seasons += other.seasons
+        self.home_wins += other.home_wins
+        self.win_totals += other.win_totals
+        self.bowl_eligible += other.bowl_eligible
+        for conference, counts in other.titles.items():
+            self.titles[conference] += counts
+
+    def win_probabilities(self) -> dict[str, float]:
+        """
+        Home win probability per remaining game, keyed "away_team vs home_team".
+        """
+        return {
+            f"{away_team} vs {home_team}": wins / self.seasons
+            for (away_team, home_team), wins in zip(
+                self.schedule.games, self.home_wins.tolist()
+            )
+        }
+
+    def expected_wins(self) -> dict[str, float]:
+        totals = self.win_totals @ np.arange(self.win_totals.shape[1])
+        return dict(zip(self.schedule.teams, (totals / self.seasons).tolist()))
+
+    def bowl_odds(self) -> dict[str, float]:
+        return dict(
+            zip(self.schedule.teams, (self.bowl_eligible / self.seasons).tolist())
+        )
+
+    def title_odds(self) -> dict[str, dict[str, float]]:
+        """
+        Conference title probability per team, grouped by conference.
+        """
+        return {
+            conference: {
+                self.schedule.teams[team]: count / self.seasons
+                for team, count in zip(
+                    self.schedule.conference_members[conference], counts.tolist()
+                )
+            }
+            for conference, counts in self.titles.items()
+        }
+
+
+def _simulate_chunk(
+    schedule: SeasonSchedule,
+    seasons: int,
+    margin_sd: float,
+    seed: np.random.SeedSequence,
+) -> SimulationResult:
+    rng = np.random.default_rng(seed)
+    result = SimulationResult(schedule)
+    result.seasons = seasons
+    n_games = len(schedule)
+
+    draws = rng.standard_normal((seasons, n_games), dtype=np.float32)
+    draws *= np.float32(margin_sd)
+    draws += schedule.mean_margin
+    home_won = draws > 0
+    del draws
+    result.home_wins += home_won.sum(axis=0)
+
+    outcomes = np.zeros((seasons, 2 * n_games + 1), dtype=bool)
+    outcomes[:, :n_games] = home_won
+    np.logical_not(home_won, out=outcomes[:, n_games : 2 * n_games])
+    del home_won
+
+    wins = outcomes[:, schedule.win_slots].sum(axis=2, dtype=np.int32)
+    wins += schedule.base_wins
+    conference_wins = outcomes[:, schedule.conference_win_slots].sum(
+        axis=2, dtype=np.int32
+    )
+    conference_wins += schedule.base_conference_wins
+    del outcomes
+
+    n_teams = len(schedule.teams)
+    width = result.win_totals.shape[1]
+    flat = (np.arange(n_teams) * width + wins).ravel()
+    result.win_totals += np.bincount(flat, minlength=n_teams * width).reshape(
+        n_teams, width
+    )
+    result.bowl_eligible += (wins >= BOWL_ELIGIBLE_WINS).sum(axis=0)
+
+    # Conference record first, overall wins second, a random draw for what's left.
+    score = conference_wins * np.float32(width) + wins
+    score = score + rng.random(score.shape, dtype=np.float32)
+    for conference, members in schedule.conference_members.items():
+        champions = score[:, members].argmax(axis=1)
+        result.titles[conference] += np.bincount(champions, minlength=len(members))
+
+    return result
+
+
+_worker_schedule: SeasonSchedule | None = None
+
+
+def _init_worker(schedule: SeasonSchedule) -> None:
+    # The schedule is shipped once per worker rather than once per chunk.
+    global _worker_schedule
+    _worker_schedule = schedule
+
+
+def _run_chunk(
+    seasons: int, margin_sd: float, seed: np.random.SeedSequence
+) -> SimulationResult:
+    result = _simulate_chunk(_worker_schedule, seasons, margin_sd, seed)
+    # Only the counters travel back to the parent.
+    result.schedule = None
+    return result
+
+
+def simulate(
+    schedule: SeasonSchedule,
+    seasons: int = simulation_seasons,
+    margin_sd: float = simulation_margin_sd,
+    chunk_size: int = simulation_chunk_size,
+    processes: int | None = simulation_processes,
+    seed: int | None = None,
+) -> SimulationResult:
+    """
+    Simulate the remaining schedule many times and aggregate the outcomes.
+
+    :param schedule: schedule from build_schedule
+    :param seasons: number of seasons to simulate
+    :param margin_sd: standard deviation of the home margin around the adjusted line
+    :param chunk_size: seasons drawn per vectorized chunk; bounds peak memory
+    :param processes: worker processes, None for one per CPU and 1 to stay in-process
+    :param seed: seed for reproducible results
+    :return: SimulationResult
+    """
+    sizes = [chunk_size] * (seasons // chunk_size)
+    if seasons % chunk_size:
+        sizes.append(seasons % chunk_size)
+    streams = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    result = SimulationResult(schedule)
+    with get_recorder().stage("simulation.simulate"):
+        if processes == 1 or len(sizes) <= 1:
+            for size, stream in zip(sizes, streams):
+                result.merge(_simulate_chunk(schedule, size, margin_sd, stream))
+        else:
+            with ProcessPoolExecutor(
+                max_workers=processes,
+                initializer=_init_worker,
+                initargs=(schedule,),
+            ) as pool:
+                for chunk in pool.map(
+                    _run_chunk, sizes, [margin_sd] * len(sizes), streams
+                ):
+                    result.merge(chunk)
+    get_recorder().add_rows("simulation.simulate", seasons * len(schedule))
+
+    return result
+
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (3, 4):
+        sys.exit("Usage: python -m src.statforge.simulation <season> <week> [seasons]")
+
+    season_year, first_week = int(sys.argv[1]), int(sys.argv[2])
+    n_seasons = int(sys.argv[3]) if len(sys.argv) == 4 else simulation_seasons
+
+    cache = ResponseCache(offline=cache_offline) if cache_enabled else None
+    api_fetcher: APIDataFetcher = make_api_fetcher(cache)
+
+    loader = DataLoader(api_fetcher, None, season=season_year)
+    loader.load()
+
+    simulated = simulate(
+        build_schedule(api_fetcher, loader.teams, season_year, first_week),
+        seasons=n_seasons,
+    )
+    expected, bowl = simulated.expected_wins(), simulated.bowl_odds()
+
+    for conference, odds in simulated.title_odds().items():
+        print(f"{conference}:")
+        for team, title in sorted(odds.items(), key=lambda item: -item[1]):
+            print(
+                f"  {team}: {expected[team]:.2f} wins, "
+                f"bowl {bowl[team]:.1%}, title {title:.1%}"
+            )
@@ -0,0 +1,183 @@
+"""
+Module for saving loaded season data to a versioned binary snapshot and mapping it back.
+
+Layout of a snapshot file:
+- 8-byte magic b"SFSNAP\\x00\\x00"
+- uint32 format version, uint32 header length (little endian)
+- UTF-8 JSON header: season, week, team names and a schema of every column
+  (dtype, length, byte offset)
+- the raw column data, each column aligned to 64 bytes
+
+Reloading maps the file with np.memmap and hands out zero-copy views of each column, so
+analysis scripts, a long-running service and parallel workers can all share one
+snapshot without parsing or copying it.
+"""
+
+import json
+import struct
+
+import numpy as np
+
+from src.statforge.teams import TeamRegistry, metric_columns
+
+MAGIC: bytes = b"SFSNAP\x00\x00"
+SNAPSHOT_VERSION: int = 1
+ALIGNMENT: int = 64
+
+_preamble = struct.Struct("<8sII")
+
+
+class SnapshotError(ValueError):
+    """
+    Raised when a file is not a snapshot or was written by an unsupported version.
+    """
+
+
+class Snapshot:
+    """
+    Contents of a snapshot file.
+
+    Attributes:
+        season: season the data belongs to
+        week: week the loader was created for, or None for a whole-season load
+        teams: names of every team, position is the team id used by the columns
+        columns: dict mapping column names to (possibly memory-mapped) arrays
+    """
+
+    def __init__(
+        self,
+        season: int,
+        week: int | None,
+        teams: list[str],
+        columns: dict[str, np.ndarray],
+    ) -> None:
+        self.season = season
+        self.week = week
+        self.teams = teams
+        self.columns = columns
+
+    def registry(self) -> TeamRegistry:
+        """
+        Build a TeamRegistry backed directly by the snapshot's columns.
+        """
+        return TeamRegistry.from_columns(
+            self.teams,
+            {name: self.columns[name] for name in metric_columns},
+            self.columns["ppa_present"].view(bool),
+        )
+
+    def games_by_week(self) -> dict[int, list[tuple[str, str]]]:
+        games_by_week: dict[int, list[tuple[str, str]]] = {}
+        away, home, week = (
+            self.columns["game_away"],
+            self.columns["game_home"],
+            self.columns["game_week"],
+        )
+        for i in range(len(away)):
+            games_by_week.setdefault(int(week[i]), []).append(
+                (self.teams[away[i]], self.teams[home[i]])
+            )
+        return games_by_week
+
+
+def write_snapshot(
+    path: str,
+    season: int,
+    week: int | None,
+    registry: TeamRegistry,
+    games_by_week: dict[int, list[tuple[str, str]]],
+) -> None:
+    """
+    Write a snapshot file.
+
+    :param path: destination file
+    :param season: season the data belongs to
+    :param week: week the data was loaded for, or None
+    :param registry: TeamRegistry with every team's metrics
+    :param games_by_week: dict mapping week to that week's (away, home) matchups
+    """
+    teams = list(registry.names)
+    ids = dict(registry.ids)
+
+    game_away: list[int] = []
+    game_home: list[int] = []
+    game_week: list[int] = []
+    for game_week_number, games in games_by_week.items():
+        for away_team, home_team in games:
+            # Teams on the schedule with no metrics still need an id to be stored.
+            for team in (away_team, home_team):
+                if team not in ids:
+                    ids[team] = len(teams)
+                    teams.append(team)
+            game_away.append(ids[away_team])
+            game_home.append(ids[home_team])
+            game_week.append(game_week_number)
+
+    def padded(column: np.ndarray, fill: float | bool) -> np.ndarray:
+        out = np.full(len(teams), fill, dtype=column.dtype)
+        out[: len(column)] = column
+        return out
+
+    columns: dict[str, np.ndarray] = {
+        name: padded(registry.column(name), np.nan) for name in metric_columns
+    }
+    columns["ppa_present"] = padded(registry.ppa_present, False).view(np.uint8)
+    columns["game_away"] = np.array(game_away, dtype="<i4")
+    columns["game_home"] = np.array(game_home, dtype="<i4")
+    columns["game_week"] = np.array(game_week, dtype="<i2")
+
+    schema: dict[str, dict] = {}
+    offset = 0
+    for name, column in columns.items():
+        schema[name] = {
+            "dtype": column.dtype.str,
+            "length": len(column),
+            "offset": offset,
+        }
+        offset += -(-column.nbytes // ALIGNMENT) * ALIGNMENT
+
+    header = json.dumps(
+        {"season": season, "week": week, "teams": teams, "columns": schema},
+        separators=(",", ":"),
+    ).encode()
+    data_start = -(-(_preamble.size + len(header)) // ALIGNMENT) * ALIGNMENT
+
+    with open(path, "wb") as out:
+        out.write(_preamble.pack(MAGIC, SNAPSHOT_VERSION, len(header)))
+        out.write(header)
+        for name, column in columns.items():
+            out.seek(data_start + schema[name]["offset"])
+            out.write(np.ascontiguousarray(column).tobytes())
+        out.truncate(data_start + offset)
+
+
+def read_snapshot(path: str) -> Snapshot:
+    """
+    Memory-map a snapshot file. Columns are read-only views into the mapping.
+
+    :param path: snapshot file
+    :return: Snapshot with memory-mapped columns
+    """
+    with open(path, "rb") as f:
+        magic, version, header_length = _preamble.unpack(f.read(_preamble.size))
+        if magic != MAGIC:
+            raise SnapshotError(f"{path} is not a StatForge snapshot")
+        if version != SNAPSHOT_VERSION:
+            raise SnapshotError(
+                f"{path} is snapshot version {version}, expected {SNAPSHOT_VERSION}"
+            )
+        header = json.loads(f.read(header_length))
+
+    data_start = -(-(_preamble.size + header_length) // ALIGNMENT) * ALIGNMENT
+    mapped = np.memmap(path, dtype=np.uint8, mode="r")
+
+    columns: dict[str, np.ndarray] = {}
+    for name, spec in header["columns"].items():
+        columns[name] = np.ndarray(
+            (spec["length"],),
+            dtype=np.dtype(spec["dtype"]),
+            buffer=mapped,
+            offset=data_start + spec["offset"],
+        )
+
+    return Snapshot(header["season"], header["week"], header["teams"], columns)
@@ -0,0 +1,238 @@
+"""
+Module for the central team registry shared by the data loader and the calculators.
+
+Team names are interned to dense integer ids and every per-team metric lives in one
+NumPy column indexed by that id, with NaN marking a missing value. Calculators join
+against the registry by id instead of repeatedly looking teams up by name in separate
+nested dicts, and many seasons of registries stay cheap to hold in memory at once.
+"""
+
+from typing import TypedDict
+
+import numpy as np
+
+
+class TeamHavocStats(TypedDict):
+    offense: float | None
+    defense: float | None
+
+
+# Metric columns stored per team. ppa_present is kept separately because a team can be
+# in the PPA table with one side missing, which the calculators treat as 0.
+metric_columns: tuple[str, ...] = (
+    "srs",
+    "ppa_offense",
+    "ppa_defense",
+    "havoc_offense",
+    "havoc_defense",
+)
+
+
+class TeamRegistry:
+    """
+    Interns team names to dense ids and stores their metrics in id-indexed columns.
+
+    Attributes:
+        names: team names, position is the team id
+        ids: dict mapping team names to ids
+    """
+
+    __slots__ = ("names", "ids", "_columns", "_ppa_present", "_capacity")
+
+    def __init__(self, capacity: int = 256) -> None:
+        self.names: list[str] = []
+        self.ids: dict[str, int] = {}
+        self._capacity = capacity
+        self._columns: dict[str, np.ndarray] = {
+            column: np.full(capacity, np.nan) for column in metric_columns
+        }
+        self._ppa_present = np.zeros(capacity, dtype=bool)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.ids
+
+    def intern(self, name: str) -> int:
+        """
+        Return the id for a team, assigning the next free id if it is new.
+
+        :param name: team name
+        :return: dense integer id
+        """
+        team_id = self.ids.get(name)
+        if team_id is None:
+            team_id = len(self.names)
+            if team_id == self._capacity:
+                self._grow()
+            self.ids[name] = team_id
+            self.names.append(name)
+        return team_id
+
+    def id_of(self, name: str) -> int | None:
+        return self.ids.get(name)
+
+    def set_srs(self, name: str, rating: float | None) -> None:
+        if rating is not None:
+            team_id = self.intern(name)
+            self._columns["srs"][team_id] = rating
+
+    def set_ppa(self, name: str, offense: float | None, defense: float | None) -> None:
+        team_id = self.intern(name)
+        self._columns["ppa_offense"][team_id] = offense or 0.0
+        self._columns["ppa_defense"][team_id] = defense or 0.0
+        self._ppa_present[team_id] = True
+
+    def set_havoc(
+        self, name: str, offense: float | None, defense: float | None
+    ) -> None:
+        team_id = self.intern(name)
+        if offense is not None:
+            self._columns["havoc_offense"][team_id] = offense
+        if defense is not None:
+            self._columns["havoc_defense"][team_id] = defense
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Id-indexed view of one metric column, NaN where a team has no value.
+
+        :param name: one of metric_columns
+        :return: float array of length len(self)
+        """
+        return self._columns[name][: len(self.names)]
+
+    @property
+    def ppa_present(self) -> np.ndarray:
+        return self._ppa_present[: len(self.names)]
+
+    def to_tables(
+        self,
+    ) -> tuple[
+        dict[str, float], dict[str, dict[str, float]], dict[str, TeamHavocStats]
+    ]:
+        """
+        Rebuild the name-keyed dicts the per-game calculators take.
+
+        :return: (srs_by_team, ppa_by_team, havoc_by_team)
+        """
+        srs = self.column("srs")
+        ppa_offense = self.column("ppa_offense")
+        ppa_defense = self.column("ppa_defense")
+        havoc_offense = self.column("havoc_offense")
+        havoc_defense = self.column("havoc_defense")
+        ppa_present = self.ppa_present
+
+        srs_by_team: dict[str, float] = {}
+        ppa_by_team: dict[str, dict[str, float]] = {}
+        havoc_by_team: dict[str, TeamHavocStats] = {}
+
+        for team_id, name in enumerate(self.names):
+            if not np.isnan(srs[team_id]):
+                srs_by_team[name] = float(srs[team_id])
+            if ppa_present[team_id]:
+                ppa_by_team[name] = {
+                    "offense": float(ppa_offense[team_id]),
+                    "defense": float(ppa_defense[team_id]),
+                }
+            offense, defense = havoc_offense[team_id], havoc_defense[team_id]
+            if not (np.isnan(offense) and np.isnan(defense)):
+                havoc_by_team[name] = {
+                    "offense": _optional(offense),
+                    "defense": _optional(defense),
+                }
+
+        return srs_by_team, ppa_by_team, havoc_by_team
+
+    @classmethod
+    def from_tables(
+        cls,
+        team_srs: dict[str, float],
+        team_ppa: dict[str, dict[str, float]],
+        team_havoc: dict[str, TeamHavocStats],
+    ) -> "TeamRegistry":
+        """
+        Build a registry from the name-keyed tables produced by DataLoader.
+
+        :param team_srs: a dict mapping teams to SRS ratings
+        :param team_ppa: a dict mapping teams to offensive and defensive PPA
+        :param team_havoc: a dict mapping teams to offensive and defensive havoc
+        :return: populated TeamRegistry
+        """
+        registry = cls(capacity=max(1, len(team_srs), len(team_ppa), len(team_havoc)))
+
+        for team, rating in team_srs.items():
+            registry.set_srs(team, rating)
+        for team, ppa in team_ppa.items():
+            registry.set_ppa(team, ppa.get("offense"), ppa.get("defense"))
+        for team, havoc in team_havoc.items():
+            registry.set_havoc(team, havoc.get("offense"), havoc.get("defense"))
+
+        return registry
+
+    @classmethod
+    def from_columns(
+        cls,
+        names: list[str],
+        columns: dict[str, np.ndarray],
+        ppa_present: np.ndarray,
+    ) -> "TeamRegistry":
+        """
+        Wrap existing id-indexed columns (for example memory-mapped snapshot data)
+        without copying them. Registries over read-only arrays are read-only until a
+        new team is interned, which copies the columns.
+
+        :param names: team names, position is the team id
+        :param columns: dict mapping every name in metric_columns to its array
+        :param ppa_present: whether each team appears in the PPA table
+        :return: TeamRegistry sharing the given arrays
+        """
+        registry = cls.__new__(cls)
+        registry.names = list(names)
+        registry.ids = {name: i for i, name in enumerate(registry.names)}
+        registry._capacity = len(registry.names)
+        registry._columns = {name: columns[name] for name in metric_columns}
+        registry._ppa_present = ppa_present
+        return registry
+
+    def _grow(self) -> None:
+        self._capacity = max(1, self._capacity * 2)
+        for name, column in self._columns.items():
+            grown = np.full(self._capacity, np.nan)
+            grown[: len(column)] = column
+            self._columns[name] = grown
+        present = np.zeros(self._capacity, dtype=bool)
+        present[: len(self._ppa_present)] = self._ppa_present
+        self._ppa_present = present
+
+
+def changed_teams(old: TeamRegistry, new: TeamRegistry) -> set[str]:
+    """
+    Teams whose metrics differ between two registries, including teams that were added
+    or removed.
+
+    :param old: registry from the previous load
+    :param new: registry from the current load
+    :return: set of team names that changed
+    """
+    changed = set(old.names).symmetric_difference(new.names)
+    shared = [name for name in new.names if name in old.ids]
+    if not shared:
+        return changed
+
+    old_ids = np.array([old.ids[name] for name in shared], dtype=np.intp)
+    new_ids = np.array([new.ids[name] for name in shared], dtype=np.intp)
+
+    differs = old.ppa_present[old_ids] != new.ppa_present[new_ids]
+    for column in metric_columns:
+        before = old.column(column)[old_ids]
+        after = new.column(column)[new_ids]
+        # NaN == NaN counts as unchanged: the team is missing that metric either way.
+        differs |= ~((before == after) | (np.isnan(before) & np.isnan(after)))
+
+    changed.update(shared[i] for i in np.flatnonzero(differs))
+    return changed
+
+
+def _optional(value: float) -> float | None:
+    return None if np.isnan(value) else float(value)
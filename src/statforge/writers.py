@@ -0,0 +1,331 @@
+"""
+Buffered output writers for adjusted lines, and a structured missing-data report.
+
+Each writer takes whole AdjustedLines tables, one per week as they are computed, and
+turns each into a single buffered write instead of a print per matchup. A season can be
+streamed to disk without holding every week in memory, and downstream tools read CSV,
+JSON Lines or Parquet instead of parsing console text.
+
+Formats:
+- "text": the human-readable "Away vs Home: line" listing
+- "csv": one header row, then a row per matchup
+- "jsonl": one JSON object per matchup, NaN written as null
+- "parquet": columnar file, one row group per parquet_row_group_rows rows (needs
+  pyarrow)
+
+    with open_writer("csv", "lines.csv") as writer:
+        for week, lines in ...:
+            writer.write(season, week, lines)
+"""
+
+import csv
+import io
+import json
+import math
+import sys
+
+from typing import IO, Any
+
+import numpy as np
+
+from src.statforge.combine import AdjustedLines
+from src.statforge.config import parquet_row_group_rows, writer_buffer_bytes
+from src.statforge.metrics.engine import MatchupFactors
+
+output_formats: tuple[str, ...] = ("text", "csv", "jsonl", "parquet")
+
+# Columns of every structured format, in order.
+line_fields: tuple[str, ...] = (
+    "season",
+    "week",
+    "away_team",
+    "home_team",
+    "srs_line",
+    "ppa_factor",
+    "havoc_factor_top",
+    "havoc_factor_bottom",
+    "adjusted",
+    "complete",
+)
+
+# Factors MatchupFactors reports missing-data masks for.
+report_factors: tuple[str, ...] = ("srs", "ppa", "havoc_top", "havoc_bottom")
+
+
+def _columns(season: int, week: int, lines: AdjustedLines) -> list[list[Any]]:
+    n = len(lines)
+    return [
+        [season] * n,
+        [week] * n,
+        [away_team for away_team, _ in lines.games],
+        [home_team for _, home_team in lines.games],
+        lines.srs_line.tolist(),
+        lines.ppa_factor.tolist(),
+        lines.havoc_top.tolist(),
+        lines.havoc_bottom.tolist(),
+        lines.adjusted.tolist(),
+        lines.complete.tolist(),
+    ]
+
+
+class LineWriter:
+    """
+    Base class for the writers. Use as a context manager, or call close().
+
+    Attributes:
+        out: the text or binary stream written to
+        rows: matchups written so far
+    """
+
+    binary: bool = False
+
+    def __init__(self, out: IO) -> None:
+        self.out = out
+        self.rows = 0
+        self._owns_out = False
+
+    @classmethod
+    def open(cls, path: str) -> "LineWriter":
+        """
+        Open a writer on a file, or on stdout for "-".
+        """
+        if path == "-":
+            return cls(sys.stdout.buffer if cls.binary else sys.stdout)
+        if cls.binary:
+            out = open(path, "wb", buffering=writer_buffer_bytes)
+        else:
+            out = open(path, "w", buffering=writer_buffer_bytes, newline="")
+        writer = cls(out)
+        writer._owns_out = True
+        return writer
+
+    def write(self, season: int, week: int, lines: AdjustedLines) -> None:
+        self.rows += len(lines)
+        self._write(season, week, lines)
+
+    def _write(self, season: int, week: int, lines: AdjustedLines) -> None:
+        raise NotImplementedError
+
+    def flush(self) -> None:
+        """
+        Push everything written so far to the stream, e.g. after each live update.
+        """
+        self.out.flush()
+
+    def close(self) -> None:
+        if self._owns_out:
+            self.out.close()
+        else:
+            self.out.flush()
+
+    def __enter__(self) -> "LineWriter":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+class TextWriter(LineWriter):
+    def _write(self, season: int, week: int, lines: AdjustedLines) -> None:
+        text = "\n".join(f"{match}: {line}" for match, line in lines.items())
+        self.out.write(f"Week {week} Adjusted SRS Odds:\n{text}\n")
+
+
+class CSVWriter(LineWriter):
+    def __init__(self, out: IO) -> None:
+        super().__init__(out)
+        self._csv = csv.writer(out)
+        self._csv.writerow(line_fields)
+
+    def _write(self, season: int, week: int, lines: AdjustedLines) -> None:
+        # NaN (missing factors under "partial") is written as an empty field
+        self._csv.writerows(
+            ["" if isinstance(v, float) and math.isnan(v) else v for v in row]
+            for row in zip(*_columns(season, week, lines))
+        )
+
+
+class JSONLWriter(LineWriter):
+    def _write(self, season: int, week: int, lines: AdjustedLines) -> None:
+        buffer = io.StringIO()
+        for row in zip(*_columns(season, week, lines)):
+            record = {
+                field: None if isinstance(v, float) and math.isnan(v) else v
+                for field, v in zip(line_fields, row)
+            }
+            buffer.write(json.dumps(record, separators=(",", ":")))
+            buffer.write("\n")
+        self.out.write(buffer.getvalue())
+
+
+def _import_pyarrow() -> Any:
+    # Imported lazily so pyarrow is only needed when Parquet output is used
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError("Parquet output needs pyarrow: pip install pyarrow") from e
+    return pyarrow
+
+
+class ParquetWriter(LineWriter):
+    binary = True
+
+    def __init__(
+        self, out: IO, row_group_rows: int = parquet_row_group_rows
+    ) -> None:
+        pyarrow = _import_pyarrow()
+        super().__init__(out)
+        self._pa = pyarrow
+        self._schema = pyarrow.schema(
+            [
+                ("season", pyarrow.int32()),
+                ("week", pyarrow.int32()),
+                ("away_team", pyarrow.string()),
+                ("home_team", pyarrow.string()),
+                *((field, pyarrow.float64()) for field in line_fields[4:9]),
+                ("complete", pyarrow.bool_()),
+            ]
+        )
+        self._parquet = pyarrow.parquet.ParquetWriter(out, self._schema)
+        self._row_group_rows = row_group_rows
+        self._pending: list[Any] = []
+        self._pending_rows = 0
+
+    @classmethod
+    def open(cls, path: str) -> "LineWriter":
+        # Fail before creating an empty output file
+        _import_pyarrow()
+        return super().open(path)
+
+    def _write(self, season: int, week: int, lines: AdjustedLines) -> None:
+        # Columns go straight from the NumPy arrays; NaN becomes null
+        pa = self._pa
+        n = len(lines)
+        arrays = [
+            pa.array(np.full(n, season, dtype=np.int32)),
+            pa.array(np.full(n, week, dtype=np.int32)),
+            pa.array([away_team for away_team, _ in lines.games], pa.string()),
+            pa.array([home_team for _, home_team in lines.games], pa.string()),
+            *(
+                pa.array(column, from_pandas=True)
+                for column in (
+                    lines.srs_line,
+                    lines.ppa_factor,
+                    lines.havoc_top,
+                    lines.havoc_bottom,
+                    lines.adjusted,
+                )
+            ),
+            pa.array(lines.complete),
+        ]
+        self._pending.append(pa.Table.from_arrays(arrays, schema=self._schema))
+        self._pending_rows += n
+        if self._pending_rows >= self._row_group_rows:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._pending:
+            self._parquet.write_table(self._pa.concat_tables(self._pending))
+            self._pending, self._pending_rows = [], 0
+
+    def flush(self) -> None:
+        self._flush()
+        super().flush()
+
+    def close(self) -> None:
+        self._flush()
+        self._parquet.close()
+        super().close()
+
+
+_writers: dict[str, type[LineWriter]] = {
+    "text": TextWriter,
+    "csv": CSVWriter,
+    "jsonl": JSONLWriter,
+    "parquet": ParquetWriter,
+}
+
+
+def open_writer(output_format: str, path: str = "-") -> LineWriter:
+    """
+    Open the writer for a format.
+
+    :param output_format: one of output_formats
+    :param path: destination file, "-" for stdout
+    :return: LineWriter; close it (or use it in a with block) to flush
+    """
+    writer = _writers.get(output_format)
+    if writer is None:
+        raise ValueError(f"Unknown output format: {output_format}")
+    return writer.open(path)
+
+
+class MissingDataReport:
+    """
+    Matchups a factor couldn't be computed for, collected instead of printed.
+
+    Attributes:
+        entries: (season, week, away_team, home_team, factor) tuples; season and week
+            are None where the caller didn't know them
+    """
+
+    def __init__(self) -> None:
+        self.entries: list[tuple[int | None, int | None, str, str, str]] = []
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def add(
+        self,
+        factor: str,
+        away_team: str,
+        home_team: str,
+        season: int | None = None,
+        week: int | None = None,
+    ) -> None:
+        self.entries.append((season, week, away_team, home_team, factor))
+
+    def add_factors(
+        self,
+        factors: MatchupFactors,
+        season: int | None = None,
+        week: int | None = None,
+    ) -> None:
+        """
+        Record every game each factor is missing for, from the engine's masks.
+        """
+        for factor in report_factors:
+            for away_team, home_team in factors.missing(factor):
+                self.entries.append((season, week, away_team, home_team, factor))
+        for name, (_, valid) in factors.extra.items():
+            for i in np.flatnonzero(~valid):
+                away_team, home_team = factors.games[i]
+                self.entries.append((season, week, away_team, home_team, name))
+
+    def counts(self) -> dict[str, int]:
+        """
+        Number of missing games per factor.
+        """
+        counts: dict[str, int] = {}
+        for *_, factor in self.entries:
+            counts[factor] = counts.get(factor, 0) + 1
+        return counts
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "counts": self.counts(),
+            "missing": [
+                dict(
+                    zip(("season", "week", "away_team", "home_team", "factor"), entry)
+                )
+                for entry in self.entries
+            ],
+        }
+
+    def write(self, path: str) -> None:
+        """
+        Write the report as JSON.
+        """
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
@@ -0,0 +1,163 @@
+import asyncio
+import json
+import threading
+
+import pytest
+
+from aiohttp import web
+
+from src.statforge.async_fetcher import (
+    AsyncAPIDataFetcher,
+    AsyncCFBDClient,
+    CFBDHTTPError,
+)
+
+SRS_ROW = {
+    "year": 2024,
+    "team": "Michigan",
+    "conference": "Big Ten",
+    "division": None,
+    "rating": 12.5,
+    "ranking": 4,
+}
+
+
+class StubServer:
+    """
+    CFBD stand-in on a background thread. Each path answers from a script of
+    (status, body, headers) responses, repeating the last one once it runs out, and
+    every request's path and query is kept.
+    """
+
+    def __init__(self) -> None:
+        self.scripts: dict[str, list[tuple[int, object, dict[str, str]]]] = {}
+        self.requests: list[tuple[str, dict[str, str]]] = []
+        self.url = ""
+        self._loop = asyncio.new_event_loop()
+        self._runner: web.AppRunner | None = None
+
+    def script(self, path: str, *responses: tuple[int, object, dict[str, str]]):
+        self.scripts[path] = list(responses)
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        self.requests.append((request.path, dict(request.query)))
+        script = self.scripts.get(request.path, [(404, "not found", {})])
+        status, body, headers = script.pop(0) if len(script) > 1 else script[0]
+        return web.Response(
+            status=status,
+            text=body if isinstance(body, str) else json.dumps(body),
+            content_type="application/json",
+            headers=headers,
+        )
+
+    async def _start(self) -> None:
+        app = web.Application()
+        app.router.add_get("/{tail:.*}", self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        self.url = f"http://127.0.0.1:{port}"
+
+    def start(self) -> None:
+        threading.Thread(target=self._loop.run_forever, daemon=True).start()
+        asyncio.run_coroutine_threadsafe(self._start(), self._loop).result()
+
+    def stop(self) -> None:
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+
+@pytest.fixture
+def server():
+    stub = StubServer()
+    stub.start()
+    yield stub
+    stub.stop()
+
+
+def make_client(server: StubServer, **overrides) -> AsyncCFBDClient:
+    options = dict(rate=1000.0, burst=100, backoff_base=0.001, backoff_cap=0.01)
+    options.update(overrides)
+    return AsyncCFBDClient("key", host=server.url, **options)
+
+
+def request(client: AsyncCFBDClient, endpoint: str, **params):
+    async def go():
+        try:
+            return await client.request(endpoint, **params)
+        finally:
+            await client.close()
+
+    return asyncio.run(go())
+
+
+def test_retries_429_and_5xx_until_success(server):
+    server.script(
+        "/ratings/srs",
+        (429, "slow down", {"Retry-After": "0"}),
+        (503, "unavailable", {}),
+        (500, "error", {}),
+        (200, [SRS_ROW], {}),
+    )
+    client = make_client(server)
+
+    assert request(client, "get_srs", year=2024) == [SRS_ROW]
+    stats = client.stats["get_srs"]
+    assert (stats.calls, stats.retries, stats.failures) == (4, 3, 0)
+    assert [path for path, _ in server.requests] == ["/ratings/srs"] * 4
+
+
+def test_gives_up_after_max_retries(server):
+    server.script("/games", (502, "bad gateway", {}))
+    client = make_client(server, max_retries=2)
+
+    with pytest.raises(CFBDHTTPError) as error:
+        request(client, "get_games", year=2024)
+    assert error.value.status == 502
+    stats = client.stats["get_games"]
+    assert (stats.calls, stats.retries, stats.failures) == (3, 2, 1)
+
+
+def test_client_errors_are_not_retried(server):
+    server.script("/games", (400, "bad request", {}))
+    client = make_client(server)
+
+    with pytest.raises(CFBDHTTPError) as error:
+        request(client, "get_games", year=2024)
+    assert error.value.status == 400
+    assert len(server.requests) == 1
+
+
+def test_query_is_camel_cased(server):
+    server.script("/ppa/teams", (200, [], {}))
+    client = make_client(server)
+
+    request(
+        client,
+        "get_predicted_points_added_by_team",
+        year=2024,
+        conference=None,
+        exclude_garbage_time=True,
+    )
+    assert server.requests == [
+        ("/ppa/teams", {"year": "2024", "excludeGarbageTime": "true"})
+    ]
+
+
+def test_fetcher_returns_cfbd_models(server, monkeypatch):
+    monkeypatch.setenv("CFBD_API_KEY", "key")
+    server.script(
+        "/ratings/srs", (429, "slow down", {"Retry-After": "0"}), (200, [SRS_ROW], {})
+    )
+    fetcher = AsyncAPIDataFetcher(
+        host=server.url, backoff_base=0.001, backoff_cap=0.01
+    )
+    try:
+        rows = fetcher.ratings_api.get_srs(year=2024)
+    finally:
+        fetcher.close()
+
+    assert [(row.team, row.rating) for row in rows] == [("Michigan", 12.5)]
+    assert fetcher.stats["get_srs"]["retries"] == 1
@@ -0,0 +1,135 @@
+import datetime
+
+import pytest
+
+from src.statforge import cache as cache_module
+from src.statforge.cache import (
+    CachedApi,
+    CacheMiss,
+    CachedRow,
+    ResponseCache,
+    make_key,
+)
+from src.statforge.fake import FakeRow
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class GamesApi:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def get_games(self, year: int) -> list[FakeRow]:
+        self.calls += 1
+        return [
+            FakeRow(
+                homeTeam="A",
+                startDate=datetime.datetime(year, 9, 1, 19, 30),
+                venue=FakeRow(name="Stadium", capacity=50_000),
+            )
+        ]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module.time, "time", clock)
+    return clock
+
+
+def make_cache(tmp_path, **kwargs) -> ResponseCache:
+    return ResponseCache(str(tmp_path / "cache.sqlite3"), **kwargs)
+
+
+def test_entries_expire_after_their_endpoint_ttl(tmp_path, clock):
+    cache = make_cache(tmp_path, ttls={"get_srs": 100, "default": 10})
+    cache.put("get_srs", "srs", [{"team": "A"}])
+    cache.put("get_games", "games", [{"id": 1}])
+
+    clock.now += 50
+    assert cache.get("get_srs", "srs") == [{"team": "A"}]
+    assert cache.get("get_games", "games") is None
+
+    clock.now += 51
+    assert cache.get("get_srs", "srs") is None
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_max_age_caps_every_ttl(tmp_path, clock):
+    cache = make_cache(tmp_path, ttls={"default": 100}, max_age=10)
+    cache.put("get_srs", "srs", [{"team": "A"}])
+
+    clock.now += 5
+    assert cache.get("get_srs", "srs") == [{"team": "A"}]
+    clock.now += 10
+    assert cache.get("get_srs", "srs") is None
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, clock):
+    cache = make_cache(tmp_path)
+    for key in ("a", "b"):
+        cache.put("get_srs", key, [{"team": key}])
+        clock.now += 1
+    (two_entries,) = cache._conn.execute("SELECT SUM(size) FROM responses").fetchone()
+    cache.max_bytes = two_entries
+
+    # Reading "a" makes "b" the least recently used entry
+    assert cache.get("get_srs", "a") is not None
+    clock.now += 1
+    cache.put("get_srs", "c", [{"team": "c"}])
+
+    assert cache.get("get_srs", "b") is None
+    assert cache.get("get_srs", "a") == [{"team": "a"}]
+    assert cache.get("get_srs", "c") == [{"team": "c"}]
+
+
+def test_offline_serves_expired_entries_and_raises_on_misses(tmp_path, clock):
+    make_cache(tmp_path, ttls={"default": 1}).put("get_srs", "srs", [{"team": "A"}])
+    clock.now += 1000
+
+    offline = make_cache(tmp_path, ttls={"default": 1}, offline=True)
+    assert offline.get("get_srs", "srs") == [{"team": "A"}]
+
+    api = CachedApi(GamesApi(), offline)
+    with pytest.raises(CacheMiss):
+        api.get_games(year=2024)
+    assert api.api.calls == 0
+
+
+def test_cached_api_returns_the_same_rows_on_a_miss_and_a_hit(tmp_path, clock):
+    games_api = GamesApi()
+    api = CachedApi(games_api, make_cache(tmp_path))
+
+    fetched = api.get_games(year=2024)
+    cached = api.get_games(year=2024)
+
+    assert games_api.calls == 1
+    assert all(isinstance(row, CachedRow) for row in fetched + cached)
+    assert fetched == cached
+    assert fetched[0].home_team == "A"
+    assert fetched[0].start_date == "2024-09-01T19:30:00"
+    assert fetched[0].venue.capacity == 50_000
+
+
+def test_api_is_only_built_on_the_first_miss(tmp_path, clock):
+    cache = make_cache(tmp_path)
+    key = make_key("get_games", {"year": 2024})
+    cache.put("get_games", key, [{"homeTeam": "A"}])
+    built: list[GamesApi] = []
+
+    def factory() -> GamesApi:
+        built.append(GamesApi())
+        return built[-1]
+
+    api = CachedApi(None, cache, factory=factory)
+    assert api.get_games(year=2024)[0].home_team == "A"
+    assert built == []
+
+    api.get_games(year=2023)
+    assert len(built) == 1 and built[0].calls == 1
@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from src.statforge.combine import FactorWeights, combine_factors
+from src.statforge.data_loader import DataLoader
+from src.statforge.fake import FakeAPIDataFetcher, generate_season
+from src.statforge.main import adjust_factor
+from src.statforge.metrics.engine import MatchupEngine
+from src.statforge.metrics.havoc import CalculateHavocBottom, CalculateHavocTop
+from src.statforge.metrics.ppa import CalculatePPAFactor
+from src.statforge.metrics.srs import CalculateSRSLine
+from src.statforge.writers import MissingDataReport
+
+WEIGHTS = FactorWeights(home_field=3.1, ppa=0.8, havoc_top=12.0, havoc_bottom=-4.0)
+
+
+@pytest.fixture(scope="module")
+def loader():
+    season = generate_season(2024, teams=60, weeks=6, missing_rate=0.15, seed=7)
+    loaded = DataLoader(FakeAPIDataFetcher(season), None, season=2024)
+    loaded.load()
+    return loaded
+
+
+def legacy_lines(loader, games, policy):
+    report = MissingDataReport()
+    srs = CalculateSRSLine(
+        games, loader.srs_by_team, report, home_field=WEIGHTS.home_field
+    )
+    ppa = CalculatePPAFactor(games, loader.ppa_by_team, report)
+    top = CalculateHavocTop(games, loader.havoc_by_team, report)
+    bottom = CalculateHavocBottom(games, loader.havoc_by_team, report)
+    return adjust_factor(
+        srs.calculate_odds(),
+        ppa.calculate_total_factor(1),
+        top.calculate_total(),
+        bottom.calculate_total(),
+        policy,
+        WEIGHTS,
+    )
+
+
+def test_fixture_has_missing_data(loader):
+    games = [game for games in loader.games_by_week.values() for game in games]
+    factors = MatchupEngine(loader.teams).compute(games)
+    for factor in ("srs", "ppa", "havoc_top", "havoc_bottom"):
+        assert factors.missing(factor), factor
+
+
+@pytest.mark.parametrize("policy", ["drop", "zero", "partial"])
+def test_engine_matches_legacy_calculators(loader, policy):
+    for week, games in loader.games_by_week.items():
+        engine = MatchupEngine(loader.teams, WEIGHTS.home_field)
+        lines = combine_factors(engine.compute(games), policy, WEIGHTS)
+        expected = legacy_lines(loader, games, policy)
+
+        assert lines.games == expected.games, week
+        np.testing.assert_array_equal(lines.complete, expected.complete)
+        for column in ("srs_line", "ppa_factor", "havoc_top", "havoc_bottom"):
+            np.testing.assert_allclose(
+                getattr(lines, column), getattr(expected, column), err_msg=column
+            )
+        np.testing.assert_allclose(lines.adjusted, expected.adjusted)
+
+
+def test_neutral_sites_get_no_home_field(loader):
+    games = loader.games_by_week[1][:4]
+    neutral = np.array([True, False, True, False])
+    engine = MatchupEngine(loader.teams, WEIGHTS.home_field)
+
+    home = engine.compute(games)
+    mixed = engine.compute(games, neutral)
+
+    np.testing.assert_allclose(
+        mixed.srs_line, home.srs_line - np.where(neutral, WEIGHTS.home_field, 0.0)
+    )
+
+
+def test_unknown_policy():
+    with pytest.raises(ValueError):
+        combine_factors(MatchupEngine.from_tables({}, {}, {}).compute([]), "skip")
@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+
+from src.statforge.history import AS_OF, HistoryError, MetricHistory, load_source
+from src.statforge.teams import TeamRegistry
+
+
+def registry(srs: dict[str, float]) -> TeamRegistry:
+    return TeamRegistry.from_tables(srs, {}, {})
+
+
+@pytest.fixture
+def history(tmp_path):
+    return MetricHistory(str(tmp_path / "history"), compact_segments=None)
+
+
+def test_record_and_read_back(history):
+    assert history.record(2023, 5, registry({"A": 1.0, "B": 2.0}))
+    teams = history.registry(2023, 5)
+    assert teams.names == ["A", "B"]
+    np.testing.assert_array_equal(teams.column("srs"), [1.0, 2.0])
+    assert history.weeks(2023) == [5]
+    assert history.registry(2023, 6) is None
+
+
+def test_unchanged_recording_is_not_written(history):
+    history.record(2023, 5, registry({"A": 1.0}))
+    assert not history.record(2023, 5, registry({"A": 1.0}))
+    assert len(history.segments) == 1
+
+
+def test_rerecording_with_fewer_teams_replaces_the_week(history):
+    history.record(2023, 5, registry({"A": 1.0, "B": 2.0, "C": 3.0}))
+    history.record(2023, 5, registry({"A": 5.0, "B": 6.0}))
+
+    teams = history.registry(2023, 5)
+    assert teams.names == ["A", "B"]
+    np.testing.assert_array_equal(teams.column("srs"), [5.0, 6.0])
+    # A team filter must not bring the dropped team back from the older segment
+    assert len(history.query(teams=["C"], seasons=2023, weeks=5)) == 0
+
+
+def test_sources_do_not_mix(history):
+    season_to_date = load_source("api", "api")
+    history.record(2023, 5, registry({"A": 1.0, "B": 2.0}), source=season_to_date)
+    history.record(2023, 5, registry({"A": 9.0}), source=AS_OF)
+
+    np.testing.assert_array_equal(history.registry(2023, 5).column("srs"), [9.0])
+    loaded = history.registry(2023, 5, source=season_to_date)
+    np.testing.assert_array_equal(loaded.column("srs"), [1.0, 2.0])
+    assert history.weeks(2023, source=season_to_date) == [5]
+
+
+def test_compaction_keeps_only_latest_recordings(tmp_path, history):
+    history.record(2022, 1, registry({"A": 1.0, "B": 2.0, "C": 3.0}))
+    history.record(2022, 2, registry({"A": 4.0, "B": 5.0}))
+    history.record(2022, 1, registry({"B": 7.0, "A": 8.0}))
+    history.record(2022, 1, registry({"A": 1.0}), source=load_source("api", "api"))
+    before = history.query(seasons=2022)
+
+    assert history.compact(before_season=2023) == 2
+    assert len(history.segments) == 2
+    after = history.query(seasons=2022)
+    assert after.teams() == before.teams() == ["A", "B", "A", "B"]
+    np.testing.assert_array_equal(after.week, [1, 1, 2, 2])
+    np.testing.assert_array_equal(after.columns["srs"], [8.0, 7.0, 4.0, 5.0])
+
+    reopened = MetricHistory(history.path)
+    np.testing.assert_array_equal(
+        reopened.query(seasons=2022).columns["srs"], [8.0, 7.0, 4.0, 5.0]
+    )
+    # Old segment files are gone, the compacted one is all that is left on disk
+    files = sorted(p.name for p in (tmp_path / "history" / "2022").iterdir())
+    assert files == sorted(s["file"].split("/")[-1] for s in reopened.segments)
+
+
+def test_record_compacts_past_seasons(tmp_path):
+    history = MetricHistory(str(tmp_path / "history"), compact_segments=3)
+    for week in range(1, 4):
+        history.record(2015, week, registry({"A": float(week)}))
+    assert len(history.segments) == 1
+    np.testing.assert_array_equal(
+        history.query(teams=["A"], seasons=2015).columns["srs"], [1.0, 2.0, 3.0]
+    )
+
+
+def test_series(history):
+    for week in (3, 4):
+        history.record(2023, week, registry({"A": float(week), "B": 0.0}))
+    seasons, weeks, values = history.query(seasons=2023).series("A", "srs")
+    np.testing.assert_array_equal(weeks, [3, 4])
+    np.testing.assert_array_equal(values, [3.0, 4.0])
+
+
+def test_unsupported_version(tmp_path):
+    path = tmp_path / "history"
+    path.mkdir()
+    (path / "manifest.json").write_text('{"version": 99}')
+    with pytest.raises(HistoryError):
+        MetricHistory(str(path))
@@ -0,0 +1,112 @@
+import numpy as np
+import pytest
+
+from src.statforge.combine import FactorWeights
+from src.statforge.data_loader import DataLoader
+from src.statforge.fake import FakeAPIDataFetcher, finish_games, generate_season
+from src.statforge.live import LiveRefresher
+from src.statforge.main import calculate_adjusted_lines
+
+WEIGHTS = FactorWeights()
+
+
+class RecordingWriter:
+    def __init__(self) -> None:
+        self.writes: list[tuple[int, int, int]] = []
+        self.flushes = 0
+
+    def write(self, season, week, lines) -> None:
+        self.writes.append((season, week, len(lines)))
+
+    def flush(self) -> None:
+        self.flushes += 1
+
+
+@pytest.fixture
+def season():
+    return generate_season(2024, weeks=9, completed_weeks=6)
+
+
+@pytest.fixture
+def refresher(season, capsys):
+    fake = FakeAPIDataFetcher(season)
+    live = LiveRefresher(fake, season=2024, writer=RecordingWriter(), weights=WEIGHTS)
+    live.start()
+    return live
+
+
+def calls_since(fake: FakeAPIDataFetcher, before: dict[str, int]) -> dict[str, int]:
+    return {
+        name: count - before.get(name, 0)
+        for name, count in fake.calls.items()
+        if count != before.get(name, 0)
+    }
+
+
+def test_poll_requires_start(season):
+    with pytest.raises(RuntimeError):
+        LiveRefresher(FakeAPIDataFetcher(season), season=2024, weights=WEIGHTS).poll()
+
+
+def test_start_writes_current_and_later_weeks(refresher):
+    assert refresher.week == 7
+    assert [week for _, week, _ in refresher.writer.writes] == [7, 8, 9]
+
+
+def test_idle_poll_costs_one_request(refresher):
+    fake = refresher.loader.api_fetcher
+    before = dict(fake.calls)
+    writes = len(refresher.writer.writes)
+
+    cycle = refresher.poll()
+
+    assert calls_since(fake, before) == {"get_games": 1}
+    assert (cycle.changed_games, cycle.finished, cycle.lines) == (0, [], 0)
+    assert len(refresher.writer.writes) == writes
+
+
+def test_finished_games_refetch_only_their_teams(refresher, season):
+    fake = refresher.loader.api_fetcher
+    before = dict(fake.calls)
+
+    finished = finish_games(season, 7, 2)
+    cycle = refresher.poll()
+
+    assert cycle.finished == [(g.away_team, g.home_team) for g in finished]
+    assert cycle.refetched_teams == 4
+    assert calls_since(fake, before) == {
+        "get_games": 1,
+        "get_srs": 1,
+        "get_predicted_points_added_by_team": 4,
+        "get_advanced_season_stats": 4,
+    }
+    assert cycle.lines > 0
+    assert refresher.writer.flushes == len(refresher.writer.writes)
+
+
+def test_incremental_lines_match_a_full_reload(refresher, season):
+    for count in (2, 5, 100):
+        finish_games(season, 7, count)
+        refresher.poll()
+    assert refresher.week == 8
+
+    fresh = DataLoader(FakeAPIDataFetcher(season), None, season=2024)
+    fresh.load()
+    for week, incremental in refresher._incremental.items():
+        expected = calculate_adjusted_lines(
+            fresh, fresh.games_by_week[week], week, verbose=False, weights=WEIGHTS
+        )
+        lines = incremental.lines()
+        assert lines.games == expected.games
+        np.testing.assert_allclose(lines.adjusted, expected.adjusted)
+
+
+def test_stops_after_the_last_week(refresher, season):
+    for week in (7, 8, 9):
+        finish_games(season, week, 100)
+        refresher.poll()
+    assert refresher.week is None
+    assert refresher.poll().week is None
+
+    refresher.run(interval=0)
+    assert refresher.cycles == 3
@@ -0,0 +1,69 @@
+import contextlib
+import io
+
+import numpy as np
+import pytest
+
+from src.statforge.combine import FactorWeights, combine_factors
+from src.statforge.data_loader import DataLoader
+from src.statforge.fake import FakeAPIDataFetcher, generate_season
+from src.statforge.matchup_matrix import MatchupMatrix, MatrixFileError
+from src.statforge.metrics.engine import MatchupEngine
+
+WEIGHTS = FactorWeights(home_field=2.5, ppa=0.8, havoc_top=1.5, havoc_bottom=0.5)
+
+
+@pytest.fixture(scope="module")
+def loader():
+    season = generate_season(season=2024, teams=30, weeks=4, missing_rate=0.2, seed=1)
+    loader = DataLoader(FakeAPIDataFetcher(season), None, season=2024)
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(
+        io.StringIO()
+    ):
+        loader.load()
+    return loader
+
+
+@pytest.mark.parametrize("policy", ["drop", "zero"])
+def test_matches_combine_factors_for_every_game(loader, policy):
+    matrix = MatchupMatrix.build(loader.teams, WEIGHTS, policy)
+    engine = MatchupEngine(loader.teams, home_field=WEIGHTS.home_field)
+    combined = combine_factors(engine.compute(loader.games), policy, WEIGHTS)
+
+    lines = matrix.lines_for(combined.games)
+    np.testing.assert_allclose(lines, combined.adjusted, rtol=1e-5, atol=1e-4)
+    for (away, home), expected in zip(combined.games, combined.adjusted):
+        assert matrix.line(away, home) == pytest.approx(expected, abs=1e-4)
+
+
+def test_home_field_is_added_on_lookup(loader):
+    matrix = MatchupMatrix.build(loader.teams, WEIGHTS, "zero")
+    away, home = loader.games[0]
+    neutral = matrix.line(away, home, neutral=True)
+    assert matrix.line(away, home) == pytest.approx(neutral + WEIGHTS.home_field)
+    assert matrix.line("Nobody", home) is None
+    assert np.isnan(matrix.lines_for([("Nobody", home)])[0])
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_save_and_load_round_trip(tmp_path, loader, mmap):
+    matrix = MatchupMatrix.build(loader.teams, WEIGHTS, "drop")
+    path = str(tmp_path / "matrix.bin")
+    matrix.save(path)
+
+    loaded = MatchupMatrix.load(path, mmap=mmap)
+    assert loaded.teams == matrix.teams
+    assert loaded.weights == WEIGHTS
+    assert loaded.policy == "drop"
+    np.testing.assert_array_equal(loaded.lines, matrix.lines)
+    np.testing.assert_array_equal(loaded.complete, matrix.complete)
+    assert isinstance(loaded.lines.base, np.memmap) == mmap
+    with pytest.raises(ValueError):
+        loaded.lines[0, 0] = 0.0
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"\x00" * 64)
+    with pytest.raises(MatrixFileError, match="not a StatForge matchup matrix"):
+        MatchupMatrix.load(str(path))
@@ -0,0 +1,76 @@
+import contextlib
+import io
+
+import numpy as np
+import pytest
+
+from src.statforge.data_loader import DataLoader
+from src.statforge.fake import FakeAPIDataFetcher, generate_season
+from src.statforge.snapshot import (
+    SNAPSHOT_VERSION,
+    SnapshotError,
+    read_snapshot,
+    write_snapshot,
+)
+from src.statforge.teams import TeamRegistry, metric_columns
+
+
+@pytest.fixture
+def loader():
+    season = generate_season(season=2024, teams=30, weeks=4, seed=0)
+    loader = DataLoader(FakeAPIDataFetcher(season), None, season=2024)
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(
+        io.StringIO()
+    ):
+        loader.load()
+    return loader
+
+
+def test_loader_round_trips_through_a_snapshot(tmp_path, loader):
+    path = str(tmp_path / "season.snap")
+    loader.save_snapshot(path)
+    restored = DataLoader.from_snapshot(path)
+
+    assert (restored.season, restored.week) == (2024, None)
+    assert restored.games_by_week == loader.games_by_week
+    assert restored.games == loader.games
+    assert restored.teams.names == loader.teams.names
+    for name in metric_columns:
+        np.testing.assert_array_equal(
+            restored.teams.column(name), loader.teams.column(name)
+        )
+    np.testing.assert_array_equal(restored.teams.ppa_present, loader.teams.ppa_present)
+    assert restored.srs_by_team == loader.srs_by_team
+    assert restored.ppa_by_team == loader.ppa_by_team
+
+
+def test_columns_are_read_only_views_of_the_file(tmp_path):
+    path = str(tmp_path / "week.snap")
+    registry = TeamRegistry.from_tables({"A": 1.5, "B": -2.0}, {}, {})
+    write_snapshot(path, 2023, 5, registry, {5: [("A", "B"), ("C", "A")]})
+
+    snapshot = read_snapshot(path)
+    assert (snapshot.season, snapshot.week) == (2023, 5)
+    # C is on the schedule without metrics, so it gets an id and no ratings
+    assert snapshot.teams == ["A", "B", "C"]
+    assert snapshot.games_by_week() == {5: [("A", "B"), ("C", "A")]}
+    srs = snapshot.registry().column("srs")
+    np.testing.assert_array_equal(srs, [1.5, -2.0, np.nan])
+    assert isinstance(snapshot.columns["srs"].base, np.memmap)
+    with pytest.raises(ValueError):
+        snapshot.columns["srs"][0] = 0.0
+
+
+def test_rejects_other_files_and_versions(tmp_path):
+    not_a_snapshot = tmp_path / "other.bin"
+    not_a_snapshot.write_bytes(b"\x00" * 64)
+    with pytest.raises(SnapshotError, match="not a StatForge snapshot"):
+        read_snapshot(str(not_a_snapshot))
+
+    path = tmp_path / "future.snap"
+    write_snapshot(str(path), 2023, None, TeamRegistry(), {})
+    data = bytearray(path.read_bytes())
+    data[8:12] = (SNAPSHOT_VERSION + 1).to_bytes(4, "little")
+    path.write_bytes(bytes(data))
+    with pytest.raises(SnapshotError, match="version"):
+        read_snapshot(str(path))
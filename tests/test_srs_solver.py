@@ -0,0 +1,84 @@
+import random
+
+import numpy as np
+
+from src.statforge.metrics.srs_solver import GameResult, SRSSolver
+
+
+def season(teams: int = 40, weeks: int = 8, seed: int = 0) -> list[GameResult]:
+    rng = random.Random(seed)
+    names = [f"T{i:02d}" for i in range(teams)]
+    results = []
+    for week in range(1, weeks + 1):
+        order = rng.sample(names, teams)
+        for away, home in zip(order[::2], order[1::2]):
+            results.append(
+                GameResult(
+                    week=week,
+                    away_team=away,
+                    home_team=home,
+                    away_points=rng.randint(0, 56),
+                    home_points=rng.randint(0, 56),
+                    neutral_site=rng.random() < 0.1,
+                )
+            )
+    return results
+
+
+def dense_solve(results: list[GameResult], solver: SRSSolver) -> dict[str, float]:
+    teams = sorted({team for game in results for team in game[1:3]})
+    ids = {team: i for i, team in enumerate(teams)}
+    a = np.zeros((len(results), len(teams)))
+    target = np.zeros(len(results))
+    for g, game in enumerate(results):
+        a[g, ids[game.home_team]] = 1.0
+        a[g, ids[game.away_team]] = -1.0
+        margin = np.clip(
+            game.home_points - game.away_points, -solver.margin_cap, solver.margin_cap
+        )
+        target[g] = margin - (0.0 if game.neutral_site else solver.home_field)
+
+    normal = a.T @ a + solver.ridge * np.eye(len(teams))
+    return dict(zip(teams, np.linalg.solve(normal, a.T @ target)))
+
+
+def test_matches_a_dense_least_squares_solve():
+    results = season()
+    exact = dense_solve(results, SRSSolver(margin_cap=28))
+
+    tight = SRSSolver(margin_cap=28, tol=1e-12).solve(results)
+    assert tight.keys() == exact.keys()
+    np.testing.assert_allclose(
+        [tight[team] for team in exact], list(exact.values()), atol=1e-8
+    )
+
+    # The default tolerance stays well inside the 0.1-point rounding of a line
+    default = SRSSolver(margin_cap=28).solve(results)
+    assert max(abs(default[team] - exact[team]) for team in exact) < 0.05
+
+
+def test_through_week_uses_only_earlier_games():
+    results = season()
+    early = [game for game in results if game.week <= 3]
+    expected = SRSSolver().solve(early)
+    assert SRSSolver().solve(results, through_week=3) == expected
+    assert SRSSolver().solve(results, through_week=0) == {}
+
+
+def test_warm_start_from_the_solution_needs_no_iterations():
+    results = season()
+    solver = SRSSolver()
+    ratings = solver.solve(results)
+    assert solver.iterations > 0
+
+    assert solver.solve(results) == ratings
+    assert solver.iterations == 0
+
+
+def test_solve_by_week_matches_cold_solves():
+    results = season(weeks=5)
+    by_week = SRSSolver().solve_by_week(results)
+    assert list(by_week) == [1, 2, 3, 4, 5]
+    for week, ratings in by_week.items():
+        cold = SRSSolver().solve(results, through_week=week)
+        assert max(abs(ratings[team] - cold[team]) for team in cold) < 0.05